@@ -0,0 +1,19 @@
+import os
+import sys
+
+SRC_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "aaz_dev")
+
+
+def main():
+    sys.path.insert(0, SRC_FOLDER)
+    from utils.templates import compile_templates
+    from cli.templates._filters import custom_filters as cli_filters
+    from command.templates._filters import custom_filters as command_filters
+
+    for module, filters in (("cli", cli_filters), ("command", command_filters)):
+        compiled_folder = compile_templates(os.path.join(SRC_FOLDER, module, "templates"), filters)
+        print(f"Compiled templates into {compiled_folder}")
+
+
+if __name__ == "__main__":
+    main()
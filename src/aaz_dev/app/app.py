@@ -13,6 +13,10 @@ def create_app():
     app = Flask(__name__, static_folder=Config.STATIC_FOLDER, static_url_path=Config.STATIC_URL_PATH)
     logger = create_logger(app)
 
+    # long-lived managers shared by requests
+    from .manager_registry import ManagerRegistry
+    ManagerRegistry(app)
+
     @app.route('/', defaults={'path': ''})
     @app.route('/<string:path>')
     @app.route('/<path:path>')
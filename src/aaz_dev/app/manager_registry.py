@@ -0,0 +1,180 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context
+
+from utils.config import Config
+
+
+class ManagerRegistry:
+    """Application scoped registry of the long-lived managers shared by requests.
+
+    The swagger specs manager, the aaz specs manager and the workspace managers are reused across requests as long as
+    the files they are loaded from are not changed. Every manager is validated by a signature of the configured paths
+    and the mtime of its files when it's fetched:
+
+    - swagger specs: the swagger folders, and the readme files and swagger files of a loaded resource provider when
+      it's accessed;
+    - aaz specs: `Commands/tree.json`, the cfg files are validated by `cfg_reader_cache` when they're loaded;
+    - workspace: its `ws.json`.
+
+    The shared swagger specs manager and aaz specs manager are read only in requests, and each is guarded by its own
+    lock only while it's validated or rebuilt. The aaz specs are modified through `edit_aaz_specs`, which serializes
+    the writers on a private manager. A workspace manager is modified by the requests using it, so the lock of the
+    workspace name is held from its fetching until the request is torn down, and the manager is dropped after a
+    failed request, because its in memory state may be modified without saving.
+    """
+
+    EXTENSION_NAME = 'aaz_dev_managers'
+
+    def __init__(self, app=None):
+        # guards the workspaces dicts only
+        self._lock = threading.Lock()
+        self._swagger_lock = threading.Lock()
+        self._aaz_lock = threading.Lock()
+        self._aaz_edit_lock = threading.Lock()
+        self._swagger_specs = None
+        self._aaz_specs = None
+        self._workspaces = {}
+        self._workspace_locks = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions[self.EXTENSION_NAME] = self
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def get_swagger_specs(self):
+        from swagger.controller.specs_manager import SwaggerSpecsManager
+        with self._swagger_lock:
+            signature = self._swagger_specs_signature()
+            if self._swagger_specs is None or self._swagger_specs[0] != signature:
+                self._swagger_specs = (signature, SwaggerSpecsManager())
+            elif not has_request_context() or not g.get('_aaz_dev_swagger_checked', False):
+                # the readme files and swagger files of the loaded resource providers are checked once per request,
+                # each when it's accessed
+                self._swagger_specs[1].drop_changed_caches()
+            if has_request_context():
+                g._aaz_dev_swagger_checked = True
+            return self._swagger_specs[1]
+
+    def get_aaz_specs(self):
+        from command.controller.specs_manager import AAZSpecsManager
+        with self._aaz_lock:
+            signature = self._aaz_specs_signature()
+            if self._aaz_specs is None or self._aaz_specs[0] != signature:
+                self._aaz_specs = (signature, AAZSpecsManager())
+            return self._aaz_specs[1]
+
+    @contextmanager
+    def edit_aaz_specs(self):
+        """Yield a private aaz specs manager to be modified and saved.
+
+        The editors are serialized, and the shared aaz specs manager is dropped afterwards, so the readers never see a
+        half modified command tree.
+        """
+        from command.controller.specs_manager import AAZSpecsManager
+        with self._aaz_edit_lock:
+            try:
+                yield AAZSpecsManager()
+            finally:
+                with self._aaz_lock:
+                    self._aaz_specs = None
+
+    def get_workspace(self, name, load=True):
+        """Return the workspace manager of name, which is loaded if `load` is True.
+
+        The returned manager shares the swagger specs manager and the aaz specs manager in registry.
+        """
+        from command.controller.workspace_manager import WorkspaceManager
+        from swagger.controller.command_generator import CommandGenerator
+        aaz_specs = self.get_aaz_specs()
+        swagger_specs = self.get_swagger_specs()
+        with self._acquire_workspace(name):
+            signature = self._workspace_signature(name)
+            with self._lock:
+                cached = self._workspaces.get(name, None)
+            if cached is None or cached[0] != signature or (load and cached[1].ws is None):
+                manager = WorkspaceManager(name, aaz_manager=aaz_specs, swagger_manager=swagger_specs)
+                if load:
+                    manager.load()
+                with self._lock:
+                    self._workspaces[name] = (signature, manager)
+            else:
+                manager = cached[1]
+                manager.aaz_specs = aaz_specs
+                manager.swagger_specs = swagger_specs
+                # the swagger files loaded by previous requests may be changed
+                manager.swagger_command_generator = CommandGenerator()
+            return manager
+
+    def _acquire_workspace(self, name):
+        with self._lock:
+            lock = self._workspace_locks.setdefault(name, threading.RLock())
+        if has_request_context():
+            used = g.setdefault('_aaz_dev_workspaces_used', {})
+            if name not in used:
+                # hold the lock of workspace until the request is torn down
+                lock.acquire()
+                used[name] = lock
+        return lock
+
+    def _after_request(self, response):
+        if response.status_code >= 400:
+            g._aaz_dev_managers_failed = True
+        return response
+
+    def _teardown_request(self, exc):
+        used = g.pop('_aaz_dev_workspaces_used', None)
+        if not used:
+            return
+        failed = exc is not None or g.get('_aaz_dev_managers_failed', False)
+        for name, lock in used.items():
+            try:
+                self._release_workspace(name, failed)
+            finally:
+                lock.release()
+
+    def _release_workspace(self, name, failed):
+        with self._lock:
+            cached = self._workspaces.pop(name, None)
+        if cached is None or failed or cached[1].name != name:
+            return
+        # the files can be saved by the manager itself in request
+        signature = self._workspace_signature(name)
+        if signature[1] is not None:
+            with self._lock:
+                self._workspaces[name] = (signature, cached[1])
+
+    @classmethod
+    def _swagger_specs_signature(cls):
+        if Config.SWAGGER_PATH:
+            folder = Config.SWAGGER_PATH
+            stats = (cls._stat(folder), cls._stat(os.path.join(folder, 'specification')))
+        else:
+            folder = Config.SWAGGER_MODULE_PATH
+            stats = (cls._stat(folder), )
+        return folder, Config.DEFAULT_SWAGGER_MODULE, stats
+
+    @classmethod
+    def _aaz_specs_signature(cls):
+        return Config.AAZ_PATH, cls._stat(os.path.join(Config.AAZ_PATH or '', 'Commands', 'tree.json'))
+
+    @classmethod
+    def _workspace_signature(cls, name):
+        folder = os.path.join(Config.AAZ_DEV_WORKSPACE_FOLDER, name)
+        return folder, cls._stat(os.path.join(folder, 'ws.json'))
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+def get_manager_registry():
+    return current_app.extensions[ManagerRegistry.EXTENSION_NAME]
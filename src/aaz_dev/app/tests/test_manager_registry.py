@@ -0,0 +1,149 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+from app.manager_registry import ManagerRegistry
+from app.tests.common import ApiTestCase
+from utils.config import Config
+from utils.plane import PlaneEnum
+
+
+class ManagerRegistryTest(ApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._configs = (Config.SWAGGER_PATH, Config.AAZ_DEV_FOLDER)
+        self.swagger_folder = tempfile.mkdtemp()
+        self.aaz_dev_folder = tempfile.mkdtemp()
+        Config.SWAGGER_PATH = self.swagger_folder
+        Config.AAZ_DEV_FOLDER = self.aaz_dev_folder
+        self.registry = self.app.extensions[ManagerRegistry.EXTENSION_NAME]
+
+    def tearDown(self):
+        Config.SWAGGER_PATH, Config.AAZ_DEV_FOLDER = self._configs
+        shutil.rmtree(self.swagger_folder)
+        shutil.rmtree(self.aaz_dev_folder)
+
+    def _write_swagger(self, *resource_paths):
+        rp_folder = os.path.join(self.swagger_folder, 'specification', 'foo', 'resource-manager')
+        file_path = os.path.join(rp_folder, 'Microsoft.Foo', 'stable', '2021-01-01', 'foo.json')
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(os.path.join(rp_folder, 'readme.md'), 'w') as f:
+            f.write('# Foo\n')
+        with open(file_path, 'w') as f:
+            json.dump({
+                "swagger": "2.0",
+                "info": {"version": "2021-01-01"},
+                "paths": {path: {"get": {"operationId": "Foo_Get"}} for path in resource_paths},
+            }, f)
+
+    def test_reuse_managers(self):
+        with self.app.test_request_context():
+            aaz_specs = self.registry.get_aaz_specs()
+            swagger_specs = self.registry.get_swagger_specs()
+        with self.app.test_request_context():
+            self.assertIs(self.registry.get_aaz_specs(), aaz_specs)
+            self.assertIs(self.registry.get_swagger_specs(), swagger_specs)
+
+        # tree.json changed by others
+        tree_path = aaz_specs.get_tree_file_path()
+        os.makedirs(os.path.dirname(tree_path), exist_ok=True)
+        with open(tree_path, 'w') as f:
+            f.write('{"root": {"names": ["aaz"]}}')
+        with self.app.test_request_context():
+            self.assertIsNot(self.registry.get_aaz_specs(), aaz_specs)
+            self.assertIs(self.registry.get_swagger_specs(), swagger_specs)
+
+    def test_reload_changed_swagger_files(self):
+        rp_path = "/subscriptions/{subscriptionId}/resourceGroups/{resourceGroupName}/providers/Microsoft.Foo"
+        self._write_swagger(f"{rp_path}/foos/{{fooName}}")
+        with self.app.test_request_context():
+            swagger_specs = self.registry.get_swagger_specs()
+            module_manager = swagger_specs.get_module_manager(PlaneEnum.Mgmt, ["foo"])
+            rp = module_manager.get_resource_provider("Microsoft.Foo")
+            self.assertEqual(len(module_manager.get_resource_map(rp)), 1)
+
+        # swagger file changed by others
+        self._write_swagger(f"{rp_path}/foos/{{fooName}}", f"{rp_path}/bars/{{barName}}")
+        with self.app.test_request_context():
+            self.assertIs(self.registry.get_swagger_specs(), swagger_specs)
+            # the resource provider is checked when it's accessed
+            self.assertEqual(module_manager._rps_to_check, {"Microsoft.Foo"})
+            self.assertEqual(len(module_manager.get_resource_map(rp)), 2)
+            self.assertEqual(module_manager._rps_to_check, set())
+
+    def test_reuse_workspace(self):
+        ws_name = "test_reuse_workspace"
+        c = self.app.test_client()
+        rv = c.post(f"/AAZ/Editor/Workspaces", json={
+            "name": ws_name,
+            "plane": PlaneEnum.Mgmt,
+        })
+        self.assertTrue(rv.status_code == 200)
+        ws_url = rv.get_json()['url']
+
+        rv = c.get(ws_url)
+        self.assertTrue(rv.status_code == 200)
+        manager = self.registry._workspaces[ws_name][1]
+        rv = c.get(ws_url)
+        self.assertTrue(rv.status_code == 200)
+        self.assertIs(self.registry._workspaces[ws_name][1], manager)
+
+        # the workspace manager is dropped after a failed request
+        rv = c.post(f"{ws_url}/Rename", json={})
+        self.assertTrue(rv.status_code == 400)
+        self.assertNotIn(ws_name, self.registry._workspaces)
+
+        # the workspace changed by others is reloaded
+        rv = c.get(ws_url)
+        self.assertTrue(rv.status_code == 200)
+        manager = self.registry._workspaces[ws_name][1]
+        stat = os.stat(manager.path)
+        os.utime(manager.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        rv = c.get(ws_url)
+        self.assertTrue(rv.status_code == 200)
+        self.assertIsNot(self.registry._workspaces[ws_name][1], manager)
+
+        rv = c.delete(ws_url)
+        self.assertTrue(rv.status_code == 200)
+        rv = c.get(ws_url)
+        self.assertTrue(rv.status_code == 404)
+
+    def test_lock_per_workspace(self):
+        c = self.app.test_client()
+        for ws_name in ("test_lock_ws_a", "test_lock_ws_b"):
+            rv = c.post(f"/AAZ/Editor/Workspaces", json={
+                "name": ws_name,
+                "plane": PlaneEnum.Mgmt,
+            })
+            self.assertTrue(rv.status_code == 200)
+
+        def fetch_in_request(*ws_names):
+            with self.app.test_request_context():
+                self.registry.get_aaz_specs()
+                self.registry.get_swagger_specs()
+                for name in ws_names:
+                    self.registry.get_workspace(name)
+
+        try:
+            with self.app.test_request_context():
+                self.registry.get_workspace("test_lock_ws_a")
+
+                # the requests using other managers are not blocked
+                other = threading.Thread(target=fetch_in_request, args=("test_lock_ws_b", ))
+                other.start()
+                other.join(timeout=10)
+                self.assertFalse(other.is_alive())
+
+                # the request using the same workspace waits until the workspace is released
+                same = threading.Thread(target=fetch_in_request, args=("test_lock_ws_a", ))
+                same.start()
+                same.join(timeout=0.5)
+                self.assertTrue(same.is_alive())
+            same.join(timeout=10)
+            self.assertFalse(same.is_alive())
+        finally:
+            for ws_name in ("test_lock_ws_a", "test_lock_ws_b"):
+                c.delete(f"/AAZ/Editor/Workspaces/{ws_name}")
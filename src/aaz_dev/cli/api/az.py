@@ -5,7 +5,7 @@ from utils import exceptions
 from cli.controller.az_module_manager import AzMainManager, AzExtensionManager
 from cli.controller.portal_cli_generator import PortalCliGenerator
 from cli.model.view import CLIModule
-from command.controller.specs_manager import AAZSpecsManager
+from app.manager_registry import get_manager_registry
 import logging
 
 logging.basicConfig(level="INFO")
@@ -56,7 +56,8 @@ def az_main_module(module_name):
             "name": module_name,
             "profiles": data['profiles']
         })
-        module = manager.update_module(module_name, module.profiles)
+        module = manager.update_module(
+            module_name, module.profiles, aaz_manager=get_manager_registry().get_aaz_specs())
         result = module.to_primitive()
         result['url'] = url_for('az.az_main_module', module_name=module.name)
     elif request.method == "PATCH":
@@ -67,7 +68,8 @@ def az_main_module(module_name):
             "name": module_name,
             "profiles": data['profiles']
         })
-        module = manager.update_module(module_name, module.profiles, by_patch=True)
+        module = manager.update_module(
+            module_name, module.profiles, by_patch=True, aaz_manager=get_manager_registry().get_aaz_specs())
         result = module.to_primitive()
         result['url'] = url_for('az.az_main_module', module_name=module.name)
     elif request.method == "GET":
@@ -116,7 +118,8 @@ def az_extension_module(module_name):
             "name": module_name,
             "profiles": data['profiles']
         })
-        module = manager.update_module(module_name, module.profiles)
+        module = manager.update_module(
+            module_name, module.profiles, aaz_manager=get_manager_registry().get_aaz_specs())
         result = module.to_primitive()
         result['url'] = url_for('az.az_extension_module', module_name=module.name)
     elif request.method == "PATCH":
@@ -127,7 +130,8 @@ def az_extension_module(module_name):
             "name": module_name,
             "profiles": data['profiles']
         })
-        module = manager.update_module(module_name, module.profiles, by_patch=True)
+        module = manager.update_module(
+            module_name, module.profiles, by_patch=True, aaz_manager=get_manager_registry().get_aaz_specs())
         result = module.to_primitive()
         result['url'] = url_for('az.az_extension_module', module_name=module.name)
     elif request.method == "GET":
@@ -150,7 +154,7 @@ def portal_generate_main_module(module_name):
         exceptions.ResourceNotFind("Invalid input module: {0}, please check".format(module_name))
         return
 
-    aaz_spec_manager = AAZSpecsManager()
+    aaz_spec_manager = get_manager_registry().get_aaz_specs()
     root = aaz_spec_manager.find_command_group()
     if not root:
         raise exceptions.ResourceNotFind("Command group not exist")
@@ -171,7 +175,7 @@ def portal_generate_extension_module(module_name):
         exceptions.ResourceNotFind("Invalid input module: {0}, please check".format(module_name))
         return
 
-    aaz_spec_manager = AAZSpecsManager()
+    aaz_spec_manager = get_manager_registry().get_aaz_specs()
     root = aaz_spec_manager.find_command_group()
     if not root:
         raise exceptions.ResourceNotFind("Command group not exist")
@@ -10,7 +10,7 @@ from cli.model.atomic import CLIAtomicProfile, CLIAtomicCommandGroup, CLIAtomicC
 from command.controller.cfg_reader import CfgReader
 from command.controller.specs_manager import AAZSpecsManager
 from command.model.configuration import CMDHttpOperation, CMDCommand, CMDArgGroup, CMDObjectOutput, \
-    CMDHttpResponseJsonBody, CMDObjectSchemaBase
+    CMDHttpResponseJsonBody, CMDObjectSchemaBase, clone_model
 from swagger.utils.tools import swagger_resource_path_to_resource_id
 from utils.stage import AAZStageEnum
 from utils.exceptions import ResourceNotFind
@@ -20,8 +20,8 @@ logger = logging.getLogger('backend')
 
 class AzAtomicProfileBuilder:
 
-    def __init__(self, by_patch=False):
-        self._aaz_spec_manager = AAZSpecsManager()
+    def __init__(self, by_patch=False, aaz_manager=None):
+        self._aaz_spec_manager = aaz_manager or AAZSpecsManager()
         self._by_patch = by_patch
 
     def __call__(self, view_profile):
@@ -138,11 +138,13 @@ class AzAtomicProfileBuilder:
         if load_cfg:
             # load cfg file, which will generate the command in code
             cfg_reader = self._aaz_spec_manager.load_resource_cfg_reader_by_command_with_version(
-                aaz_cmd, version=version)
+                aaz_cmd, version=version, copy=False)
             cmd_cfg = cfg_reader.find_command(*names)
             assert cmd_cfg is not None, f"command model miss in AAZ: '{' '.join(names)}'"
 
             command.cfg = cmd_cfg
+            # the cfg file which command is rendered from, it keys the generation of command
+            command.cfg_source = cfg_reader.source
             command.register_info.confirmation = cmd_cfg.confirmation
         return command
 
@@ -191,11 +193,11 @@ class AzAtomicProfileBuilder:
                 if not cls._has_provisioning_state(operation):
                     continue
 
-                wait_cmd_rids[rid]['get_op'] = operation.__class__(operation.to_primitive())
+                wait_cmd_rids[rid]['get_op'] = clone_model(operation)
                 wait_cmd_rids[rid]['args'] = {}
                 for resource in command.resources:
                     if rid == resource.id:
-                        wait_cmd_rids[rid]['resource'] = resource.__class__(resource.to_primitive())
+                        wait_cmd_rids[rid]['resource'] = clone_model(resource)
 
                 params = []
                 if operation.http.request.path and operation.http.request.path.params:
@@ -213,7 +215,7 @@ class AzAtomicProfileBuilder:
                         arg_var=param.arg
                     )
                     assert arg is not None
-                    wait_cmd_rids[rid]['args'][arg_idx] = arg.__class__(arg.to_primitive())
+                    wait_cmd_rids[rid]['args'][arg_idx] = clone_model(arg)
 
         for rid, value in [*wait_cmd_rids.items()]:
             if "get_op" not in value:
@@ -238,6 +240,8 @@ class AzAtomicProfileBuilder:
         wait_command.register_info = CLIAtomicCommandRegisterInfo()
         wait_command.resources = [wait_cmd_info['resource']]
         wait_command.cfg = cfg = CMDCommand()
+        sources = [getattr(command, 'cfg_source', None) for command in command_group.commands.values()]
+        wait_command.cfg_source = tuple(sources) if all(sources) else None
         cfg.name = "wait"
         cfg.version = "undefined"
 
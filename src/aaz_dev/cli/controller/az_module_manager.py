@@ -72,12 +72,14 @@ class AzModuleManager:
     def update_module(self, mod_name, profiles, **kwargs):
         aaz_folder = self.get_aaz_path(mod_name)
         generators = {}
-        atomic_builder = AzAtomicProfileBuilder(by_patch=kwargs.pop('by_patch', False))
+        atomic_builder = AzAtomicProfileBuilder(
+            by_patch=kwargs.pop('by_patch', False), aaz_manager=kwargs.pop('aaz_manager', None))
         for profile_name, profile in profiles.items():
             profile = atomic_builder(profile)
             generators[profile_name] = AzProfileGenerator(aaz_folder, profile)
         for generator in generators.values():
-            generator.generate()
+            generator.generate(render=False)
+        AzProfileGenerator.render_commands(*generators.values())
         for generator in generators.values():
             generator.save()
         for patch_file, file_data in self._patch_module(mod_name):
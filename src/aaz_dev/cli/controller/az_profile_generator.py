@@ -1,14 +1,80 @@
+import glob
+import hashlib
+import importlib.metadata
+import json
+import logging
 import os
 import shutil
+import jinja2
 from cli.templates import get_templates
-from command.model.configuration import CMDCommand
+from command.model.configuration import CMDCommand, get_models_signature
 from utils.case import to_snack_case
+from utils.config import Config
+from utils.fork_pool import run_in_forked_processes
 from .az_command_generator import AzCommandGenerator
 from utils import exceptions
 
+logger = logging.getLogger('backend')
+
+_generator_signature = None
+
+
+def _get_generator_signature():
+    """Hash of the package version, the configuration models, the templates and the generators used to render
+    command files."""
+    global _generator_signature
+    if _generator_signature is None:
+        cli_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        root_folder = os.path.dirname(cli_folder)
+        paths = [
+            *glob.glob(os.path.join(cli_folder, 'templates', '**', '*'), recursive=True),
+            *glob.glob(os.path.join(cli_folder, 'controller', 'az_*_generator.py')),
+            *glob.glob(os.path.join(root_folder, 'utils', '**', '*.py'), recursive=True),
+        ]
+        sha = hashlib.sha256()
+        sha.update(f"aaz-dev:{_get_package_version()}:jinja2:{jinja2.__version__}".encode('utf-8'))
+        sha.update(get_models_signature().encode('utf-8'))
+        for path in sorted(paths):
+            if not os.path.isfile(path) or '__pycache__' in path.split(os.sep):
+                continue
+            sha.update(os.path.relpath(path, root_folder).encode('utf-8'))
+            with open(path, 'rb') as f:
+                sha.update(hashlib.sha256(f.read()).digest())
+        _generator_signature = sha.hexdigest()
+    return _generator_signature
+
+
+def _get_package_version():
+    try:
+        return importlib.metadata.version('aaz-dev')
+    except importlib.metadata.PackageNotFoundError:
+        # run from the source tree
+        return None
+
+
+def _render_command(command, is_wait):
+    tmpl = get_templates()['aaz']['command']['_cmd.py']
+    try:
+        return tmpl.render(
+            leaf=AzCommandGenerator(command, is_wait=is_wait)
+        )
+    except exceptions.InvalidAPIUsage as err:
+        err.message = f"CommandGenerationError: {' '.join(command.names)}: {err.message}"
+        raise err
+
 
 class AzProfileGenerator:
-    """Used to generate atomic layer command group"""
+    """Used to generate atomic layer command group
+
+    The files with the same content on disk are not written. A manifest of the input hash and the output hash of every
+    command file is kept under AAZ_DEV_FOLDER, so the command whose configuration is not changed since its file was
+    generated is not rendered again.
+    """
+
+    MANIFEST_FOLDER_NAME = 'generations'
+
+    # the minimum number of commands to render in worker processes
+    MIN_PARALLEL_COMMANDS = 8
 
     def __init__(self, aaz_folder, profile):
         self.aaz_folder = aaz_folder
@@ -17,8 +83,20 @@ class AzProfileGenerator:
         self._removed_folders = set()
         self._removed_files = set()
         self._modified_files = {}
+        self._manifest = None
+        self._manifest_updates = {}
+        self._pending_commands = []
 
-    def generate(self):
+        self.rendered_files = 0
+        self.skipped_files = 0
+        self.written_files = 0
+
+    def generate(self, render=True):
+        """Generate the files of profile.
+
+        The command files are rendered after the command groups are traversed. If `render` is False, they are left
+        pending to be rendered with the commands of other profiles by `render_commands`.
+        """
         # check aaz/__init__.py
         file_name = '__init__.py'
         if not self._exist_file(file_name):
@@ -50,8 +128,30 @@ class AzProfileGenerator:
             for name in remain_folders:
                 self._delete_folder(self.profile_folder_name, name)
 
+        if render:
+            self.render_commands(self)
         return sorted(self._removed_folders), sorted(self._removed_files), self._modified_files
 
+    @classmethod
+    def render_commands(cls, *generators, workers=None):
+        """Render the pending command files of generators, across worker processes if `AAZ_CLI_GENERATE_WORKERS` is
+        configured. The results are applied in order."""
+        pending = [(generator, item) for generator in generators for item in generator._pending_commands]
+        if not pending:
+            return
+        if workers is None:
+            workers = Config.CLI_GENERATE_WORKERS
+        if len(pending) < cls.MIN_PARALLEL_COMMANDS:
+            workers = 1
+        # load templates before forking, so workers inherit them
+        get_templates()
+        results = run_in_forked_processes(
+            [(_render_command, (command, is_wait)) for _, (_, command, is_wait, _) in pending], workers)
+        for (generator, (names, _, _, input_hash)), data in zip(pending, results):
+            generator._update_file(*names, data=data, input_hash=input_hash)
+        for generator in generators:
+            generator._pending_commands = []
+
     def save(self):
         for folder in self._removed_folders:
             shutil.rmtree(folder, ignore_errors=True)
@@ -64,9 +164,15 @@ class AzProfileGenerator:
             os.makedirs(os.path.dirname(path), exist_ok=True)
             with open(path, 'w') as f:
                 f.write(data)
+        self.written_files += len(self._modified_files)
+        self._save_manifest()
         self._removed_folders = set()
         self._removed_files = set()
         self._modified_files = {}
+        logger.info(
+            f"Generate profile '{self.profile.name}' in {self.aaz_folder}: {self.rendered_files} files rendered, "
+            f"{self.skipped_files} files skipped, {self.written_files} files written"
+        )
 
     def _generate_by_command_group(self, profile_folder_name, command_group):
         assert command_group.command_groups or command_group.commands
@@ -134,16 +240,12 @@ class AzProfileGenerator:
     def _generate_by_command(self, profile_folder_name, command, is_wait=False):
         assert isinstance(command.cfg, CMDCommand)
         file_name = self._command_file_name(command.names[-1])
-        tmpl = get_templates()['aaz']['command']['_cmd.py']
-        try:
-            data = tmpl.render(
-                leaf=AzCommandGenerator(command, is_wait=is_wait)
-            )
-        except exceptions.InvalidAPIUsage as err:
-            err.message = f"CommandGenerationError: {' '.join(command.names)}: {err.message}"
-            raise err
-        self._update_file(
-            profile_folder_name, *self._command_group_folder_names(*command.names[:-1]), file_name, data=data)
+        names = [profile_folder_name, *self._command_group_folder_names(*command.names[:-1]), file_name]
+        input_hash = self._command_input_hash(command, is_wait)
+        if self._is_generated(self._get_path(*names), input_hash):
+            self.skipped_files += 1
+            return
+        self._pending_commands.append((names, command, is_wait, input_hash))
 
     # folder operations
     def _get_path(self, *names):
@@ -161,11 +263,18 @@ class AzProfileGenerator:
             assert os.path.isfile(path), f'Invalid file path {path}'
             self._removed_files.add(path)
 
-    def _update_file(self, *names, data):
+    def _update_file(self, *names, data, input_hash=None):
+        self.rendered_files += 1
         path = self._get_path(*names)
         if os.path.exists(path):
             assert os.path.isfile(path), f'Invalid file path {path}'
-        self._modified_files[path] = data
+        if input_hash is not None:
+            self._manifest_updates[path] = {"input": input_hash, "output": self._hash(data)}
+        if self._read_file(path) == data:
+            self.skipped_files += 1
+            self._modified_files.pop(path, None)
+        else:
+            self._modified_files[path] = data
 
     def _exist_file(self, *names):
         path = self._get_path(*names)
@@ -191,6 +300,85 @@ class AzProfileGenerator:
                         folder_names.append(name)
         return set(folder_names), set(file_names)
 
+    # generation manifest
+    def _get_manifest_path(self):
+        key = hashlib.sha256(os.path.abspath(self.aaz_folder).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(Config.AAZ_DEV_FOLDER, self.MANIFEST_FOLDER_NAME, key, f"{self.profile_folder_name}.json")
+
+    def _load_manifest(self):
+        if self._manifest is None:
+            self._manifest = {}
+            try:
+                with open(self._get_manifest_path(), 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            if isinstance(data, dict) and data.get("aazFolder") == os.path.abspath(self.aaz_folder):
+                self._manifest = data.get("files", {})
+        return self._manifest
+
+    def _save_manifest(self):
+        manifest = self._load_manifest()
+        files = {}
+        for rel_path, entry in manifest.items():
+            path = self._get_path(*rel_path.split('/'))
+            if os.path.isfile(path) and path not in self._manifest_updates:
+                files[rel_path] = entry
+        for path, entry in self._manifest_updates.items():
+            if os.path.isfile(path):
+                files[os.path.relpath(path, self.aaz_folder).replace(os.sep, '/')] = entry
+        self._manifest_updates = {}
+        if files == manifest:
+            return
+        self._manifest = files
+        manifest_path = self._get_manifest_path()
+        try:
+            os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+            tmp_path = f"{manifest_path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"aazFolder": os.path.abspath(self.aaz_folder), "files": files}, f)
+            os.replace(tmp_path, manifest_path)
+        except OSError as err:
+            logger.warning(f"Failed to save generation manifest {manifest_path}: {err}")
+
+    def _is_generated(self, path, input_hash):
+        entry = self._load_manifest().get(os.path.relpath(path, self.aaz_folder).replace(os.sep, '/'), None)
+        if not entry or entry["input"] != input_hash:
+            return False
+        data = self._read_file(path)
+        return data is not None and self._hash(data) == entry["output"]
+
+    def _command_input_hash(self, command, is_wait):
+        # the cfg is keyed by the stat of file it's loaded from, serialize it only when it has no source file
+        cfg_source = getattr(command, 'cfg_source', None)
+        data = json.dumps({
+            "command": {
+                "names": command.names,
+                "stage": command.stage,
+                "help": command.help.to_primitive() if command.help else None,
+                "registerInfo": command.register_info.to_primitive() if command.register_info else None,
+                "version": command.version,
+                "resources": [r.to_primitive() for r in command.resources or []],
+                "supportNoWait": command.support_no_wait,
+            },
+            "cfg": cfg_source if cfg_source else command.cfg.to_primitive(),
+            "isWait": is_wait,
+            "profile": self.profile.name,
+            "generator": _get_generator_signature(),
+        }, sort_keys=True)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _hash(data):
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read_file(path):
+        if not os.path.isfile(path):
+            return None
+        with open(path, 'r') as f:
+            return f.read()
+
     @staticmethod
     def _command_file_name(name):
         return f"_{to_snack_case(name)}.py"
@@ -375,7 +375,8 @@ class PortalCliGenerator:
                 continue
             logging.info("Generating portal config of [ az {0} ] with registered version {1}".format(" ".join(cmd_name_version[:-1]),
                                                                                               registered_version))
-            cfg_reader = aaz_spec_manager.load_resource_cfg_reader_by_command_with_version(leaf, version=target_version)
+            cfg_reader = aaz_spec_manager.load_resource_cfg_reader_by_command_with_version(
+                leaf, version=target_version, copy=False)
             cmd_cfg = cfg_reader.find_command(*leaf.names)
             cmd_portal_info = self.generate_command_portal_raw(cmd_cfg, leaf, target_version)
             if cmd_portal_info:
@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from cli.controller.az_profile_generator import AzProfileGenerator
+from cli.model.atomic import CLIAtomicProfile
+from command.controller.cfg_reader import CfgReader
+from command.model.configuration import CMDConfiguration, XMLSerializer
+from command.model.specs import CMDSpecsCommandTree
+from utils.config import Config
+
+
+class AzProfileGeneratorTest(TestCase):
+
+    DATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "databricks")
+
+    def setUp(self):
+        self._aaz_dev_folder = Config.AAZ_DEV_FOLDER
+        self.folder = tempfile.mkdtemp()
+        Config.AAZ_DEV_FOLDER = os.path.join(self.folder, ".aaz_dev")
+        self.aaz_folder = os.path.join(self.folder, "aaz")
+
+        with open(os.path.join(self.DATA_FOLDER, "tree.json"), 'r') as f:
+            self.tree = CMDSpecsCommandTree(json.load(f))
+        self.cfg_readers = []
+        for file_name in ("vnet-peering-crud.xml", "vnet-peering-list.xml"):
+            with open(os.path.join(self.DATA_FOLDER, file_name), 'r') as f:
+                self.cfg_readers.append(CfgReader(XMLSerializer.from_xml(CMDConfiguration, f.read())))
+
+    def tearDown(self):
+        Config.AAZ_DEV_FOLDER = self._aaz_dev_folder
+        shutil.rmtree(self.folder)
+
+    def _build_profile(self, cmd_names, short_summary=None, profile_name="latest"):
+        group = self.tree.root.command_groups['databricks'].command_groups['workspace'].command_groups['vnet-peering']
+        commands = {}
+        for cmd_name in cmd_names:
+            cmd = group.commands[cmd_name]
+            commands[cmd_name] = {
+                "names": cmd.names,
+                "help": {"short": short_summary or cmd.help.short},
+                "registerInfo": {"stage": cmd.versions[0].stage},
+                "version": cmd.versions[0].name,
+                "resources": [r.to_primitive() for r in cmd.versions[0].resources],
+            }
+        profile = CLIAtomicProfile({
+            "name": profile_name,
+            "commandGroups": {
+                "databricks": {
+                    "names": ["databricks"],
+                    "help": {"short": "Manage Databricks."},
+                    "commandGroups": {
+                        "workspace": {
+                            "names": ["databricks", "workspace"],
+                            "help": {"short": "Manage Databricks workspaces."},
+                            "commandGroups": {
+                                "vnet-peering": {
+                                    "names": ["databricks", "workspace", "vnet-peering"],
+                                    "help": {"short": "Manage Databricks workspace vnet peering."},
+                                    "commands": commands,
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        })
+        group = profile.command_groups['databricks'].command_groups['workspace'].command_groups['vnet-peering']
+        for cmd_name in cmd_names:
+            for cfg_reader in self.cfg_readers:
+                cfg = cfg_reader.find_command('databricks', 'workspace', 'vnet-peering', cmd_name)
+                if cfg:
+                    group.commands[cmd_name].cfg = cfg
+        return profile
+
+    def _generate(self, profile):
+        generator = AzProfileGenerator(self.aaz_folder, profile)
+        generator.generate()
+        generator.save()
+        return generator
+
+    def test_render_commands_in_workers(self):
+        cmd_names = ["create", "delete", "list", "show"]
+        generators = [
+            AzProfileGenerator(self.aaz_folder, self._build_profile(cmd_names, profile_name=profile_name))
+            for profile_name in Config.CLI_PROFILES[:2]
+        ]
+        for generator in generators:
+            generator.generate(render=False)
+        AzProfileGenerator.render_commands(*generators, workers=3)
+        self.assertEqual(len(generators[0]._modified_files), 12)
+
+        for generator in generators:
+            expected = AzProfileGenerator(self.aaz_folder, generator.profile)
+            expected.generate()
+            self.assertEqual(generator._modified_files, expected._modified_files)
+
+    def test_skip_unchanged_files(self):
+        generator = self._generate(self._build_profile(["delete", "show"]))
+        self.assertEqual(generator.rendered_files, 10)
+        self.assertEqual(generator.skipped_files, 0)
+        self.assertEqual(generator.written_files, 10)
+        cmd_path = os.path.join(self.aaz_folder, "latest", "databricks", "workspace", "vnet_peering", "_show.py")
+        with open(cmd_path, 'r') as f:
+            show_data = f.read()
+
+        # nothing changed
+        generator = self._generate(self._build_profile(["delete", "show"]))
+        self.assertEqual(generator.rendered_files, 6)
+        self.assertEqual(generator.skipped_files, 8)
+        self.assertEqual(generator.written_files, 0)
+
+        # the command file modified on disk is generated again
+        with open(cmd_path, 'w') as f:
+            f.write("# modified\n")
+        generator = self._generate(self._build_profile(["delete", "show"], short_summary="Changed summary."))
+        self.assertEqual(generator.rendered_files, 8)
+        self.assertEqual(generator.written_files, 2)
+        with open(cmd_path, 'r') as f:
+            self.assertEqual(f.read(), show_data.replace(
+                self.tree.root.command_groups['databricks'].command_groups['workspace'].command_groups[
+                    'vnet-peering'].commands['show'].help.short,
+                "Changed summary."))
+
+        # the removed command file is dropped from the manifest
+        generator = self._generate(self._build_profile(["show"], short_summary="Changed summary."))
+        self.assertEqual(generator.written_files, 1)
+        self.assertFalse(os.path.exists(
+            os.path.join(self.aaz_folder, "latest", "databricks", "workspace", "vnet_peering", "_delete.py")))
+        self.assertEqual(sorted(generator._load_manifest()), [
+            "latest/databricks/workspace/vnet_peering/_show.py",
+        ])
+
+    def test_skip_commands_by_cfg_source(self):
+        def build_profile(source):
+            profile = self._build_profile(["show"])
+            group = profile.command_groups['databricks'].command_groups['workspace'].command_groups['vnet-peering']
+            group.commands["show"].cfg_source = source
+            return profile
+
+        generator = self._generate(build_profile(("vnet-peering-crud.json", 1, 100)))
+        self.assertEqual(generator.written_files, 9)
+
+        # the cfg is not serialized when it's loaded from a file, the file stat keys it
+        profile = build_profile(("vnet-peering-crud.json", 1, 100))
+        group = profile.command_groups['databricks'].command_groups['workspace'].command_groups['vnet-peering']
+        group.commands["show"].cfg = None
+        generator = AzProfileGenerator(self.aaz_folder, profile)
+        generator.generate()
+        self.assertEqual(generator.rendered_files, 6)
+        self.assertEqual(generator.skipped_files, 6)
+
+        # the cfg file changed
+        generator = self._generate(build_profile(("vnet-peering-crud.json", 2, 100)))
+        self.assertEqual(generator.rendered_files, 7)
+        self.assertEqual(generator.written_files, 0)
@@ -0,0 +1,62 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from jinja2 import ModuleLoader
+
+import utils.templates
+from utils.config import Config
+from utils.templates import compile_templates, create_environment
+
+
+class TemplateCacheTest(TestCase):
+
+    FILTERS = {"shout": lambda value: f"{value.upper()}!"}
+
+    def setUp(self):
+        self._aaz_dev_folder = Config.AAZ_DEV_FOLDER
+        self._bytecode_cache = utils.templates._bytecode_cache
+        self.folder = tempfile.mkdtemp()
+        Config.AAZ_DEV_FOLDER = os.path.join(self.folder, ".aaz_dev")
+        utils.templates._bytecode_cache = None
+        self.templates_folder = os.path.join(self.folder, "templates")
+        os.makedirs(os.path.join(self.templates_folder, "aaz"))
+        self._write_template("hello {{ name | shout }}")
+
+    def tearDown(self):
+        Config.AAZ_DEV_FOLDER = self._aaz_dev_folder
+        utils.templates._bytecode_cache = self._bytecode_cache
+        shutil.rmtree(self.folder)
+
+    def _write_template(self, data):
+        with open(os.path.join(self.templates_folder, "aaz", "hello.j2"), 'w') as f:
+            f.write(data)
+
+    def test_bytecode_cache(self):
+        env = create_environment(self.templates_folder, self.FILTERS)
+        self.assertEqual(env.get_template("aaz/hello.j2").render(name="aaz"), "hello AAZ!")
+        self.assertEqual(len(os.listdir(os.path.join(Config.AAZ_DEV_FOLDER, "templates_cache"))), 1)
+
+        env = create_environment(self.templates_folder, self.FILTERS)
+        self.assertEqual(env.get_template("aaz/hello.j2").render(name="dev"), "hello DEV!")
+
+    def test_precompiled_templates(self):
+        compile_templates(self.templates_folder, self.FILTERS)
+        env = create_environment(self.templates_folder, self.FILTERS)
+        self.assertIsInstance(env.loader.loaders[0], ModuleLoader)
+        self.assertEqual(env.get_template("aaz/hello.j2").render(name="aaz"), "hello AAZ!")
+
+        # the template files not changed since verified are not hashed again
+        template_checksums = utils.templates._template_checksums
+        utils.templates._template_checksums = None
+        try:
+            env = create_environment(self.templates_folder, self.FILTERS)
+        finally:
+            utils.templates._template_checksums = template_checksums
+        self.assertIsInstance(env.loader.loaders[0], ModuleLoader)
+
+        # the precompiled templates are out of date
+        self._write_template("bye {{ name | shout }}")
+        env = create_environment(self.templates_folder, self.FILTERS)
+        self.assertEqual(env.get_template("aaz/hello.j2").render(name="aaz"), "bye AAZ!")
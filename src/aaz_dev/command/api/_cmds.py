@@ -1,5 +1,6 @@
 import click
 import logging
+import os
 from flask import Blueprint
 import sys
 
@@ -75,69 +76,75 @@ def resource_id_type(value):
 def generate_command_models_from_swagger(swagger_tag, workspace_path=None):
     from swagger.controller.specs_manager import SwaggerSpecsManager
     from command.controller.specs_manager import AAZSpecsManager
-    from command.controller.workspace_manager import WorkspaceManager
-    from utils.config import Config
     from utils.exceptions import InvalidAPIUsage
-    from command.model.configuration import CMDHelp
 
     try:
         swagger_specs = SwaggerSpecsManager()
         aaz_specs = AAZSpecsManager()
-
-        module_manager = swagger_specs.get_module_manager(Config.DEFAULT_PLANE, Config.DEFAULT_SWAGGER_MODULE)
-        rp = module_manager.get_resource_provider(Config.DEFAULT_RESOURCE_PROVIDER)
-
-        resource_map = rp.get_resource_map_by_tag(swagger_tag)
-        if not resource_map:
-            raise InvalidAPIUsage(f"Tag `{swagger_tag}` is not exist")
-
-        version_resource_map = {}
-        for resource_id, version_map in resource_map.items():
-            v_list = [v for v in version_map]
-            if len(v_list) > 1:
-                raise InvalidAPIUsage(f"Tag `{swagger_tag}` contains multiple api versions of one resource", payload={
-                    "Resource": resource_id,
-                    "versions": v_list,
-                })
-            v = v_list[0]
-            if v not in version_resource_map:
-                version_resource_map[v] = []
-            version_resource_map[v].append({
-                "id": resource_id
-            })
-
-        ws = WorkspaceManager.new(
-            name=Config.DEFAULT_SWAGGER_MODULE,
-            plane=Config.DEFAULT_PLANE,
-            folder=workspace_path or WorkspaceManager.IN_MEMORY,  # if workspace path exist, use workspace else use in memory folder
-            swagger_manager=swagger_specs,
-            aaz_manager=aaz_specs,
+        ws = _generate_workspace_from_swagger(
+            swagger_specs, aaz_specs,
+            module=Config.DEFAULT_SWAGGER_MODULE,
+            resource_provider=Config.DEFAULT_RESOURCE_PROVIDER,
+            swagger_tag=swagger_tag,
+            workspace_path=workspace_path,
         )
-        mod_names = Config.DEFAULT_SWAGGER_MODULE.split('/')
-        for version, resources in version_resource_map.items():
-            ws.add_new_resources_by_swagger(
-                mod_names=mod_names, version=version, resources=resources
-            )
+        ws.generate_to_aaz()
 
-        # provide default short summary
-        for node in ws.iter_command_tree_nodes():
-            if not node.help:
-                node.help = CMDHelp()
-            if not node.help.short:
-                node.help.short = f"Manage {node.names[-1]}"
+    except InvalidAPIUsage as err:
+        logger.error(err)
+        sys.exit(1)
+    except ValueError as err:
+        logger.error(err)
+        sys.exit(1)
 
-        for leaf in ws.iter_command_tree_leaves():
-            if not leaf.help:
-                leaf.help = CMDHelp()
-            if not leaf.help.short:
-                n = leaf.names[-1]
-                n = n[0].upper() + n[1:]
-                leaf.help.short = f"{n} {leaf.names[-2]}"
 
-        if not ws.is_in_memory:
-            ws.save()
+@bp.cli.command("batch-generate-from-swagger", short_help="Generate command models into aaz from swagger specs by a manifest of modules, resource providers and tags")
+@click.option(
+    "--swagger-path", '-s',
+    type=click.Path(file_okay=False, dir_okay=True, readable=True, resolve_path=True),
+    default=Config.SWAGGER_PATH,
+    callback=Config.validate_and_setup_swagger_path,
+    expose_value=False,
+    help="The local path of azure-rest-api-specs repo. Official repo is https://github.com/Azure/azure-rest-api-specs"
+)
+@click.option(
+    "--swagger-module-path", "--sm",
+    type=click.Path(file_okay=False, dir_okay=True, readable=True, resolve_path=True),
+    default=Config.SWAGGER_MODULE_PATH,
+    callback=Config.validate_and_setup_swagger_module_path,
+    expose_value=False,
+    help="The local path of swagger in module level. It can be substituted for --swagger-path."
+)
+@click.option(
+    "--aaz-path", '-a',
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, readable=True, resolve_path=True),
+    default=Config.AAZ_PATH,
+    required=not Config.AAZ_PATH,
+    callback=Config.validate_and_setup_aaz_path,
+    expose_value=False,
+    help="The local path of aaz repo."
+)
+@click.option(
+    "--manifest",
+    type=click.Path(file_okay=True, dir_okay=False, readable=True, resolve_path=True),
+    required=True,
+    help="The path of a json file with a list of entries, each entry contains `module`, `resourceProvider`, "
+         "`swaggerTag` and optional `workspacePath`."
+)
+@click.option(
+    "--workers",
+    type=int,
+    default=1,
+    help="The number of worker processes to generate the workspaces of entries in parallel."
+)
+def batch_generate_command_models_from_swagger(manifest, workers=1):
+    from swagger.controller.specs_manager import SwaggerSpecsManager
+    from command.controller.specs_manager import AAZSpecsManager
+    from utils.exceptions import InvalidAPIUsage
 
-        ws.generate_to_aaz()
+    try:
+        entries = _load_generate_manifest(manifest)
+        _batch_generate_workspaces(SwaggerSpecsManager(), AAZSpecsManager(), entries, workers)
 
     except InvalidAPIUsage as err:
         logger.error(err)
@@ -145,3 +152,182 @@ def generate_command_models_from_swagger(swagger_tag, workspace_path=None):
     except ValueError as err:
         logger.error(err)
         sys.exit(1)
+
+
+def _load_generate_manifest(manifest):
+    import json
+    with open(manifest, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"Invalid manifest: Expect a list of entries: {manifest}")
+    entries = []
+    for idx, item in enumerate(data):
+        if not isinstance(item, dict):
+            raise ValueError(f"Invalid manifest entry {idx}: Expect an object")
+        for key in ('module', 'resourceProvider', 'swaggerTag'):
+            if not item.get(key, None):
+                raise ValueError(f"Invalid manifest entry {idx}: Miss `{key}`")
+        entries.append({
+            "module": item['module'],
+            "resource_provider": item['resourceProvider'],
+            "swagger_tag": item['swaggerTag'],
+            "workspace_path": item.get('workspacePath', None),
+        })
+    return entries
+
+
+def _batch_generate_workspaces(swagger_specs, aaz_specs, entries, workers):
+    for ws in _iter_generated_workspaces(swagger_specs, aaz_specs, entries, workers):
+        # the command models of entries are updated in order and saved to aaz only once
+        ws.generate_to_aaz(save=False)
+    aaz_specs.save()
+
+
+def _iter_generated_workspaces(swagger_specs, aaz_specs, entries, workers):
+    """Generate the workspaces of manifest entries and yield them in order.
+
+    The entries share the swagger specs, the aaz specs and the swagger documents cached in process. When there are
+    multiple workers, the entries are split into the groups which share no resource provider, resource or workspace
+    folder, and every group is generated in a forked worker process in order, so an entry still sees the command
+    models of the previous entries it overlaps with. The workspaces are exported to folders and loaded back in order,
+    so the command models of a module are only written to the aaz specs here in the main process.
+    """
+    from command.controller.workspace_manager import WorkspaceManager
+    from utils.fork_pool import can_fork, run_in_forked_processes
+
+    if workers > 1 and can_fork():
+        groups = _group_overlapped_entries(swagger_specs, entries)
+    else:
+        groups = [range(len(entries))]
+    if len(groups) <= 1:
+        for entry in entries:
+            yield _generate_workspace_from_swagger(swagger_specs, aaz_specs, **entry)
+        return
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp_folder:
+        entries = [
+            {**entry, "workspace_path": entry['workspace_path'] or os.path.join(tmp_folder, str(idx))}
+            for idx, entry in enumerate(entries)
+        ]
+        run_in_forked_processes([
+            (_generate_workspaces_in_worker, (swagger_specs, aaz_specs, [entries[idx] for idx in group]))
+            for group in groups
+        ], workers)
+        for entry in entries:
+            ws = WorkspaceManager(
+                name=entry['module'],
+                folder=entry['workspace_path'],
+                swagger_manager=swagger_specs,
+                aaz_manager=aaz_specs,
+            )
+            ws.load()
+            yield ws
+
+
+def _group_overlapped_entries(swagger_specs, entries):
+    """Split the indexes of entries into the groups in order, the entries sharing a resource provider, a resource or
+    a workspace folder are in the same group."""
+    from utils.exceptions import InvalidAPIUsage
+
+    parents = list(range(len(entries)))
+
+    def find(idx):
+        while parents[idx] != idx:
+            parents[idx] = parents[parents[idx]]
+            idx = parents[idx]
+        return idx
+
+    owners = {}
+    for idx, entry in enumerate(entries):
+        keys = [('rp', entry['module'], entry['resource_provider'])]
+        if entry.get('workspace_path', None):
+            keys.append(('workspace', os.path.abspath(entry['workspace_path'])))
+        try:
+            rp = swagger_specs.get_module_manager(Config.DEFAULT_PLANE, entry['module']).get_resource_provider(
+                entry['resource_provider'])
+            keys.extend(('resource', resource_id) for resource_id in rp.get_resource_map_by_tag(entry['swagger_tag']))
+        except InvalidAPIUsage:
+            # the error is raised when the entry is generated
+            pass
+        for key in keys:
+            owner = owners.setdefault(key, idx)
+            parents[find(idx)] = find(owner)
+
+    groups = {}
+    for idx in range(len(entries)):
+        groups.setdefault(find(idx), []).append(idx)
+    return [*groups.values()]
+
+
+def _generate_workspaces_in_worker(swagger_specs, aaz_specs, entries):
+    """Generate and save the workspaces of a group of manifest entries in order.
+
+    The command models of every entry are updated to the aaz specs inherited by the worker process for the next
+    entries, the same as they are generated in the main process.
+    """
+    for idx, entry in enumerate(entries):
+        ws = _generate_workspace_from_swagger(swagger_specs, aaz_specs, **entry)
+        if idx < len(entries) - 1:
+            ws.generate_to_aaz(save=False)
+
+
+def _generate_workspace_from_swagger(swagger_specs, aaz_specs, module, resource_provider, swagger_tag,
+                                     workspace_path=None):
+    from command.controller.workspace_manager import WorkspaceManager
+    from utils.exceptions import InvalidAPIUsage
+    from command.model.configuration import CMDHelp
+
+    module_manager = swagger_specs.get_module_manager(Config.DEFAULT_PLANE, module)
+    rp = module_manager.get_resource_provider(resource_provider)
+
+    resource_map = rp.get_resource_map_by_tag(swagger_tag)
+    if not resource_map:
+        raise InvalidAPIUsage(f"Tag `{swagger_tag}` is not exist")
+
+    version_resource_map = {}
+    for resource_id, version_map in resource_map.items():
+        v_list = [v for v in version_map]
+        if len(v_list) > 1:
+            raise InvalidAPIUsage(f"Tag `{swagger_tag}` contains multiple api versions of one resource", payload={
+                "Resource": resource_id,
+                "versions": v_list,
+            })
+        v = v_list[0]
+        if v not in version_resource_map:
+            version_resource_map[v] = []
+        version_resource_map[v].append({
+            "id": resource_id
+        })
+
+    ws = WorkspaceManager.new(
+        name=module,
+        plane=Config.DEFAULT_PLANE,
+        folder=workspace_path or WorkspaceManager.IN_MEMORY,  # if workspace path exist, use workspace else use in memory folder
+        swagger_manager=swagger_specs,
+        aaz_manager=aaz_specs,
+    )
+    mod_names = module.split('/')
+    for version, resources in version_resource_map.items():
+        ws.add_new_resources_by_swagger(
+            mod_names=mod_names, version=version, resources=resources
+        )
+
+    # provide default short summary
+    for node in ws.iter_command_tree_nodes():
+        if not node.help:
+            node.help = CMDHelp()
+        if not node.help.short:
+            node.help.short = f"Manage {node.names[-1]}"
+
+    for leaf in ws.iter_command_tree_leaves():
+        if not leaf.help:
+            leaf.help = CMDHelp()
+        if not leaf.help.short:
+            n = leaf.names[-1]
+            n = n[0].upper() + n[1:]
+            leaf.help.short = f"{n} {leaf.names[-2]}"
+
+    if not ws.is_in_memory:
+        ws.save()
+    return ws
@@ -2,6 +2,7 @@ import os
 
 from flask import Blueprint, jsonify, request, url_for
 
+from app.manager_registry import get_manager_registry
 from command.controller.workspace_manager import WorkspaceManager
 from utils import exceptions
 from utils.config import Config
@@ -19,7 +20,9 @@ def editor_workspaces():
             raise exceptions.InvalidAPIUsage("Invalid request body")
         name = data['name']
         plane = data['plane']
-        manager = WorkspaceManager.new(name, plane)
+        registry = get_manager_registry()
+        manager = WorkspaceManager.new(
+            name, plane, aaz_manager=registry.get_aaz_specs(), swagger_manager=registry.get_swagger_specs())
         manager.save()
         result = manager.ws.to_primitive()
         result.update({
@@ -42,10 +45,10 @@ def editor_workspaces():
 
 @bp.route("/Workspaces/<name>", methods=("GET", "DELETE"))
 def editor_workspace(name):
-    manager = WorkspaceManager(name)
     if request.method == "GET":
-        manager.load()
+        manager = get_manager_registry().get_workspace(name)
     elif request.method == "DELETE":
+        manager = get_manager_registry().get_workspace(name, load=False)
         if manager.delete():
             return '', 200
         else:
@@ -64,8 +67,7 @@ def editor_workspace(name):
 
 @bp.route("/Workspaces/<name>/SwaggerDefault", methods=("GET",))
 def get_workspace_swagger_default_options(name):
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     result = {
         "plane": manager.ws.plane,
         "modNames": Config.DEFAULT_SWAGGER_MODULE.split('/') if Config.DEFAULT_SWAGGER_MODULE else None,
@@ -81,7 +83,7 @@ def get_workspace_swagger_default_options(name):
 
 @bp.route("/Workspaces/<name>/Rename", methods=("POST",))
 def rename_workspace(name):
-    manager = WorkspaceManager(name)
+    manager = get_manager_registry().get_workspace(name, load=False)
     if request.method == "POST":
         data = request.get_json()
         if 'name' not in data or not data['name']:
@@ -101,9 +103,11 @@ def rename_workspace(name):
 
 @bp.route("/Workspaces/<name>/Generate", methods=("POST",))
 def editor_workspace_generate(name):
-    manager = WorkspaceManager(name)
-    manager.load()
-    manager.generate_to_aaz()
+    registry = get_manager_registry()
+    manager = registry.get_workspace(name)
+    with registry.edit_aaz_specs() as aaz_specs:
+        manager.aaz_specs = aaz_specs
+        manager.generate_to_aaz()
     return "", 200
 
 
@@ -114,8 +118,7 @@ def editor_workspace_command_tree_node(name, node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     node = manager.find_command_tree_node(*node_names)
     if not node and request.method != "DELETE":
         raise exceptions.ResourceNotFind("Command group not exist")
@@ -162,8 +165,7 @@ def editor_workspace_command_tree_node_rename(name, node_names):
     if not node_names:
         raise exceptions.InvalidAPIUsage("Cannot Rename root node")
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.find_command_tree_node(*node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
 
@@ -186,8 +188,7 @@ def editor_workspace_command(name, node_names, leaf_name):
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     leaf = manager.find_command_tree_leaf(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -234,8 +235,7 @@ def editor_workspace_command_rename(name, node_names, leaf_name):
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.find_command_tree_leaf(*node_names, leaf_name):
         raise exceptions.ResourceNotFind("Command not exist")
 
@@ -270,8 +270,7 @@ def editor_workspace_command_argument(name, node_names, leaf_name, arg_var):
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     leaf = manager.find_command_tree_leaf(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -307,8 +306,7 @@ def editor_workspace_command_argument_flatten(name, node_names, leaf_name, arg_v
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     leaf = manager.find_command_tree_leaf(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -333,8 +331,7 @@ def editor_workspace_command_argument_unflatten(name, node_names, leaf_name, arg
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     leaf = manager.find_command_tree_leaf(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -364,8 +361,7 @@ def editor_workspace_command_argument_unwrap_class(name, node_names, leaf_name,
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     leaf = manager.find_command_tree_leaf(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -387,8 +383,7 @@ def editor_workspace_command_argument_find_similar(name, node_names, leaf_name,
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     leaf = manager.find_command_tree_leaf(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -446,8 +441,7 @@ def editor_workspace_tree_node_resources(name, node_names):
     if len(node_names) > 0:
         raise exceptions.InvalidAPIUsage("Not support to add resources under a specific node.")
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.find_command_tree_node(*node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
 
@@ -478,8 +472,7 @@ def editor_workspace_resources(name, node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.find_command_tree_node(*node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
 
@@ -491,8 +484,7 @@ def editor_workspace_resources(name, node_names):
 
 @bp.route("/Workspaces/<name>/Resources/Merge", methods=("POST",))
 def editor_workspace_resources_merge(name):
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     data = request.get_json()
     if "mainResource" not in data or "plusResource" not in data:
         raise exceptions.InvalidAPIUsage("Invalid request")
@@ -509,8 +501,7 @@ def editor_workspace_resources_merge(name):
 @bp.route("/Workspaces/<name>/Resources/ReloadSwagger", methods=("POST",))
 def editor_workspace_resource_reload_swagger(name):
     # update resource by reloading swagger
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     data = request.get_json()
     try:
         resources = data['resources']
@@ -524,8 +515,7 @@ def editor_workspace_resource_reload_swagger(name):
 @bp.route("/Workspaces/<name>/Resources/<base64:resource_id>/V/<base64:version>", methods=("DELETE",))
 def editor_workspace_resource(name, resource_id, version):
     # remove commands of the resource, including commands of subresources
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.remove_resource(resource_id, version):
         return "", 204
     manager.save()
@@ -535,8 +525,7 @@ def editor_workspace_resource(name, resource_id, version):
 @bp.route("/Workspaces/<name>/Resources/<base64:resource_id>/V/<base64:version>/Commands", methods=("GET",))
 def list_workspace_resource_related_commands(name, resource_id, version):
     # list commands of the resource, including commands of sub resources
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     commands = manager.list_commands_by_resource(resource_id, version)
     result = [command.to_primitive() for command in commands]
     return jsonify(result)
@@ -545,8 +534,7 @@ def list_workspace_resource_related_commands(name, resource_id, version):
 @bp.route("/Workspaces/<name>/Resources/<base64:resource_id>/V/<base64:version>/Subresources", methods=("POST",))
 def editor_workspace_subresources(name, resource_id, version):
     # add subresource command
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     data = request.get_json()
     try:
         arg_var = data['arg']
@@ -562,8 +550,7 @@ def editor_workspace_subresources(name, resource_id, version):
 @bp.route("/Workspaces/<name>/Resources/<base64:resource_id>/V/<base64:version>/Subresources/<base64:subresource>", methods=("DELETE",))
 def editor_workspace_subresource(name, resource_id, version, subresource):
     # Remove commands of subresource
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.remove_subresource(resource_id, version, subresource):
         return "", 204
     manager.save()
@@ -573,8 +560,7 @@ def editor_workspace_subresource(name, resource_id, version, subresource):
 @bp.route("/Workspaces/<name>/Resources/<base64:resource_id>/V/<base64:version>/Subresources/<base64:subresource>/Commands", methods=("GET",))
 def list_workspace_subresource_related_commands(name, resource_id, version, subresource):
     # list commands of subresource
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     commands = manager.list_commands_by_subresource(resource_id, version, subresource)
     result = [command.to_primitive() for command in commands]
     return jsonify(result)
@@ -586,8 +572,7 @@ def editor_workspace_try_command_group(name, node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.find_command_tree_node(*node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
 
@@ -601,8 +586,7 @@ def editor_workspace_try_command(name, node_names, leaf_name):
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = WorkspaceManager(name)
-    manager.load()
+    manager = get_manager_registry().get_workspace(name)
     if not manager.find_command_tree_leaf(*node_names, leaf_name):
         raise exceptions.ResourceNotFind("Command not exist")
 
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, url_for
 from utils import exceptions
 from command.controller.specs_manager import AAZSpecsManager
+from app.manager_registry import get_manager_registry
 
 
 bp = Blueprint('specs', __name__, url_prefix='/AAZ/Specs')
@@ -13,7 +14,7 @@ def command_tree_node(node_names):
         raise exceptions.ResourceNotFind("Command group not exist")
     node_names = node_names[1:]
 
-    manager = AAZSpecsManager()
+    manager = get_manager_registry().get_aaz_specs()
     node = manager.find_command_group(*node_names)
     if not node:
         raise exceptions.ResourceNotFind("Command group not exist")
@@ -28,7 +29,7 @@ def command_tree_leaf(node_names, leaf_name):
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = AAZSpecsManager()
+    manager = get_manager_registry().get_aaz_specs()
     leaf = manager.find_command(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -43,7 +44,7 @@ def aaz_command_in_version(node_names, leaf_name, version_name):
         raise exceptions.ResourceNotFind("Command not exist")
     node_names = node_names[1:]
 
-    manager = AAZSpecsManager()
+    manager = get_manager_registry().get_aaz_specs()
     leaf = manager.find_command(*node_names, leaf_name)
     if not leaf:
         raise exceptions.ResourceNotFind("Command not exist")
@@ -57,7 +58,7 @@ def aaz_command_in_version(node_names, leaf_name, version_name):
     if not version:
         raise exceptions.ResourceNotFind("Command of version not exist")
 
-    cfg_reader = manager.load_resource_cfg_reader_by_command_with_version(leaf, version=version)
+    cfg_reader = manager.load_resource_cfg_reader_by_command_with_version(leaf, version=version, copy=False)
     cmd_cfg = cfg_reader.find_command(*leaf.names)
 
     result = cmd_cfg.to_primitive()
@@ -75,7 +76,7 @@ def aaz_command_in_version(node_names, leaf_name, version_name):
 
 @bp.route("/Resources/<plane>/<base64:resource_id>", methods=("GET", ))
 def get_resource(plane, resource_id):
-    manager = AAZSpecsManager()
+    manager = get_manager_registry().get_aaz_specs()
     versions = manager.get_resource_versions(plane, resource_id)
     if versions is None:
         raise exceptions.ResourceNotFind("Resource not exist")
@@ -91,7 +92,7 @@ def filter_resources(plane):
     data = request.get_json()
     if 'resources' not in data:
         raise exceptions.InvalidAPIUsage("Invalid request body")
-    manager = AAZSpecsManager()
+    manager = get_manager_registry().get_aaz_specs()
 
     result = {
         'resources': []
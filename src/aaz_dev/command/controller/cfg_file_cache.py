@@ -0,0 +1,140 @@
+import hashlib
+import logging
+import os
+import time
+
+from command.model.configuration import CMDConfiguration, BinarySerializer
+from utils.config import Config
+
+logger = logging.getLogger('backend')
+
+
+class CfgFileCache:
+    """Cache of the resource cfg files in compact binary format under AAZ_DEV_FOLDER.
+
+    The cached cfg is loaded without json parsing and model conversion. It's used only when the mtime and size of the
+    cfg file are the same as the ones it was cached from. The cache folder is pruned at most once every
+    `PRUNE_INTERVAL` seconds when a cfg is cached.
+    """
+
+    FOLDER_NAME = 'cfg_cache'
+    PRUNE_MARKER_NAME = '.pruned'
+
+    # the max total size in bytes of the cache files, the least recently cached ones are removed beyond it
+    MAX_SIZE = 512 * 1024 * 1024
+
+    PRUNE_INTERVAL = 24 * 60 * 60
+
+    def __init__(self):
+        self._prune_checked = False
+
+    def load(self, file_path):
+        """Return a new cfg loaded from the cache of file, or None if it's not cached or out of date."""
+        if not Config.CFG_FILE_CACHE:
+            return None
+        try:
+            header = self._stat_header(file_path)
+            with open(self._get_cache_path(file_path), 'rb') as f:
+                if f.readline() != header:
+                    return None
+                return BinarySerializer.from_bytes(CMDConfiguration, f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            # the cache file is broken or serialized by other versions of models
+            logger.debug(f"Failed to load cfg cache of {file_path}: {err}")
+            return None
+
+    def dump(self, file_path, cfg):
+        """Cache the cfg loaded from file, which should not be linked or modified yet."""
+        if not Config.CFG_FILE_CACHE:
+            return
+        cache_path = self._get_cache_path(file_path)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            data = self._stat_header(file_path) + BinarySerializer.to_bytes(cfg)
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, cache_path)
+        except Exception as err:
+            # the cache is optional, so the cfg is still loaded when it cannot be cached
+            logger.debug(f"Failed to save cfg cache of {file_path}: {err}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._prune_if_due()
+
+    def prune(self):
+        """Remove the cache files whose cfg files are removed, and the least recently cached ones beyond `MAX_SIZE`."""
+        folder = os.path.join(Config.AAZ_DEV_FOLDER, self.FOLDER_NAME)
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(folder):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    if name.endswith('.tmp'):
+                        # left by an interrupted dump
+                        if time.time() - stat.st_mtime > self.PRUNE_INTERVAL:
+                            os.remove(path)
+                        continue
+                    if not name.endswith('.bin'):
+                        continue
+                    with open(path, 'rb') as f:
+                        header = f.readline()
+                    source_path = header.rsplit(b'|', 2)[0].decode('utf-8')
+                    if not os.path.isfile(source_path):
+                        os.remove(path)
+                        continue
+                except (OSError, ValueError) as err:
+                    logger.debug(f"Failed to prune cfg cache {path}: {err}")
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.MAX_SIZE:
+                break
+            try:
+                os.remove(path)
+            except OSError as err:
+                logger.debug(f"Failed to prune cfg cache {path}: {err}")
+                continue
+            total_size -= size
+
+    def _prune_if_due(self):
+        # the marker is checked once in a process
+        if self._prune_checked:
+            return
+        self._prune_checked = True
+        marker_path = os.path.join(Config.AAZ_DEV_FOLDER, self.FOLDER_NAME, self.PRUNE_MARKER_NAME)
+        try:
+            if time.time() - os.stat(marker_path).st_mtime < self.PRUNE_INTERVAL:
+                return
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            logger.debug(f"Failed to check cfg cache prune marker: {err}")
+            return
+        try:
+            with open(marker_path, 'w'):
+                pass
+            self.prune()
+        except OSError as err:
+            logger.debug(f"Failed to prune cfg cache: {err}")
+
+    def _get_cache_path(self, file_path):
+        key = hashlib.sha256(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(Config.AAZ_DEV_FOLDER, self.FOLDER_NAME, key[:2], f"{key}.bin")
+
+    @staticmethod
+    def _stat_header(file_path):
+        stat = os.stat(file_path)
+        return f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}\n".encode('utf-8')
+
+
+cfg_file_cache = CfgFileCache()
@@ -22,11 +22,167 @@ class _SchemaIdxEnum:
     Json = "_json"
 
 
+class _CommandIndex:
+    """Index of the arguments and schemas in a command.
+
+    It's built by walking over the command once, in the same order as the lookups of CfgReader walk, so the lookups are
+    dictionary lookups with the same results. It's stored in `command.lookup_index` and dropped when the arguments or
+    schemas of command are changed.
+    """
+
+    def __init__(self, command):
+        # arguments: (parent, arg, arg_idx, arg_var) in walking order
+        self.args = [*CfgReader._walk_args_in_command(command)]
+        self.arg_vars = {}
+        self.flattened_arg_vars = {}
+        self.arg_cls_definitions = []
+        self.arg_cls_names = {}
+        self.arg_cls_references = {}
+        for pos, (_, arg, _, arg_var) in enumerate(self.args):
+            self.arg_vars.setdefault(arg_var, pos)
+            for i, c in enumerate(arg_var):
+                if c == '.':
+                    self.flattened_arg_vars.setdefault(arg_var[:i], pos)
+            cls_name = getattr(arg, 'cls', None)
+            if cls_name is not None:
+                self.arg_cls_definitions.append(pos)
+                self.arg_cls_names.setdefault(cls_name, pos)
+            if arg.type.startswith('@'):
+                self.arg_cls_references.setdefault(arg.type[1:], []).append(pos)
+
+        # schemas: (parent, schema, schema_idx) and whether it's in response
+        self.schema_arg_vars = {}
+        self.schema_cls_references = {}
+        for parent, schema, schema_idx, in_response in CfgReader._walk_schemas_in_command(command):
+            if schema is None:
+                continue
+            match = (parent, schema, schema_idx)
+            if not in_response:
+                arg_var = None
+                if isinstance(schema, CMDSchema):
+                    arg_var = schema.arg
+                elif isinstance(schema, CMDSchemaBase):
+                    if schema_idx[-1] == '[]' and isinstance(parent, CMDArraySchema) and parent.arg:
+                        arg_var = parent.arg + '[]'
+                    elif schema_idx[-1] == '{}' and isinstance(parent, CMDObjectSchema) and parent.arg:
+                        arg_var = parent.arg + '{}'
+                if arg_var is not None:
+                    self.schema_arg_vars.setdefault(arg_var, []).append(match)
+            schema_type = schema.type
+            if schema_type.startswith('@'):
+                self.schema_cls_references.setdefault(schema_type[1:], []).append(match)
+
+        self.schemas = {}
+        for operation in command.operations:
+            self._index_schemas_in_operation(operation)
+
+    def find_arg_with_parent_by_var(self, arg_var):
+        pos = self.arg_vars.get(arg_var, None)
+        flattened_pos = self.flattened_arg_vars.get(arg_var, None)
+        if flattened_pos is not None and (pos is None or flattened_pos < pos):
+            # arg_var already been flattened
+            return self.args[flattened_pos][0], None, None
+        if pos is None:
+            return None, None, None
+        parent, arg, arg_idx, _ = self.args[pos]
+        return parent, arg, arg_idx
+
+    def find_arg_cls_definition(self, cls_name):
+        pos = self.arg_cls_names.get(cls_name, None)
+        if pos is None:
+            return None, None, None, None
+        return self.args[pos]
+
+    def iter_arg_cls_definition(self, cls_name_prefix=None):
+        for pos in self.arg_cls_definitions:
+            if cls_name_prefix is None or self.args[pos][1].cls.startswith(cls_name_prefix):
+                yield self.args[pos]
+
+    def iter_arg_cls_reference(self, cls_name):
+        for pos in self.arg_cls_references.get(cls_name, []):
+            yield self.args[pos]
+
+    def iter_schema_by_arg_var(self, arg_var):
+        return iter(self.schema_arg_vars.get(arg_var, []))
+
+    def iter_schema_cls_reference(self, cls_name):
+        return iter(self.schema_cls_references.get(cls_name, []))
+
+    def find_schema(self, idx):
+        return self.schemas.get(tuple(idx), None)
+
+    def _index_schemas_in_operation(self, operation):
+        if isinstance(operation, CMDHttpOperation):
+            request = operation.http.request
+            if request:
+                prefix = (_SchemaIdxEnum.Http, _SchemaIdxEnum.Request)
+                for key, params in ((_SchemaIdxEnum.Path, request.path), (_SchemaIdxEnum.Query, request.query),
+                                    (_SchemaIdxEnum.Header, request.header)):
+                    if params and params.params:
+                        for param in params.params:
+                            self.schemas.setdefault((*prefix, key, param.name), param)
+                if isinstance(request.body, CMDHttpRequestJsonBody):
+                    self._index_schemas_in_json(request.body.json, (*prefix, _SchemaIdxEnum.Body, _SchemaIdxEnum.Json))
+            if operation.http.responses:
+                for response in operation.http.responses:
+                    if response.is_error or not isinstance(response.body, CMDHttpResponseJsonBody):
+                        continue
+                    response_idx = '_'.join([_SchemaIdxEnum.Response, *[str(code) for code in response.status_codes]])
+                    self._index_schemas_in_json(
+                        response.body.json, (_SchemaIdxEnum.Http, response_idx, _SchemaIdxEnum.Json))
+        elif isinstance(operation, CMDInstanceCreateOperation):
+            if isinstance(operation.instance_create, CMDJsonInstanceCreateAction):
+                self._index_schemas_in_json(
+                    operation.instance_create.json,
+                    (_SchemaIdxEnum.Instance, _SchemaIdxEnum.Create, _SchemaIdxEnum.Json))
+        elif isinstance(operation, CMDInstanceUpdateOperation):
+            if isinstance(operation.instance_update, CMDJsonInstanceUpdateAction):
+                self._index_schemas_in_json(
+                    operation.instance_update.json,
+                    (_SchemaIdxEnum.Instance, _SchemaIdxEnum.Update, _SchemaIdxEnum.Json))
+
+    def _index_schemas_in_json(self, js, idx):
+        schemas = {idx: js.schema}
+        self._index_sub_schemas(js.schema, idx, schemas)
+        for schema_idx, schema in schemas.items():
+            # the idx not found in the previous operation or response will be searched in the next one
+            if schema is not None:
+                self.schemas.setdefault(schema_idx, schema)
+
+    @classmethod
+    def _index_sub_schemas(cls, schema, idx, schemas):
+        # follow the way of `CfgReader.find_sub_schema`, only the first matched sub schema is searched for each idx
+        subs = []
+        if isinstance(schema, CMDObjectSchemaBase):
+            if schema.additional_props and schema.additional_props.item:
+                subs.append(('{}', schema.additional_props.item))
+            if schema.props:
+                subs.extend((prop.name, prop) for prop in schema.props)
+            elif schema.discriminators:
+                subs.extend((disc.value, disc) for disc in schema.discriminators)
+        elif isinstance(schema, CMDObjectSchemaDiscriminator):
+            if schema.props:
+                subs.extend((prop.name, prop) for prop in schema.props)
+            elif schema.discriminators:
+                subs.extend((disc.value, disc) for disc in schema.discriminators)
+        elif isinstance(schema, CMDArraySchemaBase):
+            subs.append(('[]', schema.item))
+
+        for name, sub in subs:
+            sub_idx = (*idx, name)
+            if sub_idx in schemas:
+                continue
+            schemas[sub_idx] = sub
+            cls._index_sub_schemas(sub, sub_idx, schemas)
+
+
 class CfgReader:
 
     def __init__(self, cfg):
         assert isinstance(cfg, CMDConfiguration)
         self.cfg = cfg
+        # (path, mtime_ns, size) of the file which cfg is loaded from, None if it's not loaded from a file
+        self.source = None
         self.link()
 
     def link(self):
@@ -303,29 +459,7 @@ class CfgReader:
     @classmethod
     def find_arg_in_command_with_parent_by_var(cls, command, arg_var):
         assert isinstance(arg_var, str), f"invalid arg_var type: {type(arg_var)}"
-
-        def arg_filter(_parent, _arg, _arg_idx, _arg_var):
-            if arg_var == _arg_var:
-                # find match
-                return (_parent, _arg, _arg_idx, _arg_var), True
-            elif _arg_var.startswith(f'{arg_var}.'):
-                # arg_var already been flattened
-                return (_parent, None, None, None), True
-            return None, False
-
-        for arg_group in command.arg_groups:
-            matches = [match for match in cls._iter_args_in_group(
-                arg_group, arg_filter=arg_filter
-            )]
-            if not matches:
-                continue
-            assert len(matches) == 1
-
-            parent, arg, arg_idx, arg_var = matches[0]
-            if arg:
-                arg_idx = cls.arg_idx_to_str(arg_idx)
-            return parent, arg, arg_idx
-        return None, None, None
+        return cls._get_command_index(command).find_arg_with_parent_by_var(arg_var)
 
     @classmethod
     def is_similar_args(cls, arg1, arg2):
@@ -386,26 +520,7 @@ class CfgReader:
     def _find_arg_cls_definition(cls, command, cls_name):
 
         assert isinstance(cls_name, str) and not cls_name.startswith('@')
-
-        def arg_filter(_parent, _arg, _arg_idx, _arg_var):
-            if getattr(_arg, 'cls', None) == cls_name:
-                # find match
-                return (_parent, _arg, _arg_idx, _arg_var), True
-            return None, False
-
-        for arg_group in command.arg_groups:
-            matches = [match for match in cls._iter_args_in_group(
-                arg_group, arg_filter=arg_filter
-            )]
-            if not matches:
-                continue
-            assert len(matches) == 1
-
-            parent, arg, arg_idx, arg_var = matches[0]
-            if arg:
-                arg_idx = cls.arg_idx_to_str(arg_idx)
-            return parent, arg, arg_idx, arg_var
-        return None, None, None, None
+        return cls._get_command_index(command).find_arg_cls_definition(cls_name)
 
     def iter_arg_cls_definition(self, *cmd_names, cls_name_prefix=None):
         command = self.find_command(*cmd_names)
@@ -424,18 +539,8 @@ class CfgReader:
                 # `<cls>_create`, `<cls>_update` kind cls_name only
                 cls_name_prefix += '_'
 
-        def arg_filter(_parent, _arg, _arg_idx, _arg_var):
-            _cls = getattr(_arg, 'cls', None)
-            if _cls is not None and (cls_name_prefix is None or _cls.startswith(cls_name_prefix)):
-                # find match
-                return (_parent, _arg, _arg_idx, _arg_var), False
-            return None, False
-
-        for arg_group in command.arg_groups:
-            for parent, arg, arg_idx, arg_var in cls._iter_args_in_group(arg_group, arg_filter=arg_filter):
-                if arg:
-                    arg_idx = cls.arg_idx_to_str(arg_idx)
-                yield parent, arg, arg_idx, arg_var
+        for match in cls._get_command_index(command).iter_arg_cls_definition(cls_name_prefix=cls_name_prefix):
+            yield match
 
     def iter_arg_cls_reference(self, *cmd_names, cls_name):
         command = self.find_command(*cmd_names)
@@ -449,32 +554,32 @@ class CfgReader:
     def _iter_arg_cls_reference(cls, command, cls_name):
         assert isinstance(cls_name, str) and not cls_name.startswith('@')
 
-        cls_type_name = f"@{cls_name}"
+        for match in cls._get_command_index(command).iter_arg_cls_reference(cls_name):
+            yield match
 
-        def arg_filter(_parent, _arg, _arg_idx, _arg_var):
-            if _arg.type == cls_type_name:
-                # find match
-                return (_parent, _arg, _arg_idx, _arg_var), False
-            return None, False
+    def iter_args_in_command(self, command):
+        for match in self._get_command_index(command).args:
+            yield match
 
-        for arg_group in command.arg_groups:
-            for parent, arg, arg_idx, arg_var in cls._iter_args_in_group(
-                    arg_group, arg_filter=arg_filter):
-                if arg:
-                    arg_idx = cls.arg_idx_to_str(arg_idx)
-                yield parent, arg, arg_idx, arg_var
+    @staticmethod
+    def _get_command_index(command):
+        if command.lookup_index is None:
+            command.lookup_index = _CommandIndex(command)
+        return command.lookup_index
 
-    def iter_args_in_command(self, command):
+    @classmethod
+    def _walk_args_in_command(cls, command):
         def arg_filter(_parent, _arg, _arg_idx, _arg_var):
             return (_parent, _arg, _arg_idx, _arg_var), False
 
+        if not command.arg_groups:
+            return
         for arg_group in command.arg_groups:
-            for parent, arg, arg_idx, arg_var in self._iter_args_in_group(arg_group, arg_filter=arg_filter):
+            for parent, arg, arg_idx, arg_var in cls._iter_args_in_group(arg_group, arg_filter=arg_filter):
                 if arg:
-                    arg_idx = self.arg_idx_to_str(arg_idx)
+                    arg_idx = cls.arg_idx_to_str(arg_idx)
                 yield parent, arg, arg_idx, arg_var
 
-    # TODO: build arg_idx in command link call
     @classmethod
     def _iter_args_in_group(cls, arg_group, arg_filter):
         assert isinstance(arg_group, CMDArgGroup)
@@ -565,6 +670,10 @@ class CfgReader:
     @classmethod
     def find_schema_in_command(cls, command, idx):
         assert isinstance(idx, list), f"invalid schema_idx type: {type(idx)}"
+        schema = cls._get_command_index(command).find_schema(idx)
+        if schema is not None:
+            return schema
+        # the idx is not in index, search it in operations to keep the behavior for the invalid idx
         for op in command.operations:
             schema = cls.find_schema_in_operation(op, idx)
             if schema:
@@ -724,9 +833,8 @@ class CfgReader:
 
     @classmethod
     def iter_schema_in_command_by_arg_var(cls, command, arg_var):
-        for operation in command.operations:
-            for match in cls.iter_schema_in_operation_by_arg_var(operation, arg_var):
-                yield match
+        for match in cls._get_command_index(command).iter_schema_by_arg_var(arg_var):
+            yield match
 
     @classmethod
     def iter_schema_in_operation_by_arg_var(cls, operation, arg_var):
@@ -771,9 +879,39 @@ class CfgReader:
 
     @classmethod
     def iter_schema_cls_reference(cls, command, cls_name):
-        for match in cls.iter_schema_cls_reference_in_operations(command.operations, cls_name):
+        assert isinstance(cls_name, str) and not cls_name.startswith('@')
+        for match in cls._get_command_index(command).iter_schema_cls_reference(cls_name):
             yield match
 
+    @classmethod
+    def _walk_schemas_in_command(cls, command):
+        """Walk over the schemas in command, the last value yielded is whether the schema is in response."""
+        def schema_filter(_parent, _schema, _schema_idx):
+            return (_parent, _schema, _schema_idx), False
+
+        for op in command.operations:
+            if isinstance(op, CMDHttpOperation):
+                if op.http.request:
+                    for parent, schema, schema_idx in cls._iter_schema_in_request(op.http.request, schema_filter=schema_filter):
+                        yield parent, schema, [_SchemaIdxEnum.Http, _SchemaIdxEnum.Request, *schema_idx], False
+                if op.http.responses:
+                    for response in op.http.responses:
+                        if response.is_error:
+                            continue
+                        schema_idx_prefix = [_SchemaIdxEnum.Http, '_'.join([_SchemaIdxEnum.Response, *[str(code) for code in response.status_codes]])]
+                        for parent, schema, schema_idx in cls._iter_schema_in_response(response, schema_filter=schema_filter):
+                            yield parent, schema, [*schema_idx_prefix, *schema_idx], True
+
+            if isinstance(op, CMDInstanceUpdateOperation):
+                if isinstance(op.instance_update, CMDJsonInstanceUpdateAction):
+                    for parent, schema, schema_idx in cls._iter_schema_in_json(op.instance_update.json, schema_filter=schema_filter):
+                        yield parent, schema, [_SchemaIdxEnum.Instance, _SchemaIdxEnum.Update, *schema_idx], False
+
+            if isinstance(op, CMDInstanceCreateOperation):
+                if isinstance(op.instance_create, CMDJsonInstanceCreateAction):
+                    for parent, schema, schema_idx in cls._iter_schema_in_json(op.instance_create.json, schema_filter=schema_filter):
+                        yield parent, schema, [_SchemaIdxEnum.Instance, _SchemaIdxEnum.Create, *schema_idx], False
+
     @classmethod
     def iter_schema_cls_reference_in_operations(cls, operations, cls_name):
         assert isinstance(cls_name, str) and not cls_name.startswith('@')
@@ -832,7 +970,6 @@ class CfgReader:
         for match in cls._iter_sub_schema(schema, schema_filter):
             yield match
 
-    # TODO: build schema_idx in command link call
     @classmethod
     def _iter_schema_in_request(cls, request, schema_filter):
         if request.path and request.path.params:
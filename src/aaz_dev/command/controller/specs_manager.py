@@ -1,19 +1,73 @@
 import json
 import os
 import re
-import shutil
+import threading
+from collections import OrderedDict
 
 from command.model.configuration import CMDConfiguration, CMDHelp, CMDCommandExample, XMLSerializer
 from utils.base64 import b64encode_str
 from utils.config import Config
-from command.model.specs import CMDSpecsCommandTree, CMDSpecsCommandGroup, CMDSpecsCommand, CMDSpecsCommandVersion, CMDSpecsResource
+from command.model.specs import CMDSpecsCommandTree, CMDSpecsLazyCommandTree, CMDSpecsCommandGroup, CMDSpecsCommand, CMDSpecsCommandVersion, CMDSpecsResource
 from command.templates import get_templates
 from utils import exceptions
+from .cfg_file_cache import cfg_file_cache
 from .cfg_reader import CfgReader
 from .cfg_validator import CfgValidator
+from .specs_writer import AAZSpecsWriter
 from collections import deque
 
 
+class CfgReaderCache:
+    """Process-wide LRU cache of the linked readers of resource cfg files.
+
+    A reader is reused only when the mtime and size of its cfg file are not changed. The cached readers are shared by
+    all the callers, so they must be read only.
+    """
+
+    def __init__(self, max_count=None):
+        self._max_count = max_count
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_count(self):
+        if self._max_count is None:
+            return Config.CFG_CACHE_SIZE
+        return self._max_count
+
+    def get(self, file_path, stat):
+        with self._lock:
+            entry = self._entries.get(file_path, None)
+            if entry is None:
+                return None
+            if entry[0] != stat:
+                del self._entries[file_path]
+                return None
+            self._entries.move_to_end(file_path)
+            return entry[1]
+
+    def put(self, file_path, stat, cfg_reader):
+        max_count = self.max_count
+        with self._lock:
+            self._entries.pop(file_path, None)
+            if max_count <= 0:
+                return
+            self._entries[file_path] = (stat, cfg_reader)
+            while len(self._entries) > max_count:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, file_path):
+        with self._lock:
+            self._entries.pop(file_path, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+cfg_reader_cache = CfgReaderCache()
+
+
 class AAZSpecsManager:
     COMMAND_TREE_ROOT_NAME = "aaz"
 
@@ -31,20 +85,22 @@ class AAZSpecsManager:
         self._modified_commands = set()
         self._modified_resource_cfgs = {}
 
+        # finish the save interrupted before
+        AAZSpecsWriter(self.folder).recover()
+
         tree_path = self.get_tree_file_path()
         if not os.path.exists(tree_path):
-            self.tree = CMDSpecsCommandTree()
-            self.tree.root = CMDSpecsCommandGroup({
+            self.tree = CMDSpecsLazyCommandTree(CMDSpecsCommandGroup({
                 "names": [self.COMMAND_TREE_ROOT_NAME]
-            })
+            }))
             return
 
         if not os.path.isfile(tree_path):
             raise ValueError(f"Invalid Command Tree file path, expect a file: {tree_path}")
 
+        # the command groups are converted only when they are accessed
         with open(tree_path, 'r') as f:
-            data = json.load(f)
-            self.tree = CMDSpecsCommandTree(data)
+            self.tree = CMDSpecsLazyCommandTree.from_json(f.read())
 
     # Commands folder
     def get_tree_file_path(self):
@@ -142,7 +198,12 @@ class AAZSpecsManager:
             for leaf in (node.commands or {}).values():
                 yield leaf
 
-    def load_resource_cfg_reader(self, plane, resource_id, version):
+    def load_resource_cfg_reader(self, plane, resource_id, version, copy=True):
+        """Load the reader of resource cfg.
+
+        A private reader is loaded by default. Set `copy` to False only for the read only callers, which get the
+        reader cached and shared in process, so neither the reader nor its cfg may be modified or linked again.
+        """
         key = (plane, resource_id, version)
         if key in self._modified_resource_cfgs:
             # cfg already modified
@@ -184,14 +245,28 @@ class AAZSpecsManager:
         if not os.path.isfile(json_path):
             raise ValueError(f"Invalid file path: {json_path}")
 
-        with open(json_path, 'r') as f:
-            #print(json_path)
-            data = json.load(f)
-        cfg = CMDConfiguration(data)
+        stat = os.stat(json_path)
+        stat = (stat.st_mtime_ns, stat.st_size)
+        if not copy:
+            cfg_reader = cfg_reader_cache.get(json_path, stat)
+            if cfg_reader is not None:
+                return cfg_reader
+
+        cfg = cfg_file_cache.load(json_path)
+        if cfg is None:
+            with open(json_path, 'r') as f:
+                #print(json_path)
+                data = json.load(f)
+            cfg = CMDConfiguration(data)
+            cfg_file_cache.dump(json_path, cfg)
 
-        return CfgReader(cfg)
+        cfg_reader = CfgReader(cfg)
+        cfg_reader.source = (json_path, *stat)
+        if not copy:
+            cfg_reader_cache.put(json_path, stat, cfg_reader)
+        return cfg_reader
 
-    def load_resource_cfg_reader_by_command_with_version(self, cmd, version):
+    def load_resource_cfg_reader_by_command_with_version(self, cmd, version, copy=True):
         if not isinstance(version, CMDSpecsCommandVersion):
             assert isinstance(version, str)
             version_name = version
@@ -203,7 +278,7 @@ class AAZSpecsManager:
         if not version:
             return None
         resource = version.resources[0]
-        return self.load_resource_cfg_reader(resource.plane, resource.id, resource.version)
+        return self.load_resource_cfg_reader(resource.plane, resource.id, resource.version, copy=copy)
 
     # command tree
     def create_command_group(self, *cg_names):
@@ -350,12 +425,11 @@ class AAZSpecsManager:
 
         self._modified_commands.add(cmd_names)
 
-    def _remove_cfg(self, cfg):
-        cfg_reader = CfgReader(cfg)
-
+    def _remove_cfg(self, cfg_reader):
+        # the reader can be the shared one in cache, so the cfg is not linked again by a new reader
         # update resource cfg
         for resource in cfg_reader.resources:
-            key = (cfg.plane, resource.id, resource.version)
+            key = (cfg_reader.cfg.plane, resource.id, resource.version)
             self._modified_resource_cfgs[key] = None
 
         # update command tree
@@ -371,9 +445,10 @@ class AAZSpecsManager:
 
         # remove previous cfg
         for resource in cfg_reader.resources:
-            pre_cfg_reader = self.load_resource_cfg_reader(cfg.plane, resource_id=resource.id, version=resource.version)
+            pre_cfg_reader = self.load_resource_cfg_reader(
+                cfg.plane, resource_id=resource.id, version=resource.version, copy=False)
             if pre_cfg_reader and pre_cfg_reader.cfg != cfg:
-                self._remove_cfg(pre_cfg_reader.cfg)
+                self._remove_cfg(pre_cfg_reader)
 
         # add new command version
         for cmd_names, cmd in cfg_reader.iter_commands():
@@ -425,22 +500,42 @@ class AAZSpecsManager:
         return command
 
     def verify_command_tree(self):
+        groups = []
+        for top_group in self.tree.iter_loaded_command_groups():
+            groups.extend(self.iter_command_groups(*top_group.names))
+
         details = {}
-        for group in self.iter_command_groups():
-            if group == self.tree.root:
-                continue
+        for group in groups:
             if not group.help or not group.help.short:
                 details[' '.join(group.names)] = {
                     'type': 'group',
                     'help': "Miss short summary."
                 }
 
-        for cmd in self.iter_commands():
+        for cmd in (leaf for group in groups for leaf in (group.commands or {}).values()):
             if not cmd.help or not cmd.help.short:
                 details[' '.join(cmd.names)] = {
                     'type': 'command',
                     'help': "Miss short summary."
                 }
+
+        # the command groups never accessed are verified in raw data without converting them
+        raws = [*self.tree.iter_raw_command_groups()]
+        while raws:
+            raw = raws.pop()
+            if not (raw.get('help', None) or {}).get('short', None):
+                details[' '.join(raw['names'])] = {
+                    'type': 'group',
+                    'help': "Miss short summary."
+                }
+            for cmd in (raw.get('commands', None) or {}).values():
+                if not (cmd.get('help', None) or {}).get('short', None):
+                    details[' '.join(cmd['names'])] = {
+                        'type': 'command',
+                        'help': "Miss short summary."
+                    }
+            raws.extend((raw.get('commandGroups', None) or {}).values())
+
         if details:
             raise exceptions.VerificationError(message="Invalid Command Tree", details=details)
 
@@ -450,10 +545,11 @@ class AAZSpecsManager:
         remove_files = []
         remove_folders = []
         update_files = {}
+        render_tasks = {}
         command_groups = set()
 
         tree_path = self.get_tree_file_path()
-        update_files[tree_path] = json.dumps(self.tree.to_primitive(), indent=2, sort_keys=True)
+        update_files[tree_path] = self.tree.to_json()
 
         # command
         for cmd_names in sorted(self._modified_commands):
@@ -463,7 +559,7 @@ class AAZSpecsManager:
                 # remove command file
                 remove_files.append(file_path)
             else:
-                update_files[file_path] = self.render_command_readme(cmd)
+                render_tasks[file_path] = (self.render_command_readme, (cmd, ))
 
             command_groups.add(tuple(cmd_names[:-1]))
 
@@ -481,9 +577,9 @@ class AAZSpecsManager:
                 # update command group readme
                 file_path = self.get_command_group_readme_path(*cg_names)
                 if cg == self.tree.root:
-                    update_files[file_path] = self.render_command_tree_readme(self.tree)
+                    render_tasks[file_path] = (self.render_command_tree_readme, (self.tree.summary(), ))
                 else:
-                    update_files[file_path] = self.render_command_group_readme(cg)
+                    render_tasks[file_path] = (self.render_command_group_readme, (cg, ))
 
         # cfg files
         for (plane, resource_id, version), cfg in self._modified_resource_cfgs.items():
@@ -496,23 +592,19 @@ class AAZSpecsManager:
             else:
                 main_resource = cfg.resources[0]
                 if main_resource.id != resource_id or main_resource.version != version:
-                    update_files[ref_file_path] = self.render_resource_ref_readme(
-                        plane=cfg.plane, ref_resource_id=main_resource.id, ref_resource_version=main_resource.version)
+                    render_tasks[ref_file_path] = (self.render_resource_ref_readme, (
+                        cfg.plane, main_resource.id, main_resource.version))
                 else:
-                    update_files[json_file_path] = self.render_resource_cfg_to_json(cfg)
-                    update_files[xml_file_path] = self.render_resource_cfg_to_xml(cfg)
-
-        for remove_file in remove_files:
-            if os.path.exists(remove_file):
-                os.remove(remove_file)
-
-        for remove_folder in remove_folders:
-            shutil.rmtree(remove_folder, ignore_errors=True)
-
-        for file_path, data in update_files.items():
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w') as f:
-                f.write(data)
+                    render_tasks[json_file_path] = (self.render_resource_cfg_to_json, (cfg, ))
+                    render_tasks[xml_file_path] = (self.render_resource_cfg_to_xml, (cfg, ))
+
+        # render files in parallel and write the changed ones only
+        writer = AAZSpecsWriter(self.folder)
+        update_files.update(zip(render_tasks.keys(), writer.render([*render_tasks.values()])))
+        writer.write(update_files, remove_files=remove_files, remove_folders=remove_folders)
+        for plane, resource_id, version in self._modified_resource_cfgs:
+            json_file_path, _ = self.get_resource_cfg_file_paths(plane, resource_id, version)
+            cfg_reader_cache.invalidate(json_file_path)
 
         self._modified_command_groups = set()
         self._modified_commands = set()
@@ -0,0 +1,228 @@
+import json
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+
+from utils.config import Config
+from utils.fork_pool import run_in_forked_processes
+
+logger = logging.getLogger('backend')
+
+
+class AAZSpecsWriter:
+    """Render and write the files of aaz specs.
+
+    The files are rendered in current process unless `AAZ_SPECS_SAVE_WORKERS` is configured, then across worker
+    processes forked after the render tasks are prepared, so the models to be rendered are inherited by workers without
+    pickling. The files whose content is not changed are skipped. The other files are written into a staging folder
+    first and then moved into place as recorded in a journal, so a save interrupted in the middle is rolled back or
+    rolled forward by `recover`. The staged files and the journal are flushed to disk before the journal is committed.
+
+    The staging folder is in the aaz folder, so the files are moved into place by renaming on the same volume. It's
+    ignored by git with a `.gitignore` inside, and it's existed only while a save is in progress. Creating the folder
+    acquires the save, and the owner process recorded in journal keeps others from recovering it until the owner is
+    gone or the folder is not touched for `STALE_SECONDS`.
+    """
+
+    STAGING_FOLDER_NAME = '.aaz_dev_staging'
+    JOURNAL_FILE_NAME = 'journal.json'
+
+    # the minimum number of render tasks to use worker processes
+    MIN_PARALLEL_TASKS = 8
+
+    # the staging folder of an owner not touched in this period is taken as interrupted
+    STALE_SECONDS = 120
+
+    # the staging folders used by the saves in progress of current process
+    _active_staging_folders = set()
+    _active_lock = threading.Lock()
+
+    def __init__(self, folder, workers=None):
+        self.folder = folder
+        self.workers = workers
+        self.staging_folder = os.path.join(folder, self.STAGING_FOLDER_NAME)
+        self.journal_path = os.path.join(self.staging_folder, self.JOURNAL_FILE_NAME)
+
+    def render(self, tasks):
+        """Run the render tasks of (func, args) and return the rendered results in order."""
+        workers = self.workers
+        if workers is None:
+            workers = Config.SPECS_SAVE_WORKERS
+        if len(tasks) < self.MIN_PARALLEL_TASKS:
+            workers = 1
+        return run_in_forked_processes(tasks, workers)
+
+    def write(self, update_files, remove_files=(), remove_folders=()):
+        """Commit the file changes in aaz specs and return the paths of the files updated.
+
+        `update_files` is a dict of file path to content, the files with the same content on disk are skipped.
+        """
+        remove_files = [file_path for file_path in remove_files if os.path.exists(file_path)]
+        remove_folders = [folder for folder in remove_folders if os.path.exists(folder)]
+        updates = [
+            (file_path, data) for file_path, data in update_files.items()
+            if self._read(file_path) != data or self._is_in_folders(file_path, remove_folders)
+        ]
+        if not updates and not remove_files and not remove_folders:
+            return []
+
+        self._acquire_staging_folder()
+        try:
+            journal = {
+                "owner": self._get_owner(),
+                "committed": False,
+                "updates": [],
+                "removeFiles": remove_files,
+                "removeFolders": remove_folders,
+            }
+            self._write_journal(journal)
+
+            for idx, (file_path, data) in enumerate(updates):
+                staged_path = os.path.join(self.staging_folder, f"{idx}.tmp")
+                with open(staged_path, 'w') as f:
+                    f.write(data)
+                    self._fsync(f)
+                journal["updates"].append([staged_path, file_path])
+            # the staged files are durable before the journal is committed
+            self._fsync_folder(self.staging_folder)
+        except BaseException:
+            shutil.rmtree(self.staging_folder, ignore_errors=True)
+            self._release_staging_folder()
+            raise
+
+        journal["committed"] = True
+        try:
+            self._write_journal(journal)
+            self._apply_journal(journal)
+        finally:
+            self._release_staging_folder()
+        return [file_path for file_path, _ in updates]
+
+    def recover(self):
+        """Roll forward the save interrupted after committed, or roll back the one before committed.
+
+        The staging folder of a save still in progress by another thread or process is left as it is.
+        """
+        if not os.path.exists(self.staging_folder):
+            return
+        try:
+            with open(self.journal_path, 'r') as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            journal = None
+        if self._is_in_progress(journal):
+            return
+        if journal and journal.get("committed", False):
+            logger.warning(f"Recover the interrupted save of aaz specs: {self.folder}")
+            self._apply_journal(journal)
+        else:
+            shutil.rmtree(self.staging_folder, ignore_errors=True)
+
+    def _acquire_staging_folder(self):
+        deadline = time.monotonic() + self.STALE_SECONDS * 2
+        while True:
+            self.recover()
+            try:
+                os.mkdir(self.staging_folder)
+                break
+            except FileExistsError:
+                # saving by others
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"The aaz specs are being saved by others: {self.staging_folder}")
+                time.sleep(0.1)
+        with self._active_lock:
+            self._active_staging_folders.add(self.staging_folder)
+        with open(os.path.join(self.staging_folder, '.gitignore'), 'w') as f:
+            f.write('*\n')
+
+    def _release_staging_folder(self):
+        with self._active_lock:
+            self._active_staging_folders.discard(self.staging_folder)
+
+    def _is_in_progress(self, journal):
+        with self._active_lock:
+            if self.staging_folder in self._active_staging_folders:
+                return True
+        owner = (journal or {}).get("owner", None)
+        if owner and owner.get("host", None) == socket.gethostname():
+            if owner.get("pid", None) == os.getpid():
+                # not active in current process
+                return False
+            if not self._is_process_alive(owner["pid"]):
+                return False
+        try:
+            mtime = os.stat(self.staging_folder).st_mtime
+        except OSError:
+            return False
+        return time.time() - mtime < self.STALE_SECONDS
+
+    @staticmethod
+    def _get_owner():
+        return {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "time": time.time(),
+        }
+
+    @staticmethod
+    def _is_process_alive(pid):
+        if os.name == 'nt':
+            # os.kill terminates the process on Windows, so rely on the mtime of staging folder only
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _apply_journal(self, journal):
+        for file_path in journal["removeFiles"]:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        for folder in journal["removeFolders"]:
+            shutil.rmtree(folder, ignore_errors=True)
+        for staged_path, file_path in journal["updates"]:
+            if os.path.exists(staged_path):
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                os.replace(staged_path, file_path)
+        shutil.rmtree(self.staging_folder, ignore_errors=True)
+
+    def _write_journal(self, journal):
+        tmp_path = f"{self.journal_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(journal, f)
+            self._fsync(f)
+        os.replace(tmp_path, self.journal_path)
+        self._fsync_folder(self.staging_folder)
+
+    @staticmethod
+    def _fsync(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    @staticmethod
+    def _fsync_folder(folder):
+        if os.name == 'nt':
+            # the folders cannot be opened to fsync on Windows
+            return
+        fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _is_in_folders(file_path, folders):
+        return any(file_path.startswith(os.path.join(folder, '')) for folder in folders)
+
+    @staticmethod
+    def _read(file_path):
+        if not os.path.isfile(file_path):
+            return None
+        with open(file_path, 'r') as f:
+            return f.read()
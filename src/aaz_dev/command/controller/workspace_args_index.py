@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import os
+
+from command.model.configuration import CMDArg, CMDObjectArgBase, CMDArrayArgBase, get_models_signature
+from .cfg_reader import CfgReader
+
+logger = logging.getLogger('backend')
+
+
+class WorkspaceArgsIndex:
+    """Index of the arguments in the cfg files of workspace, which is used to find similar arguments without loading
+    the cfg files.
+
+    For every command it records the arguments found by arg var, and the sub arguments of arg cls definitions, with
+    the similar keys of arguments. Two arguments are similar by `CfgReader.is_similar_args` when they have the same
+    similar key.
+
+    The index is saved with the workspace version, so it's dropped when the workspace is saved by others.
+    """
+
+    VERSION = 1
+
+    @staticmethod
+    def get_path(ws_folder):
+        return os.path.join(ws_folder, "args.index.json")
+
+    @classmethod
+    def load(cls, ws_folder, ws_version):
+        """Load the index saved with the workspace version, return None if it's not exist or out of date."""
+        try:
+            with open(cls.get_path(ws_folder), 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            logger.debug(f"Failed to load workspace args index in {ws_folder}: {err}")
+            return None
+        if data.get('version') != cls.VERSION or data.get('models') != get_models_signature() or \
+                data.get('wsVersion') != ws_version.isoformat():
+            return None
+        return cls(data['resources'])
+
+    def __init__(self, resources=None):
+        # main resource id of cfg file => {"version": version, "resources": [resource id], "commands": {...}}
+        self.resources = resources or {}
+        self._resource_ids = {}
+        for main_resource_id, entry in self.resources.items():
+            for resource_id in entry['resources']:
+                self._resource_ids[resource_id] = main_resource_id
+
+    def dumps(self, ws_version):
+        return json.dumps({
+            "version": self.VERSION,
+            "models": get_models_signature(),
+            "wsVersion": ws_version.isoformat(),
+            "resources": self.resources,
+        }, ensure_ascii=False)
+
+    def update_cfg(self, cfg_editor):
+        """Index the commands in cfg editor, which should be the same as the one loaded from its cfg file."""
+        main_resource = cfg_editor.resources[0]
+        self.remove_cfg(cfg_editor)
+        commands = {}
+        for cmd_names, command in cfg_editor.iter_commands():
+            commands[' '.join(cmd_names)] = self.build_command_index(command)
+        self.resources[main_resource.id] = {
+            "version": main_resource.version,
+            "resources": [resource.id for resource in cfg_editor.resources],
+            "commands": commands,
+        }
+        for resource in cfg_editor.resources:
+            self._resource_ids[resource.id] = main_resource.id
+
+    def remove_cfg(self, cfg_editor):
+        for resource in cfg_editor.resources:
+            main_resource_id = self._resource_ids.pop(resource.id, None)
+            entry = self.resources.pop(main_resource_id, None)
+            if entry is not None:
+                for resource_id in entry['resources']:
+                    self._resource_ids.pop(resource_id, None)
+
+    def find_command(self, resource_id, version, *cmd_names):
+        """Return the index of command in the cfg file of resource, or None if it's not indexed."""
+        entry = self.resources.get(self._resource_ids.get(resource_id, None), None)
+        if entry is None or entry['version'] != version:
+            return None
+        return entry['commands'].get(' '.join(cmd_names), None)
+
+    @classmethod
+    def build_command_index(cls, command):
+        similar_keys = {}
+        command_index = CfgReader._get_command_index(command)
+        args = {}
+        for _, arg, _, arg_var in command_index.args:
+            if arg_var in args or arg_var.startswith('@'):
+                continue
+            # the same as CfgReader.find_arg_in_command_by_var, which ignores the flattened arg vars
+            arg, arg_idx = CfgReader.find_arg_in_command_by_var(command, arg_var=arg_var)
+            args[arg_var] = None if arg is None else [arg_idx, cls._get_similar_key(arg, similar_keys)]
+
+        cls_definitions = []
+        for _, arg, arg_idx, _ in command_index.iter_arg_cls_definition():
+            cls_definitions.append([
+                arg.cls,
+                arg_idx,
+                cls._build_sub_args_tree(arg, similar_keys),
+                [ref_arg_idx for _, _, ref_arg_idx, _ in command_index.iter_arg_cls_reference(arg.cls)],
+            ])
+        return {
+            "args": {arg_var: value for arg_var, value in args.items() if value is not None},
+            "clsDefinitions": cls_definitions,
+        }
+
+    @staticmethod
+    def find_arg_by_var(command_index, arg_var):
+        """Return the (arg_var, arg_idx, similar_key) of argument in command index."""
+        match = command_index['args'].get(arg_var, None)
+        if match is None:
+            return None, None, None
+        arg_idx, similar_key = match
+        return arg_var, arg_idx, similar_key
+
+    @staticmethod
+    def iter_arg_cls_definition(command_index, cls_name_prefix):
+        """The same as CfgReader.iter_arg_cls_definition, yield the (cls_name, arg_idx, sub_args_tree, ref_args_idx)."""
+        if not cls_name_prefix.endswith('_'):
+            cls_name_prefix += '_'
+        for cls_definition in command_index['clsDefinitions']:
+            if cls_definition[0].startswith(cls_name_prefix):
+                yield cls_definition
+
+    @classmethod
+    def find_sub_arg(cls, sub_args_tree, idx):
+        """The same as CfgReader.find_sub_arg, return the (arg_var, similar_key) of sub argument in tree."""
+        node = sub_args_tree
+        for current_idx in CfgReader.arg_idx_to_list(idx):
+            if 'args' in node:
+                if current_idx == '{}':
+                    node = node.get('additionalProps', None)
+                else:
+                    node = next((sub_node for options, sub_node in node['args'] if current_idx in options), None)
+            elif 'item' in node and current_idx == '[]':
+                node = node['item']
+            else:
+                node = None
+            if node is None:
+                return None, None
+        return node.get('var', None), node.get('key', None)
+
+    @classmethod
+    def _build_sub_args_tree(cls, arg, similar_keys):
+        node = {}
+        if isinstance(arg, CMDArg):
+            node['var'] = arg.var
+            node['key'] = cls._get_similar_key(arg, similar_keys)
+        if isinstance(arg, CMDObjectArgBase):
+            node['args'] = [
+                [sub_arg.options, cls._build_sub_args_tree(sub_arg, similar_keys)] for sub_arg in arg.args or []
+            ]
+            if arg.additional_props and arg.additional_props.item:
+                node['additionalProps'] = cls._build_sub_args_tree(arg.additional_props.item, similar_keys)
+        elif isinstance(arg, CMDArrayArgBase):
+            node['item'] = None if arg.item is None else cls._build_sub_args_tree(arg.item, similar_keys)
+        return node
+
+    @classmethod
+    def get_similar_key(cls, arg):
+        return cls._get_similar_key(arg, {})
+
+    @classmethod
+    def _get_similar_key(cls, arg, similar_keys):
+        # the properties compared in CfgReader.is_similar_args, which is only for the arguments with options
+        if not isinstance(arg, CMDArg):
+            return None
+        key = similar_keys.get(id(arg), None)
+        if key is None:
+            key = cls._hash([sorted(set(arg.options)), arg.stage, arg.hide, cls._get_base_key(arg, similar_keys)])
+            similar_keys[id(arg)] = key
+        return key
+
+    @classmethod
+    def _get_base_key(cls, arg, similar_keys):
+        # the properties compared in CfgReader._is_similar_args_in_base
+        if arg is None:
+            return None
+        if isinstance(arg, CMDArrayArgBase):
+            return cls._hash(["array", cls._get_base_key(arg.item, similar_keys)])
+        if isinstance(arg, CMDObjectArgBase):
+            # the options of the sub arguments are different, so they are compared as sets.
+            sub_keys = sorted(cls._get_similar_key(sub_arg, similar_keys) for sub_arg in arg.args or [])
+            additional_props = None
+            if arg.additional_props is not None:
+                additional_props = [cls._get_base_key(arg.additional_props.item, similar_keys)]
+            return cls._hash(["object", sub_keys, additional_props])
+        return cls._hash(["type", arg.type])
+
+    @staticmethod
+    def _hash(value):
+        return hashlib.blake2b(json.dumps(value).encode('utf-8'), digest_size=16).hexdigest()
@@ -1,4 +1,5 @@
 import copy
+import hashlib
 import json
 import logging
 import os
@@ -7,6 +8,7 @@ from command.model.configuration import *
 from utils import exceptions
 from utils.base64 import b64encode_str
 from utils.case import to_camel_case
+from .cfg_file_cache import cfg_file_cache
 from .cfg_reader import CfgReader
 
 logger = logging.getLogger('backend')
@@ -31,24 +33,66 @@ class WorkspaceCfgEditor(CfgReader):
     def get_cfg_path(cls, ws_folder, resource_id):
         return os.path.join(cls.get_cfg_folder(ws_folder, resource_id), f"cfg.json")
 
+    @classmethod
+    def get_cfg_marker_path(cls, ws_folder, resource_id):
+        return os.path.join(cls.get_cfg_folder(ws_folder, resource_id), f"cfg.normalized.json")
+
     @classmethod
     def load_resource(cls, ws_folder, resource_id, version):
-        path = cls.get_cfg_path(ws_folder, resource_id)
-        with open(path, 'r') as f:
-            data = json.load(f)
-        if '$ref' in data:
-            ref_resource_id = data['$ref']
-            path = cls.get_cfg_path(ws_folder, ref_resource_id)
-            with open(path, 'r') as f:
-                data = json.load(f)
-        cfg = CMDConfiguration(data)
+        cfg_path = cls.get_cfg_path(ws_folder, resource_id)
+        cfg = cls._load_cfg_file(cfg_path)
+        if isinstance(cfg, str):
+            ref_resource_id = cfg
+            cfg_path = cls.get_cfg_path(ws_folder, ref_resource_id)
+            cfg = cls._load_cfg_file(cfg_path)
+            resource_id = ref_resource_id
         for resource in cfg.resources:
             if resource.version != version:
                 raise ValueError(f"Resource version not match: {version} != {resource.version}")
         cfg_editor = cls(cfg)
-        cfg_editor.reformat()
+        digest = cls._load_normalized_digest(cfg_path, cls.get_cfg_marker_path(ws_folder, resource_id))
+        if digest is None:
+            cfg_editor.reformat()
+        else:
+            # the cfg file is saved after reformat already
+            cfg_editor.normalized_digest = digest
         return cfg_editor
 
+    @staticmethod
+    def _load_cfg_file(path):
+        """Load the cfg in file, or return the referenced resource id if it's a reference file."""
+        cfg = cfg_file_cache.load(path)
+        if cfg is None:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if '$ref' in data:
+                return data['$ref']
+            cfg = CMDConfiguration(data)
+            cfg_file_cache.dump(path, cfg)
+        return cfg
+
+    @classmethod
+    def _load_normalized_digest(cls, cfg_path, marker_path):
+        """Return the digest of cfg file if it's marked as normalized by the models in use, otherwise None."""
+        try:
+            with open(marker_path, 'r') as f:
+                marker = json.load(f)
+            if marker.get('version') != cls.NORMALIZED_MARKER_VERSION or \
+                    marker.get('models') != get_models_signature():
+                return None
+            with open(cfg_path, 'r') as f:
+                digest = cls._get_cfg_data_digest(f.read())
+        except (OSError, ValueError):
+            return None
+        if marker.get('sha256') != digest:
+            # the cfg file is modified after the marker saved
+            return None
+        return digest
+
+    @staticmethod
+    def _get_cfg_data_digest(data):
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
     @classmethod
     def new_cfg(cls, plane, resources, command_groups):
         assert len(resources) and len(command_groups)
@@ -60,9 +104,13 @@ class WorkspaceCfgEditor(CfgReader):
         cfg_editor.reformat()
         return cfg_editor
 
+    NORMALIZED_MARKER_VERSION = 1
+
     def __init__(self, cfg, deleted=False):
         super().__init__(cfg)
         self.deleted = deleted
+        # digest of the normalized cfg file data which the cfg is loaded from
+        self.normalized_digest = None
 
     def iter_cfg_files_data(self):
         if self.deleted:
@@ -72,6 +120,29 @@ class WorkspaceCfgEditor(CfgReader):
             for resource_id, data in super().iter_cfg_files_data():
                 yield resource_id, data
 
+    def get_normalized_marker_data(self, resource_id, data):
+        """Return the marker data of cfg file if the cfg in data is normalized, which means reformat makes no change
+        to it, so the cfg is not reformatted again when it's loaded. Return None for reference files and the cfg not
+        normalized.
+        """
+        if self.deleted or resource_id != self.resources[0].id:
+            return None
+        digest = self._get_cfg_data_digest(data)
+        if digest != self.normalized_digest:
+            cfg = clone_model(self.cfg)
+            try:
+                cfg.reformat()
+            except Exception as err:
+                logger.debug(f"Cfg of {resource_id} is not normalized: {err}")
+                return None
+            if json.dumps(cfg.to_primitive(), ensure_ascii=False) != data:
+                return None
+        return json.dumps({
+            "version": self.NORMALIZED_MARKER_VERSION,
+            "models": get_models_signature(),
+            "sha256": digest,
+        })
+
     def rename_command_group(self, *cg_names, new_cg_names):
         if len(cg_names) < 1:
             raise exceptions.InvalidAPIUsage(f"Invalid command group name, it's empty")
@@ -191,7 +262,7 @@ class WorkspaceCfgEditor(CfgReader):
         _, plus_command = [*plus_cfg_editor.iter_commands_by_operations('get')][0]
         plus_op_required_args, plus_op_optional_args = plus_cfg_editor._parse_command_http_op_url_args(plus_command)
 
-        main_editor = WorkspaceCfgEditor(self.cfg.__class__(self.cfg.to_primitive()))  # generate a copy of main cfg
+        main_editor = WorkspaceCfgEditor(clone_model(self.cfg))  # generate a copy of main cfg
         main_commands = [command for _, command in main_editor.iter_commands_by_operations('get')]
         for main_command in main_commands:
             # merge args
@@ -214,7 +285,7 @@ class WorkspaceCfgEditor(CfgReader):
             main_op_required_args, _ = main_editor._parse_command_http_op_url_args(main_command)
             plus_operations = []
             for operation in plus_command.operations:
-                plus_operations.append(operation.__class__(operation.to_primitive()))
+                plus_operations.append(clone_model(operation))
             op_required_args = {**plus_op_required_args, **main_op_required_args}
             common_required_args, main_command.conditions, main_command.operations = main_editor._merge_command_operations(
                 op_required_args,
@@ -228,7 +299,7 @@ class WorkspaceCfgEditor(CfgReader):
 
             for resource in plus_command.resources:
                 main_command.resources.append(
-                    resource.__class__(resource.to_primitive())
+                    clone_model(resource)
                 )
 
             # relink main_command
@@ -236,7 +307,7 @@ class WorkspaceCfgEditor(CfgReader):
 
         for resource in plus_cfg_editor.resources:
             main_editor.cfg.resources.append(
-                resource.__class__(resource.to_primitive())
+                clone_model(resource)
             )
 
         main_editor.reformat()
@@ -254,6 +325,7 @@ class WorkspaceCfgEditor(CfgReader):
         self.reformat()
 
     def update_arg_by_var(self, *cmd_names, arg_var, **kwargs):
+        command = self.find_command(*cmd_names)
         arg, _ = self.find_arg_by_var(*cmd_names, arg_var=arg_var)
         if not arg:
             return None
@@ -266,6 +338,8 @@ class WorkspaceCfgEditor(CfgReader):
         if isinstance(arg, CMDArrayArg):
             self._update_array_arg(arg, **kwargs)
 
+        # the arg idx changes with the options
+        command.lookup_index = None
         self.reformat()
 
     def _update_cmd_arg(self, arg, **kwargs):
@@ -428,6 +502,7 @@ class WorkspaceCfgEditor(CfgReader):
             assert arg and parent
 
         parent.args.remove(arg)
+        command.lookup_index = None
 
         used_options = set()
         if isinstance(parent, CMDArgGroup):
@@ -493,6 +568,7 @@ class WorkspaceCfgEditor(CfgReader):
 
         args.append(new_arg)
         parent.args = args
+        command.lookup_index = None
 
         # regenerate args and its relation ship with schema
         command.generate_args()
@@ -568,18 +644,20 @@ class WorkspaceCfgEditor(CfgReader):
             return False
 
         main_200_response = None
-        for command in main_get_commands:
-            for http_op in command.operations:
-                if not isinstance(http_op, CMDHttpOperation):
-                    continue
-                assert http_op.http.request.method == 'get'
-                for response in http_op.http.responses:
-                    if response.is_error:
+        # the fingerprints of plus response are computed once for all the main responses
+        with fingerprint_scope():
+            for command in main_get_commands:
+                for http_op in command.operations:
+                    if not isinstance(http_op, CMDHttpOperation):
                         continue
-                    if 200 in response.status_codes:
-                        if plus_200_response.diff(response, CMDDiffLevelEnum.Structure):
-                            return False
-                        main_200_response = response
+                    assert http_op.http.request.method == 'get'
+                    for response in http_op.http.responses:
+                        if response.is_error:
+                            continue
+                        if 200 in response.status_codes:
+                            if plus_200_response.diff(response, CMDDiffLevelEnum.Structure):
+                                return False
+                            main_200_response = response
         if not main_200_response:
             return False
 
@@ -599,7 +677,7 @@ class WorkspaceCfgEditor(CfgReader):
     def _filter_args_in_arg_group(self, arg_group, arg_vars, copy=True):
         assert isinstance(arg_group, CMDArgGroup)
         if copy:
-            arg_group = arg_group.__class__(arg_group.to_primitive())
+            arg_group = clone_model(arg_group)
         args = []
         for arg in arg_group.args:
             if arg.var in arg_vars:
@@ -620,7 +698,7 @@ class WorkspaceCfgEditor(CfgReader):
     def _filter_args_in_array_arg(self, array_arg, arg_vars, copy=True):
         assert isinstance(array_arg, CMDArrayArgBase)
         if copy:
-            array_arg = array_arg.__class__(array_arg.to_primitive())
+            array_arg = clone_model(array_arg)
         item = self._filter_args_in_item(array_arg.item, arg_vars, copy=False)
         if item:
             array_arg.item = item
@@ -637,7 +715,7 @@ class WorkspaceCfgEditor(CfgReader):
     def _filter_args_in_object_arg(self, object_arg, arg_vars, copy=True):
         assert isinstance(object_arg, CMDObjectArgBase)
         if copy:
-            object_arg = object_arg.__class__(object_arg.to_primitive())
+            object_arg = clone_model(object_arg)
         contains = False
         if object_arg.args:
             args = []
@@ -1041,7 +1119,7 @@ class WorkspaceCfgEditor(CfgReader):
                         continue
                     if 'name' in a.options and isinstance(a, CMDStringArgBase):
                         # remove auto add 'name', 'n' options
-                        a = a.__class__(raw_data=a.to_native())
+                        a = clone_model(a)
                         a.options = sorted(a.options, key=lambda o: (len(o), o))[-1:]  # use the longest argument
                     ref_args.append(a)
 
@@ -1235,7 +1313,7 @@ class WorkspaceCfgEditor(CfgReader):
         _sub_command = CMDCommand()
         _sub_command.version = update_cmd.version
         assert len(update_cmd.resources) == 1
-        _resource = CMDResource(raw_data=update_cmd.resources[0].to_native())
+        _resource = clone_model(update_cmd.resources[0])
         _resource.subresource = cls.idx_to_str(subresource_idx)
         _sub_command.resources = [_resource]
         _sub_command.subresource_selector = cls._build_subresource_selector(
@@ -1246,7 +1324,7 @@ class WorkspaceCfgEditor(CfgReader):
     def _build_subresource_list_or_show_command(cls, update_cmd, subresource_idx, ref_args, ref_options):
         _sub_command, get_op, _, update_json = cls._build_sub_command_base(update_cmd, subresource_idx)
 
-        _sub_command.operations = [get_op.__class__(raw_data=get_op.to_native())]
+        _sub_command.operations = [clone_model(get_op)]
         _sub_command.generate_args(ref_args=ref_args, ref_options=ref_options)
         _sub_command.generate_outputs(ref_outputs=update_cmd.outputs)
         _sub_command.link()
@@ -1280,9 +1358,9 @@ class WorkspaceCfgEditor(CfgReader):
         _instance_op.instance_create.json.schema = _instance_op_schema
 
         _sub_command.operations = [
-            get_op.__class__(raw_data=get_op.to_native()),
+            clone_model(get_op),
             _instance_op,
-            put_op.__class__(raw_data=put_op.to_native()),
+            clone_model(put_op),
         ]
         _sub_command.generate_args(ref_args=ref_args, ref_options=ref_options)
         _sub_command.generate_outputs(ref_outputs=update_cmd.outputs)
@@ -1316,9 +1394,9 @@ class WorkspaceCfgEditor(CfgReader):
         _instance_op.instance_update.json.schema = _instance_op_schema
 
         _sub_command.operations = [
-            get_op.__class__(raw_data=get_op.to_native()),
+            clone_model(get_op),
             _instance_op,
-            put_op.__class__(raw_data=put_op.to_native()),
+            clone_model(put_op),
         ]
         _sub_command.generate_args(ref_args=ref_args, ref_options=ref_options)
         _sub_command.generate_outputs(ref_outputs=update_cmd.outputs)
@@ -1334,9 +1412,9 @@ class WorkspaceCfgEditor(CfgReader):
         _instance_op.instance_delete.ref = _sub_command.subresource_selector.var
         _instance_op.instance_delete.json = CMDRequestJson()
         _sub_command.operations = [
-            get_op.__class__(raw_data=get_op.to_native()),
+            clone_model(get_op),
             _instance_op,
-            put_op.__class__(raw_data=put_op.to_native()),
+            clone_model(put_op),
         ]
         _sub_command.confirmation = DEFAULT_CONFIRMATION_PROMPT
         _sub_command.generate_args(ref_args=ref_args, ref_options=ref_options)
@@ -1451,7 +1529,7 @@ class WorkspaceCfgEditor(CfgReader):
             assert isinstance(item, CMDObjectSchemaBase)
             for prop in item.props:
                 if prop.name in identifier_names:
-                    identifier = prop.__class__(raw_data=prop.to_native())
+                    identifier = clone_model(prop)
                     identifier.name = '[].' + prop.name
                     identifier.required = True
                     identifier.read_only = False
@@ -1558,7 +1636,7 @@ class WorkspaceCfgEditor(CfgReader):
             assert schema.implement is not None
             schema = schema.get_unwrapped()
         else:
-            schema = schema.__class__(raw_data=schema.to_native())
+            schema = clone_model(schema)
         assert not isinstance(schema, CMDClsSchemaBase)
 
         # make sure cls implement contained in schema
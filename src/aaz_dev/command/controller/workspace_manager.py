@@ -11,8 +11,9 @@ from swagger.utils.exceptions import InvalidSwaggerValueError
 from utils import exceptions
 from utils.config import Config
 from .specs_manager import AAZSpecsManager
+from .workspace_args_index import WorkspaceArgsIndex
 from .workspace_cfg_editor import WorkspaceCfgEditor
-from command.model.configuration import CMDHelp, CMDResource, CMDCommandExample, CMDArg, CMDCommand
+from command.model.configuration import CMDHelp, CMDCommandExample, CMDArg, clone_model
 
 logger = logging.getLogger('backend')
 
@@ -71,6 +72,7 @@ class WorkspaceManager:
         self.ws = None
         self._cfg_editors = {}
         self._reusable_leaves = {}
+        self._args_index = None
 
         self.aaz_specs = aaz_manager or AAZSpecsManager()
         self.swagger_specs = swagger_manager or SwaggerSpecsManager()
@@ -90,6 +92,7 @@ class WorkspaceManager:
             self.ws = CMDEditorWorkspace(raw_data=data)
 
         self._cfg_editors = {}
+        self._args_index = None
 
     def rename(self, new_name):
         assert not self.is_in_memory
@@ -120,8 +123,11 @@ class WorkspaceManager:
             os.makedirs(self.folder)
 
         remove_folders = []
+        remove_files = []
         update_files = []
         used_resources = set()
+        updated_cfg_editors = []
+        normalized_cfg_editors = []
         for resource_id, cfg_editor in self._cfg_editors.items():
             if resource_id in used_resources:
                 continue
@@ -131,9 +137,24 @@ class WorkspaceManager:
                     remove_folders.append(WorkspaceCfgEditor.get_cfg_folder(self.folder, r_id))
                 else:
                     update_files.append((WorkspaceCfgEditor.get_cfg_path(self.folder, r_id), data))
+                    marker_path = WorkspaceCfgEditor.get_cfg_marker_path(self.folder, r_id)
+                    marker_data = cfg_editor.get_normalized_marker_data(r_id, data)
+                    if marker_data is None:
+                        remove_files.append(marker_path)
+                    else:
+                        update_files.append((marker_path, marker_data))
+                        normalized_cfg_editors.append(cfg_editor)
                 used_resources.add(r_id)
+            updated_cfg_editors.append(cfg_editor)
         assert set(self._cfg_editors.keys()) == used_resources
 
+        args_index = self._load_args_index()
+        for cfg_editor in updated_cfg_editors:
+            args_index.remove_cfg(cfg_editor)
+        for cfg_editor in normalized_cfg_editors:
+            # the cfg of editor is the same as the one loaded from file, others are indexed when they're loaded.
+            args_index.update_cfg(cfg_editor)
+
         # verify ws timestamps
         # TODO: add write lock for path file
         if os.path.exists(self.path):
@@ -151,11 +172,16 @@ class WorkspaceManager:
         for folder in remove_folders:
             shutil.rmtree(folder)
 
+        for file_name in remove_files:
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
         for file_name, data in update_files:
             os.makedirs(os.path.dirname(file_name), exist_ok=True)
             with open(file_name, 'w') as f:
                 f.write(data)
 
+        self._save_args_index()
         self._cfg_editors = {}
 
     def find_command_tree_node(self, *node_names):
@@ -277,7 +303,7 @@ class WorkspaceManager:
                 if ref_v and ref_v.examples:
                     new_cmd.examples = []
                     for example in ref_v.examples:
-                        new_cmd.examples.append(CMDCommandExample(example.to_primitive()))
+                        new_cmd.examples.append(clone_model(example))
             else:
                 new_cmd = CMDCommandTreeLeaf({
                     "names": [*cmd_names],
@@ -287,7 +313,7 @@ class WorkspaceManager:
                     },
                 })
             new_cmd.version = command.version
-            new_cmd.resources = [CMDResource(r.to_primitive()) for r in command.resources]
+            new_cmd.resources = [clone_model(r) for r in command.resources]
             node.commands[name] = new_cmd
 
     def remove_cfg(self, cfg_editor):
@@ -321,6 +347,42 @@ class WorkspaceManager:
     def load_cfg_editor_by_command(self, cmd, reload=False):
         return self.load_cfg_editor_by_resource(cmd.resources[0].id, cmd.resources[0].version, reload=reload)
 
+    def _load_args_index(self):
+        if self._args_index is None:
+            args_index = None
+            if not self.is_in_memory:
+                args_index = WorkspaceArgsIndex.load(self.folder, self.ws.version)
+            self._args_index = args_index or WorkspaceArgsIndex()
+        return self._args_index
+
+    def _save_args_index(self):
+        # the index is saved with the workspace version, so it's dropped when the workspace is saved by others.
+        with open(WorkspaceArgsIndex.get_path(self.folder), 'w') as f:
+            f.write(self._load_args_index().dumps(self.ws.version))
+
+    def _iter_command_args_index(self):
+        """Iterate the command tree leaves with the index of arguments in command."""
+        args_index = self._load_args_index()
+        # the cfg editors loaded may be modified but not saved
+        loaded_resources = set(self._cfg_editors.keys())
+        updated = False
+        for leaf in self.iter_command_tree_leaves():
+            resource = leaf.resources[0]
+            if resource.id in loaded_resources:
+                cfg_editor = self.load_cfg_editor_by_command(leaf)
+                command = cfg_editor.find_command(*leaf.names) if cfg_editor else None
+                command_index = WorkspaceArgsIndex.build_command_index(command) if command else None
+            else:
+                command_index = args_index.find_command(resource.id, resource.version, *leaf.names)
+                if command_index is None and (cfg_editor := self.load_cfg_editor_by_command(leaf)):
+                    args_index.update_cfg(cfg_editor)
+                    updated = True
+                    command_index = args_index.find_command(resource.id, resource.version, *leaf.names)
+            if command_index is not None:
+                yield leaf, command_index
+        if updated and not self.is_in_memory:
+            self._save_args_index()
+
     def update_command_tree_node_help(self, *node_names, help):
         node = self.find_command_tree_node(*node_names)
         if not node:
@@ -494,7 +556,8 @@ class WorkspaceManager:
             aaz_version = options.get('aaz_version', None)
             if aaz_version:
                 try:
-                    aaz_cfg_reader = self.aaz_specs.load_resource_cfg_reader(self.ws.plane, resource.id, aaz_version)
+                    aaz_cfg_reader = self.aaz_specs.load_resource_cfg_reader(
+                        self.ws.plane, resource.id, aaz_version)
                 except ValueError as err:
                     raise exceptions.InvalidAPIUsage(message=str(err)) from err
                 cfg_editor.inherit_modification(aaz_cfg_reader)
@@ -784,7 +847,7 @@ class WorkspaceManager:
         cfg_editor.rename_command(*old_names, new_cmd_names=new_cmd_names)
         return leaf
 
-    def generate_to_aaz(self):
+    def generate_to_aaz(self, save=True):
         # Merge the commands of subresources which exported in aaz but not exist in current workspace
         self._merge_sub_resources_in_aaz()
 
@@ -802,7 +865,8 @@ class WorkspaceManager:
                 # ignore root node
                 continue
             self.aaz_specs.update_command_group_by_ws(ws_node)
-        self.aaz_specs.save()
+        if save:
+            self.aaz_specs.save()
 
     def _merge_sub_resources_in_aaz(self):
         """Merge the commands of subresources which exported in aaz but not exist in current workspace"""
@@ -824,8 +888,9 @@ class WorkspaceManager:
 
             aaz_ref = {}
             for (r_id, r_version), r_sub_resources in existing_sub_resources.items():
+                # read only, the commands inserted are cloned
                 pre_cfg_reader = self.aaz_specs.load_resource_cfg_reader(
-                    editor.cfg.plane, resource_id=r_id, version=r_version
+                    editor.cfg.plane, resource_id=r_id, version=r_version, copy=False
                 )
                 if not pre_cfg_reader:
                     continue
@@ -852,7 +917,7 @@ class WorkspaceManager:
                         logger.error(
                             f"Command Group '{' '.join(cmd_names)}' in workspace conflict the name of Subresource Command in `aaz`")
                         continue
-                    command = CMDCommand(command.to_native())
+                    command = clone_model(command)
                     command.link()
                     editor._add_command(*cmd_names, command=command)
                     inserted_commands.add(cmd_names_str)
@@ -868,6 +933,7 @@ class WorkspaceManager:
     def find_similar_args(self, *cmd_names, arg):
         assert isinstance(arg, CMDArg)
         results = {}
+        similar_key = WorkspaceArgsIndex.get_similar_key(arg)
         if arg.var.startswith("@"):
             # specify idx_suffix
             cls_name = arg.var[1:].replace('[', '.[').replace('{', '.{').split('.')[0]
@@ -881,36 +947,35 @@ class WorkspaceManager:
             assert len(idx_suffix) > 0
 
             cls_name_prefix = cls_name.split('_')[0]  # remove the subfix such as `_create` `_update`
-            for leaf in self.iter_command_tree_leaves():
-                cfg_editor = self.load_cfg_editor_by_command(leaf)
-                for _, similar_cls_arg, similar_cls_arg_idx, _ in cfg_editor.iter_arg_cls_definition(
-                        *leaf.names, cls_name_prefix=cls_name_prefix):
+            for leaf, command_index in self._iter_command_args_index():
+                for _, similar_cls_arg_idx, sub_args_tree, ref_args_idx in WorkspaceArgsIndex.iter_arg_cls_definition(
+                        command_index, cls_name_prefix=cls_name_prefix):
                     # search cls definition in command
                     # find sub arg by idx_suffix
-                    similar_arg = cfg_editor.find_sub_arg(similar_cls_arg, idx=idx_suffix)
-                    if similar_arg is None or not cfg_editor.is_similar_args(arg, similar_arg):
+                    similar_arg_var, similar_arg_key = WorkspaceArgsIndex.find_sub_arg(sub_args_tree, idx=idx_suffix)
+                    if similar_arg_var is None or similar_arg_key != similar_key:
                         continue
                     similar_arg_idx = similar_cls_arg_idx + idx_suffix
 
                     key = tuple(leaf.names)
                     assert key not in results
                     results[key] = {
-                        similar_arg.var: [similar_arg_idx]
+                        similar_arg_var: [similar_arg_idx]
                     }
 
                     # search cls reference in command
-                    for _, _, ref_arg_idx, _ in cfg_editor.iter_arg_cls_reference(*leaf.names, cls_name=similar_cls_arg.cls):
-                        results[key][similar_arg.var].append(ref_arg_idx + idx_suffix)
+                    for ref_arg_idx in ref_args_idx:
+                        results[key][similar_arg_var].append(ref_arg_idx + idx_suffix)
 
         else:
-            for leaf in self.iter_command_tree_leaves():
-                cfg_editor = self.load_cfg_editor_by_command(leaf)
-                similar_arg, similar_arg_idx = cfg_editor.find_arg_by_var(*leaf.names, arg_var=arg.var)
-                if similar_arg is None or not cfg_editor.is_similar_args(arg, similar_arg):
+            for leaf, command_index in self._iter_command_args_index():
+                similar_arg_var, similar_arg_idx, similar_arg_key = WorkspaceArgsIndex.find_arg_by_var(
+                    command_index, arg_var=arg.var)
+                if similar_arg_var is None or similar_arg_key != similar_key:
                     continue
                 key = tuple(leaf.names)
                 assert key not in results
                 results[key] = {
-                    similar_arg.var: [similar_arg_idx]
+                    similar_arg_var: [similar_arg_idx]
                 }
         return results
@@ -25,6 +25,8 @@ from ._arg import CMDArgEnumItem, CMDArgEnum, \
     CMDArgPromptInput, CMDPasswordArgPromptInput
 from ._arg_builder import CMDArgBuilder
 from ._arg_group import CMDArgGroup
+from ._binary import BinarySerializer, get_models_signature
+from ._clone import clone_model
 from ._command import CMDCommand
 from ._command_group import CMDCommandGroup
 from ._condition import CMDConditionOperator, \
@@ -36,6 +38,7 @@ from ._example import CMDCommandExample
 from ._fields import CMDBooleanField, CMDStageField, CMDVariantField, CMDClassField, \
     CMDPrimitiveField, CMDRegularExpressionField, CMDVersionField, CMDResourceIdField, CMDCommandNameField, \
     CMDCommandGroupNameField, CMDURLPathField, CMDConfirmation
+from ._fingerprint import fingerprint_scope, structure_fingerprint
 from ._format import CMDStringFormat, CMDIntegerFormat, CMDFloatFormat, CMDObjectFormat, CMDArrayFormat, \
     CMDResourceIdFormat
 from ._help import CMDHelp, CMDArgumentHelp
@@ -2,7 +2,8 @@ from schematics.models import Model
 from schematics.types import StringType, ListType, ModelType, PolyModelType
 from schematics.types.serializable import serializable
 
-from ._fields import CMDStageField, CMDVariantField, CMDPrimitiveField, CMDBooleanField, CMDClassField
+from ._fields import CMDStageField, CMDVariantField, CMDPrimitiveField, CMDBooleanField, CMDClassField, \
+    CMDTypePolyModelType
 from ._format import CMDStringFormat, CMDIntegerFormat, CMDFloatFormat, CMDObjectFormat, CMDArrayFormat, \
     CMDResourceIdFormat
 from ._help import CMDArgumentHelp
@@ -155,7 +156,7 @@ class CMDArgBase(Model):
         self._reformat_base(**kwargs)
 
 
-class CMDArgBaseField(PolyModelType):
+class CMDArgBaseField(CMDTypePolyModelType):
 
     def __init__(self, **kwargs):
         super(CMDArgBaseField, self).__init__(
@@ -165,7 +166,7 @@ class CMDArgBaseField(PolyModelType):
             **kwargs
         )
 
-    def find_model(self, data):
+    def _claim_model(self, data):
         if self.claim_function:
             kls = self.claim_function(self, data)
             if not kls:
@@ -251,6 +252,17 @@ class CMDArg(CMDArgBase):
         self._reformat(**kwargs)
 
 
+class CMDArgField(CMDTypePolyModelType):
+    CLAIM_KEYS = ('var',)
+
+    def __init__(self, **kwargs):
+        super(CMDArgField, self).__init__(
+            model_spec=CMDArg,
+            allow_subclasses=True,
+            **kwargs
+        )
+
+
 #cls
 class CMDClsArgBase(CMDArgBase):
     _type = StringType(
@@ -690,7 +702,7 @@ class CMDObjectArgBase(CMDArgBase):
         serialized_name='format',
         deserialize_from='format',
     )
-    args = ListType(PolyModelType(CMDArg, allow_subclasses=True))
+    args = ListType(CMDArgField())
     additional_props = ModelType(
         CMDObjectArgAdditionalProperties,
         serialized_name="additionalProps",
@@ -1,7 +1,7 @@
 from schematics.models import Model
-from schematics.types import StringType, PolyModelType, ListType
+from schematics.types import StringType, ListType
 
-from ._arg import CMDArg, CMDClsArgBase, CMDObjectArgBase, CMDArrayArgBase
+from ._arg import CMDArg, CMDArgField, CMDClsArgBase, CMDObjectArgBase, CMDArrayArgBase
 from utils import exceptions
 
 
@@ -10,7 +10,7 @@ class CMDArgGroup(Model):
     name = StringType(required=True)
 
     # properties as nodes
-    args = ListType(PolyModelType(CMDArg, allow_subclasses=True), min_size=1)
+    args = ListType(CMDArgField(), min_size=1)
 
     def reformat(self, **kwargs):
         for arg in self.args:
@@ -0,0 +1,77 @@
+import glob
+import hashlib
+import io
+import os
+import pickle
+
+import schematics
+from schematics.models import Model, ModelDict
+
+_models_signature = None
+_signature = None
+
+
+def get_models_signature():
+    """Hash of the sources of configuration models, which changes when the models or their reformat are changed."""
+    global _models_signature
+    if _models_signature is None:
+        sha = hashlib.sha256()
+        sha.update(f"schematics:{schematics.__version__}".encode('utf-8'))
+        for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+            with open(path, 'rb') as f:
+                sha.update(hashlib.sha256(f.read()).digest())
+        _models_signature = sha.hexdigest()
+    return _models_signature
+
+
+def _get_signature():
+    """Hash of the format version and the sources of configuration models, which the binary data depends on."""
+    global _signature
+    if _signature is None:
+        _signature = hashlib.sha256(
+            f"{BinarySerializer.FORMAT_VERSION}:{get_models_signature()}".encode('utf-8')).hexdigest().encode('ascii')
+    return _signature
+
+
+def _restore_model(model_cls, unsafe, converted, valid, attrs):
+    value = model_cls.__new__(model_cls)
+    value.__dict__.update(attrs)
+    value.__dict__['_data'] = ModelDict(unsafe=unsafe, converted=converted, valid=valid)
+    return value
+
+
+class _ModelPickler(pickle.Pickler):
+
+    def reducer_override(self, obj):
+        if isinstance(obj, Model):
+            data = obj._data
+            attrs = {key: value for key, value in obj.__dict__.items() if key != '_data'}
+            return _restore_model, (obj.__class__, data.unsafe, data.converted, dict(data.valid), attrs)
+        return NotImplemented
+
+
+class BinarySerializer:
+    """Serialize the models into compact binary data, which is loaded without converting the primitive data again.
+
+    The binary data is only valid for the same version of model sources, so it's used for local caches rather than
+    the files shared with others.
+    """
+
+    FORMAT_VERSION = 1
+
+    @classmethod
+    def to_bytes(cls, value):
+        f = io.BytesIO()
+        f.write(_get_signature() + b'\n')
+        _ModelPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(value)
+        return f.getvalue()
+
+    @classmethod
+    def from_bytes(cls, model, data):
+        signature, _, data = data.partition(b'\n')
+        if signature != _get_signature():
+            raise ValueError("Binary data is serialized by another version of models")
+        value = pickle.loads(data)
+        if not isinstance(value, model):
+            raise ValueError(f"Binary data is not a {model.__name__}: {value.__class__.__name__}")
+        return value
@@ -0,0 +1,65 @@
+from schematics.models import Model, ModelDict
+from schematics.types import ListType
+
+from ._schema import CMDSchemaBaseField, CMDSchemaField, CMDObjectSchemaDiscriminatorField, \
+    CMDObjectSchemaAdditionalPropertiesField
+
+# the fields which ignore frozen schemas in export
+_FROZEN_IGNORED_FIELDS = (
+    CMDSchemaBaseField, CMDSchemaField, CMDObjectSchemaDiscriminatorField, CMDObjectSchemaAdditionalPropertiesField
+)
+
+_frozen_ignored_names = {}
+
+
+def clone_model(value):
+    """Deep copy the configuration models in value without exporting, converting and validating the data again.
+
+    The copy is the same as `model.__class__(model.to_primitive())`: the frozen schemas are dropped as they are in
+    export, and the attributes out of fields, such as the links built by `link`, are reset.
+    """
+    if isinstance(value, Model):
+        return _clone_model(value)
+    return _clone_value(value)
+
+
+def _clone_model(model):
+    model_cls = model.__class__
+    copied = model_cls(lazy=True)
+    frozen_ignored = _get_frozen_ignored_names(model_cls)
+    data = {}
+    for values in reversed(model._data.maps):
+        data.update(values)
+    for name, value in data.items():
+        if value is None:
+            continue
+        if name in frozen_ignored:
+            if isinstance(value, list):
+                value = [v for v in value if not (v is not None and v.frozen)] or None
+            elif value.frozen:
+                value = None
+        data[name] = _clone_value(value)
+    copied._data = ModelDict(converted=data)
+    return copied
+
+
+def _clone_value(value):
+    if isinstance(value, Model):
+        return _clone_model(value)
+    if isinstance(value, list):
+        return [_clone_value(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _clone_value(v) for k, v in value.items()}
+    return value
+
+
+def _get_frozen_ignored_names(model_cls):
+    if model_cls not in _frozen_ignored_names:
+        names = set()
+        for name, field in model_cls._schema.fields.items():
+            if isinstance(field, ListType):
+                field = field.field
+            if isinstance(field, _FROZEN_IGNORED_FIELDS):
+                names.add(name)
+        _frozen_ignored_names[model_cls] = names
+    return _frozen_ignored_names[model_cls]
@@ -53,6 +53,8 @@ class CMDCommand(Model):
         super().__init__(*args, **kwargs)
         self.arg_cls_register_map = None
         self.schema_cls_register_map = None
+        # index of args and schemas built by CfgReader, it's dropped when they are regenerated, reformatted or relinked.
+        self.lookup_index = None
 
     def generate_args(self, ref_args=None, ref_options=None):
         if not ref_args:
@@ -83,6 +85,7 @@ class CMDCommand(Model):
 
         arguments = self._handle_duplicated_options(arguments)
         self.arg_groups = self._build_arg_groups(arguments)
+        self.lookup_index = None
 
     def generate_outputs(self, ref_outputs=None, pageable=None):
         if not ref_outputs:
@@ -148,6 +151,7 @@ class CMDCommand(Model):
         return output
 
     def reformat(self, **kwargs):
+        self.lookup_index = None
         self.resources = sorted(self.resources, key=lambda r: r.id)
         try:
             self._reformat_arg_groups(**kwargs)
@@ -208,6 +212,7 @@ class CMDCommand(Model):
                 )
 
     def link(self):
+        self.lookup_index = None
         self.arg_cls_register_map = {}
         self.schema_cls_register_map = {}
 
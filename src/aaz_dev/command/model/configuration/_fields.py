@@ -1,4 +1,4 @@
-from schematics.types import StringType, BaseType, BooleanType
+from schematics.types import StringType, BaseType, BooleanType, PolyModelType
 from utils.stage import AAZStageEnum, AAZStageField
 import json
 import logging
@@ -150,3 +150,45 @@ class CMDDescriptionField(StringType):
     def to_primitive(self, value, context=None):
         """the description will not exist when call to primitive"""
         return None  # return None when value is false to hide field with `serialize_when_none=False`
+
+
+class CMDTypePolyModelType(PolyModelType):
+    """Polymorphic model field whose model is decided by the `type` value of data, such as "string" or "@Cls".
+
+    The model claimed for a type value is found by `_claim_polymorphic` of candidates at the first time, then it's
+    looked up from the table of the field, instead of probing every candidate model for each data.
+    """
+
+    # the keys of data, besides `type`, whose presence is checked by `_claim_polymorphic` of candidates
+    CLAIM_KEYS = ()
+
+    def __init__(self, model_spec, **kwargs):
+        super(CMDTypePolyModelType, self).__init__(model_spec, **kwargs)
+        self._type_models = {}
+
+    def find_model(self, data):
+        key = self._type_key(data)
+        if key is None:
+            return self._claim_model(data)
+        kls = self._type_models.get(key, None)
+        if kls is None:
+            kls = self._type_models[key] = self._claim_model(data)
+        return kls
+
+    def _claim_model(self, data):
+        return super(CMDTypePolyModelType, self).find_model(data)
+
+    def _type_key(self, data):
+        if self.claim_function or not isinstance(data, dict):
+            return None
+        type_value = data.get('type', None)
+        if not isinstance(type_value, str):
+            return None
+        if type_value.startswith("@"):
+            typ = "@"
+        else:
+            typ = type_value.replace("<", " ").replace(">", " ").strip().split()
+            if not typ:
+                return None
+            typ = typ[0]
+        return (typ, *(key in data for key in self.CLAIM_KEYS))
@@ -0,0 +1,100 @@
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from schematics.models import Model
+from schematics.types.serializable import Serializable
+
+from ._fields import CMDDescriptionField, CMDVariantField, CMDClassField
+from ._utils import CMDDiffLevelEnum
+
+_local = threading.local()
+
+
+@contextmanager
+def fingerprint_scope():
+    """Cache the fingerprints computed in the scope, so the sub models are hashed only once.
+
+    The models should not be modified in the scope, because the cached fingerprints are not invalidated.
+    """
+    if getattr(_local, 'cache', None) is not None:
+        yield
+        return
+    _local.cache = {}
+    try:
+        yield
+    finally:
+        _local.cache = None
+
+
+def structure_fingerprint(model, level):
+    """Merkle-style fingerprint of the model, which is built from the fingerprints of its sub models.
+
+    The models with the same fingerprint have no diff in the level. The properties which are not compared in the level
+    are ignored, such as description, so the models with different fingerprints may still have no diff.
+    """
+    cache = getattr(_local, 'cache', None)
+    if cache is None:
+        cache = {}
+    return _fingerprint_model(model, level, cache)
+
+
+def _fingerprint_model(model, level, cache):
+    key = (id(model), level)
+    cached = cache.get(key)
+    if cached is not None and cached[0] is model:
+        return cached[1]
+
+    values = {}
+    for data in reversed(model._data.maps):
+        values.update(data)
+    parts = [model.__class__.__name__.encode('utf-8')]
+    for name, presence_only in _get_fingerprint_fields(model.__class__, level):
+        value = values.get(name, None)
+        if value is None:
+            continue
+        data = b'1' if presence_only else _fingerprint_value(value, level, cache)
+        parts.append(f"{name}:{len(data)}=".encode('utf-8'))
+        parts.append(data)
+    fingerprint = hashlib.blake2b(b"|".join(parts), digest_size=16).digest()
+    cache[key] = (model, fingerprint)
+    return fingerprint
+
+
+_fingerprint_fields = {}
+
+
+def _get_fingerprint_fields(model_cls, level):
+    """Return the (name, presence_only) of fields compared in the level."""
+    key = (model_cls, level)
+    if key not in _fingerprint_fields:
+        fields = []
+        for name, field in model_cls._schema.fields.items():
+            if isinstance(field, Serializable):
+                continue
+            presence_only = False
+            if isinstance(field, CMDDescriptionField):
+                if level < CMDDiffLevelEnum.All:
+                    continue
+            elif isinstance(field, CMDVariantField):
+                # only the existence of variant is compared in lower levels
+                presence_only = level < CMDDiffLevelEnum.Associate
+            elif isinstance(field, CMDClassField):
+                # only the existence of cls is compared in lower levels
+                presence_only = level < CMDDiffLevelEnum.All
+            fields.append((name, presence_only))
+        _fingerprint_fields[key] = fields
+    return _fingerprint_fields[key]
+
+
+def _fingerprint_value(value, level, cache):
+    if isinstance(value, Model):
+        return _fingerprint_model(value, level, cache)
+    if isinstance(value, list):
+        parts = []
+        for v in value:
+            data = _fingerprint_value(v, level, cache)
+            parts.append(f"{len(data)}=".encode('utf-8'))
+            parts.append(data)
+        return b"[" + hashlib.blake2b(b"|".join(parts), digest_size=16).digest() + b"]"
+    return repr(value).encode('utf-8')
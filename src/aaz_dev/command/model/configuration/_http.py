@@ -6,6 +6,7 @@ from schematics.models import Model
 from schematics.types import StringType, ModelType, ListType, PolyModelType, IntType
 
 from ._fields import CMDVariantField, CMDBooleanField, CMDURLPathField, CMDDescriptionField
+from ._fingerprint import fingerprint_scope, structure_fingerprint
 from ._http_request_body import CMDHttpRequestBody
 from ._http_response_body import CMDHttpResponseBody
 from ._schema import CMDSchemaField
@@ -247,6 +248,16 @@ class CMDHttpResponse(Model):
         serialize_when_none = False
 
     def diff(self, old, level):
+        with fingerprint_scope():
+            if self.structure_fingerprint(level) == old.structure_fingerprint(level):
+                return {}
+            return self._diff(old, level)
+
+    def structure_fingerprint(self, level):
+        """Fingerprint of the response structure, the responses with the same fingerprint have no diff in the level."""
+        return structure_fingerprint(self, level)
+
+    def _diff(self, old, level):
         diff = {}
         if level >= CMDDiffLevelEnum.BreakingChange:
             if (self.status_codes is not None) != (old.status_codes is not None):
@@ -27,7 +27,9 @@ from ._arg import CMDStringArg, CMDStringArgBase, \
     CMDArrayArg, CMDArrayArgBase, \
     CMDObjectArg, CMDObjectArgBase, CMDObjectArgAdditionalProperties, \
     CMDClsArg, CMDClsArgBase
-from ._fields import CMDVariantField, StringType, CMDClassField, CMDBooleanField, CMDPrimitiveField, CMDDescriptionField
+from ._fields import CMDVariantField, StringType, CMDClassField, CMDBooleanField, CMDPrimitiveField, CMDDescriptionField, \
+    CMDTypePolyModelType
+from ._fingerprint import fingerprint_scope, structure_fingerprint
 from ._format import CMDStringFormat, CMDIntegerFormat, CMDFloatFormat, CMDObjectFormat, CMDArrayFormat, \
     CMDResourceIdFormat
 from ._utils import CMDDiffLevelEnum
@@ -197,10 +199,17 @@ class CMDSchemaBase(Model):
             return f"Type: {type(old)} != {type(self)}"
         if self.frozen and old.frozen:
             return None
-        diff = {}
-        diff = self._diff_base(old, level, diff)
+        with fingerprint_scope():
+            if self.structure_fingerprint(level) == old.structure_fingerprint(level):
+                return {}
+            diff = {}
+            diff = self._diff_base(old, level, diff)
         return diff
 
+    def structure_fingerprint(self, level):
+        """Fingerprint of the schema structure, the schemas with the same fingerprint have no diff in the level."""
+        return structure_fingerprint(self, level)
+
     def _reformat_base(self, **kwargs):
         pass
 
@@ -210,7 +219,7 @@ class CMDSchemaBase(Model):
         self._reformat_base(**kwargs)
 
 
-class CMDSchemaBaseField(PolyModelType):
+class CMDSchemaBaseField(CMDTypePolyModelType):
 
     def __init__(self, **kwargs):
         super(CMDSchemaBaseField, self).__init__(
@@ -226,7 +235,7 @@ class CMDSchemaBaseField(PolyModelType):
             return None
         return super(CMDSchemaBaseField, self).export(value, format, context)
 
-    def find_model(self, data):
+    def _claim_model(self, data):
         if self.claim_function:
             kls = self.claim_function(self, data)
             if not kls:
@@ -312,9 +321,12 @@ class CMDSchema(CMDSchemaBase):
             return f"Type: {type(old)} != {type(self)}"
         if self.frozen and old.frozen:
             return None
-        diff = {}
-        diff = self._diff_base(old, level, diff)
-        diff = self._diff(old, level, diff)
+        with fingerprint_scope():
+            if self.structure_fingerprint(level) == old.structure_fingerprint(level):
+                return {}
+            diff = {}
+            diff = self._diff_base(old, level, diff)
+            diff = self._diff(old, level, diff)
         return diff
 
     def _reformat(self, **kwargs):
@@ -327,7 +339,8 @@ class CMDSchema(CMDSchemaBase):
         self._reformat(**kwargs)
 
 
-class CMDSchemaField(PolyModelType):
+class CMDSchemaField(CMDTypePolyModelType):
+    CLAIM_KEYS = ('name',)
 
     def __init__(self, **kwargs):
         super(CMDSchemaField, self).__init__(
@@ -1148,7 +1161,9 @@ def _diff_item(self_item, old_item, level):
             item_diff = f"Type: {type(old_item)} != {type(self_item)}"
         elif not (self_item.frozen and old_item.frozen):
             item_diff = {}
-            item_diff = self_item._diff_base(old_item, level, item_diff)
+            with fingerprint_scope():
+                if self_item.structure_fingerprint(level) != old_item.structure_fingerprint(level):
+                    item_diff = self_item._diff_base(old_item, level, item_diff)
 
     return item_diff
 
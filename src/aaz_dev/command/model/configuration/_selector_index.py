@@ -7,6 +7,7 @@ from schematics.models import Model
 from schematics.types import StringType, ListType, ModelType, PolyModelType
 from schematics.types.serializable import serializable
 
+from ._fields import CMDTypePolyModelType
 from ._schema import CMDSchemaField
 from ._arg_builder import CMDArgBuilder
 
@@ -46,7 +47,7 @@ class CMDSelectorIndexBase(Model):
         return False
 
 
-class CMDSelectorIndexBaseField(PolyModelType):
+class CMDSelectorIndexBaseField(CMDTypePolyModelType):
 
     def __init__(self, **kwargs):
         super(CMDSelectorIndexBaseField, self).__init__(
@@ -56,7 +57,7 @@ class CMDSelectorIndexBaseField(PolyModelType):
             **kwargs
         )
 
-    def find_model(self, data):
+    def _claim_model(self, data):
         if self.claim_function:
             kls = self.claim_function(self, data)
             if not kls:
@@ -101,7 +102,8 @@ class CMDSelectorIndex(CMDSelectorIndexBase):
         return False
 
 
-class CMDSelectorIndexField(PolyModelType):
+class CMDSelectorIndexField(CMDTypePolyModelType):
+    CLAIM_KEYS = ('name',)
 
     def __init__(self, **kwargs):
         super(CMDSelectorIndexField, self).__init__(
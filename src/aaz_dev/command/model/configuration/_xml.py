@@ -6,6 +6,7 @@ from lxml.etree import Element, tostring
 from xml.sax.saxutils import unescape
 from xmltodict import parse
 
+from schematics.models import ModelDict
 from schematics.types import ListType, ModelType
 from schematics.types.compound import PolyModelType
 from schematics.types.serializable import Serializable
@@ -18,6 +19,19 @@ class XMLSerializer:
 
     @classmethod
     def to_xml(cls, value):
+        primitive = value.to_primitive(context={"to_xml": True})
+        return write_xml(primitive)
+
+    @classmethod
+    def from_xml(cls, model, xml):
+        primitive = read_xml(xml)
+        if primitive is None:
+            # the xml is not in the layout written by `write_xml`, parse it by xmltodict
+            primitive = parse(cls._escape(xml), attr_prefix="")
+        return build_model(model, primitive[XML_ROOT])
+
+    @classmethod
+    def _to_xml_by_lxml(cls, value):
         primitive = value.to_primitive(context={"to_xml": True})
         root = build_xml(primitive)
         return unescape(
@@ -25,24 +39,180 @@ class XMLSerializer:
         )
 
     @classmethod
-    def from_xml(cls, model, xml):
+    def _from_xml_by_xmltodict(cls, model, xml):
         primitive = parse(cls._escape(xml), attr_prefix="")
         return build_model(model, primitive[XML_ROOT])
 
     @staticmethod
     def _escape(data):
-        ret = ""
-        lines = re.findall(r"<(.+)>", data)
-        for line in lines:
+        lines = []
+        for line in re.findall(r"<(.+)>", data):
             # handle long-summary
-            if line.startswith("line>"):
-                ret += "<" + line + ">" + "\n"
-                continue
-            line = line.replace("&", "&amp;")
-            line = line.replace(">", "&gt;")
-            line = line.replace("<", "&lt;")
-            ret += "<" + line + ">" + "\n"
-        return ret
+            if not line.startswith("line>"):
+                line = line.replace("&", "&amp;")
+                line = line.replace(">", "&gt;")
+                line = line.replace("<", "&lt;")
+            lines.append("<" + line + ">" + "\n")
+        return "".join(lines)
+
+
+XML_DECLARATION = "<?xml version='1.0' encoding='utf-8'?>\n"
+
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def write_xml(primitive):
+    """Write the primitive in a single pass.
+
+    The output is the same as `build_xml` pretty printed by lxml and unescaped, which is the layout of the cfg files.
+    """
+    chunks = [XML_DECLARATION]
+    _write_element(XML_ROOT, primitive, "", chunks)
+    return "".join(chunks)
+
+
+def _write_element(field_name, primitive, indent, chunks):
+    attrs = {}
+    children = []
+    for name, data in primitive.items():
+        _collect_xml_item(name, data, attrs, children)
+
+    elem_name = _get_element_name(field_name)
+    head = indent + "<" + elem_name
+    for name, value in attrs.items():
+        head += " " + name + "=\"" + _escape_xml_attr(value) + "\""
+    if not children:
+        chunks.append(head + "/>\n")
+        return
+
+    chunks.append(head + ">\n")
+    sub_indent = indent + "  "
+    for name, data in children:
+        if name is None:
+            # handle long-summary
+            chunks.append(sub_indent + "<line>" + data.replace("\r", "&#13;") + "</line>\n")
+        else:
+            _write_element(name, data, sub_indent, chunks)
+    chunks.append(indent + "</" + elem_name + ">\n")
+
+
+def _collect_xml_item(field_name, data, attrs, children):
+    if isinstance(data, dict):
+        children.append((field_name, data))
+    elif isinstance(data, list):
+        for d in data:
+            _collect_xml_item(field_name, d, attrs, children)
+    else:
+        value = str(data)
+        if _INVALID_XML_CHARS.search(value):
+            raise ValueError(
+                "All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+        if field_name == "line":
+            # handle long-summary
+            children.append((None, value))
+        # store metadata as attributes
+        elif prev := attrs.get(field_name):
+            attrs[field_name] = " ".join(sorted(f"{prev} {value}".split(), key=len, reverse=True))
+        else:
+            attrs[field_name] = value
+
+
+def _escape_xml_attr(value):
+    if '"' in value:
+        value = value.replace('"', "&quot;")
+    if "\n" in value:
+        value = value.replace("\n", "&#10;")
+    if "\r" in value:
+        value = value.replace("\r", "&#13;")
+    if "\t" in value:
+        value = value.replace("\t", "&#9;")
+    return value
+
+
+_element_names = {}
+
+
+def _get_element_name(field_name):
+    elem_name = _element_names.get(field_name)
+    if elem_name is None:
+        elem_name = _element_names[field_name] = _inflect_engine.singular_noun(field_name) or field_name
+    return elem_name
+
+
+_XML_DECLARATION_RE = re.compile(r"\?xml\s+version=(['\"])1\.0\1(\s+encoding=(['\"])utf-8\3)?\s*\?", re.IGNORECASE)
+_XML_START_TAG_RE = re.compile(r'([A-Za-z_][\w.\-]*)((?:\s+[A-Za-z_][\w.\-]*="[^"]*")*)\s*(/?)')
+_XML_ATTR_RE = re.compile(r'([A-Za-z_][\w.\-]*)="([^"]*)"')
+_XML_END_TAG_RE = re.compile(r'/([A-Za-z_][\w.\-]*)\s*')
+
+
+def read_xml(xml):
+    """Read the xml written by `write_xml` line by line.
+
+    The result is the same as `parse(XMLSerializer._escape(xml), attr_prefix="")`. None is returned when the xml
+    has anything out of the layout written by `write_xml`, such as comments or entities in text, then it should be
+    parsed by xmltodict.
+    """
+    if _INVALID_XML_CHARS.search(xml) or "\r" in xml:
+        return None
+    root = None
+    stack = []
+    for idx, line in enumerate(re.findall(r"<(.+)>", xml)):
+        if line.startswith("line>"):
+            # handle long-summary
+            if not stack or not line.endswith("</line"):
+                return None
+            text = line[5:-6]
+            if "<" in text or "&" in text or "]]>" in text:
+                return None
+            _push_xml_data(stack[-1], "line", text.strip() or None)
+            continue
+
+        if line.startswith("/"):
+            match = _XML_END_TAG_RE.fullmatch(line)
+            if match is None or not stack or stack[-1][0] != match[1]:
+                return None
+            tag, item = stack.pop()
+            if stack:
+                _push_xml_data(stack[-1], tag, item or None)
+            continue
+
+        if line.startswith("?"):
+            if idx != 0 or not _XML_DECLARATION_RE.fullmatch(line):
+                return None
+            continue
+
+        match = _XML_START_TAG_RE.fullmatch(line)
+        if match is None or (not stack and root is not None):
+            return None
+        tag, attrs, closed = match.groups()
+        item = {}
+        for name, value in _XML_ATTR_RE.findall(attrs):
+            if name in item:
+                return None
+            item[name] = value.replace("\t", " ")
+        if not stack:
+            root = (tag, item)
+        if closed:
+            if stack:
+                _push_xml_data(stack[-1], tag, item or None)
+        else:
+            stack.append((tag, item))
+    if stack or root is None:
+        return None
+    tag, item = root
+    return {tag: item or None}
+
+
+def _push_xml_data(parent, key, data):
+    item = parent[1]
+    if key in item:
+        value = item[key]
+        if isinstance(value, list):
+            value.append(data)
+        else:
+            item[key] = [value, data]
+    else:
+        item[key] = data
 
 
 def build_xml(primitive, parent=None):
@@ -79,23 +249,18 @@ def primitive_to_xml(field_name, data, parent):
 
 def build_model(model, primitive):
     if hasattr(model, "_field_list"):
-        instance = model()
-        for field_name, field in model._field_list:
-            if isinstance(field, Serializable):
-                continue
-            serialized_name = field.serialized_name or field_name
+        values = {}
+        for field_name, serialized_name, elem_name, field, curr_field in _get_model_fields(model):
             # obtain suitable element name
             if serialized_name in primitive:
                 curr_name = serialized_name
-            elif (elem_name := _inflect_engine.singular_noun(serialized_name)) in primitive:
+            elif elem_name in primitive:
                 curr_name = elem_name
             else:
                 continue
             data = primitive[curr_name]
-            curr_field = _unwrap(field)
-            field_value = obtain_field_value(field, curr_field, data)
-            setattr(instance, field_name, field_value)
-        return instance
+            values[field_name] = field.pre_setattr(obtain_field_value(field, curr_field, data))
+        return _new_model(model, values)
     else:
         # handle primitive field
         if model.primitive_type is not None:
@@ -107,6 +272,49 @@ def build_model(model, primitive):
         return cast(primitive)
 
 
+_model_fields = {}
+
+
+def _get_model_fields(model):
+    """Return the (field_name, serialized_name, elem_name, field, unwrapped field) of the fields loaded from xml."""
+    if model not in _model_fields:
+        fields = []
+        for field_name, field in model._field_list:
+            if isinstance(field, Serializable):
+                continue
+            serialized_name = field.serialized_name or field_name
+            elem_name = _inflect_engine.singular_noun(serialized_name) or None
+            fields.append((field_name, serialized_name, elem_name, field, _unwrap(field)))
+        _model_fields[model] = fields
+    return _model_fields[model]
+
+
+_IMMUTABLE_TYPES = (str, bool, int, float, type(None))
+
+_model_defaults = {}
+
+
+def _new_model(model, values):
+    """Create the model instance in the same way of `model()` and setting values to fields."""
+    if model not in _model_defaults:
+        defaults = dict(model()._data)
+        if not all(isinstance(v, _IMMUTABLE_TYPES) for v in defaults.values()):
+            # the defaults cannot be shared by instances
+            defaults = None
+        _model_defaults[model] = defaults
+
+    defaults = _model_defaults[model]
+    if defaults is None:
+        instance = model()
+        for field_name, value in values.items():
+            setattr(instance, field_name, value)
+        return instance
+
+    instance = model(lazy=True)
+    instance._data = ModelDict(converted={**defaults, **values})
+    return instance
+
+
 def obtain_field_value(prev, curr, data):
     if isinstance(prev, ListType):
         field_value = []
@@ -1,2 +1,3 @@
-from ._command_tree import CMDSpecsCommandTree, CMDSpecsCommandGroup, CMDSpecsCommand, CMDSpecsCommandVersion
+from ._command_tree import CMDSpecsCommandTree, CMDSpecsCommandGroup, CMDSpecsCommand, CMDSpecsCommandVersion, \
+    CMDSpecsLazyCommandTree
 from ._resource import CMDSpecsResource
@@ -1,3 +1,7 @@
+import json
+import re
+import threading
+
 from command.model.configuration import CMDStageField, CMDHelp, CMDCommandExample
 from command.model.configuration._fields import CMDCommandNameField, CMDVersionField
 from schematics.models import Model
@@ -49,3 +53,227 @@ class CMDSpecsCommandTree(Model):
 
     class Options:
         serialize_when_none = False
+
+
+class CMDSpecsLazyCommandGroups(dict):
+    """The top level command groups of a command tree, which are converted from their raw data on first access.
+
+    The raw data of a command group is either the json text sliced from tree.json or the decoded json data. The
+    command groups never accessed are kept in raw data, so they can be exported without converting.
+    """
+
+    _load_lock = threading.Lock()
+
+    def __init__(self, raws):
+        super().__init__((name, None) for name in raws)
+        self._raws = dict(raws)
+
+    def is_loaded(self, name):
+        return name not in self._raws
+
+    def get_raw(self, name):
+        return self._raws.get(name, None)
+
+    def get_summary(self, name):
+        """Return a command group with names and help only, without converting its sub command groups and commands."""
+        raw = self._raws.get(name, None)
+        if raw is None:
+            return super().__getitem__(name)
+        if isinstance(raw, str):
+            raw = json.loads(raw)
+        return CMDSpecsCommandGroup({
+            "names": raw["names"],
+            "help": raw.get("help", None),
+        })
+
+    def _load(self, name):
+        if name not in self._raws:
+            return
+        # the tree can be shared by the reading threads, so the raw data is dropped only after it's converted
+        with self._load_lock:
+            raw = self._raws.get(name, None)
+            if raw is not None:
+                if isinstance(raw, str):
+                    raw = json.loads(raw)
+                super().__setitem__(name, CMDSpecsCommandGroup(raw))
+                del self._raws[name]
+
+    def _load_all(self):
+        for name in [*self._raws]:
+            self._load(name)
+
+    def __getitem__(self, name):
+        self._load(name)
+        return super().__getitem__(name)
+
+    def __setitem__(self, name, value):
+        self._raws.pop(name, None)
+        super().__setitem__(name, value)
+
+    def __delitem__(self, name):
+        self._raws.pop(name, None)
+        super().__delitem__(name)
+
+    def __iter__(self):
+        # overridden to make sure `dict(self)` and `{**self}` go through `__getitem__`
+        return super().__iter__()
+
+    def __eq__(self, other):
+        self._load_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def get(self, name, default=None):
+        if name in self:
+            return self[name]
+        return default
+
+    def pop(self, name, *args):
+        self._load(name)
+        return super().pop(name, *args)
+
+    def popitem(self):
+        self._load_all()
+        return super().popitem()
+
+    def setdefault(self, name, default=None):
+        if name in self:
+            return self[name]
+        self[name] = default
+        return default
+
+    def values(self):
+        self._load_all()
+        return super().values()
+
+    def items(self):
+        self._load_all()
+        return super().items()
+
+    def copy(self):
+        return dict(self.items())
+
+
+class CMDSpecsLazyCommandTree:
+    """Command tree loaded from tree.json, whose top level command groups are converted on first access.
+
+    The tree.json is dumped by `json.dumps(tree.to_primitive(), indent=2, sort_keys=True)`, so the text of every top
+    level command group is sliced out by its indentation without decoding the whole file. When the tree is dumped back,
+    the text of the command groups never accessed is reused as it is.
+    """
+
+    _INDENT = ' ' * 6
+    _GROUPS_HEAD = '{\n  "root": {\n    "commandGroups": {\n'
+    _GROUP_HEAD = re.compile(r' {6}("[^"\\]*"): \{\n')
+    _GROUPS_PLACEHOLDER = '"commandGroups": {}'
+
+    def __init__(self, root):
+        self.root = root
+
+    @classmethod
+    def from_json(cls, data):
+        if data.startswith(cls._GROUPS_HEAD):
+            scanned = cls._scan_command_groups(data)
+            if scanned is not None:
+                raws, idx = scanned
+                root_data = json.loads(cls._GROUPS_HEAD[:-1] + '}' + data[idx:])['root']
+                root_data.pop('commandGroups')
+                return cls._build(root_data, raws)
+        # fallback to decode the whole tree for the text not dumped in standard format
+        root_data = json.loads(data)['root']
+        return cls._build(root_data, root_data.pop('commandGroups', None))
+
+    @classmethod
+    def _build(cls, root_data, raws):
+        root = CMDSpecsCommandGroup(root_data)
+        if raws is not None:
+            root.command_groups = CMDSpecsLazyCommandGroups(raws)
+        return cls(root)
+
+    @classmethod
+    def _scan_command_groups(cls, data):
+        raws = {}
+        idx = len(cls._GROUPS_HEAD)
+        group_tail = '\n' + cls._INDENT + '}'
+        while True:
+            match = cls._GROUP_HEAD.match(data, idx)
+            if match is None:
+                return None
+            end = data.find(group_tail, match.end())
+            if end < 0:
+                return None
+            end += len(group_tail)
+            raws[json.loads(match[1])] = data[match.end() - 2:end]
+            if data.startswith(',\n', end):
+                idx = end + 2
+            elif data.startswith('\n    }', end):
+                return raws, end + 6
+            else:
+                return None
+
+    def iter_loaded_command_groups(self):
+        """Iterate the top level command groups which are converted."""
+        command_groups = self.root.command_groups or {}
+        for name in command_groups:
+            if not isinstance(command_groups, CMDSpecsLazyCommandGroups) or command_groups.is_loaded(name):
+                yield command_groups[name]
+
+    def iter_raw_command_groups(self):
+        """Iterate the decoded raw data of the top level command groups which are not converted."""
+        command_groups = self.root.command_groups or {}
+        if not isinstance(command_groups, CMDSpecsLazyCommandGroups):
+            return
+        for name in command_groups:
+            raw = command_groups.get_raw(name)
+            if raw is not None:
+                yield json.loads(raw) if isinstance(raw, str) else raw
+
+    def summary(self):
+        """Return a command tree with the names and help of top level command groups only."""
+        tree = CMDSpecsCommandTree()
+        tree.root = CMDSpecsCommandGroup({
+            "names": self.root.names,
+            "help": self.root.help.to_primitive() if self.root.help else None,
+        })
+        command_groups = self.root.command_groups
+        if command_groups is not None:
+            if isinstance(command_groups, CMDSpecsLazyCommandGroups):
+                tree.root.command_groups = {name: command_groups.get_summary(name) for name in command_groups}
+            else:
+                tree.root.command_groups = command_groups
+        return tree
+
+    def to_primitive(self):
+        return {"root": self.root.to_primitive()}
+
+    def to_json(self):
+        """Dump the legacy tree.json, which is the same as dumping `to_primitive()` with indent and sorted keys."""
+        command_groups = self.root.command_groups
+        try:
+            self.root.command_groups = None
+            data = {"root": self.root.to_primitive()}
+        finally:
+            self.root.command_groups = command_groups
+        if command_groups is None:
+            return json.dumps(data, indent=2, sort_keys=True)
+
+        data["root"]["commandGroups"] = {}
+        text = json.dumps(data, indent=2, sort_keys=True)
+        if not command_groups:
+            return text
+
+        is_lazy = isinstance(command_groups, CMDSpecsLazyCommandGroups)
+        entries = []
+        for name in sorted(command_groups):
+            raw = command_groups.get_raw(name) if is_lazy else None
+            if not isinstance(raw, str):
+                value = raw if raw is not None else command_groups[name].to_primitive()
+                raw = json.dumps(value, indent=2, sort_keys=True).replace('\n', '\n' + self._INDENT)
+            entries.append(f'{self._INDENT}{json.dumps(name)}: {raw}')
+        return text.replace(
+            self._GROUPS_PLACEHOLDER,
+            '"commandGroups": {\n' + ',\n'.join(entries) + '\n    }',
+            1
+        )
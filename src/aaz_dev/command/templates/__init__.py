@@ -6,10 +6,9 @@ def get_templates():
     global _templates
     if _templates is None:
         import os
-        from jinja2 import Environment, FileSystemLoader
+        from utils.templates import create_environment
         from ._filters import custom_filters
-        env = Environment(loader=FileSystemLoader(searchpath=os.path.dirname(os.path.abspath(__file__))))
-        env.filters.update(custom_filters)
+        env = create_environment(os.path.dirname(os.path.abspath(__file__)), custom_filters)
         _templates = {}
         _templates['tree'] = env.get_template("tree.md.j2")
         _templates['group'] = env.get_template("group.md.j2")
@@ -0,0 +1,151 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+from unittest import TestCase
+
+from command.api._cmds import _batch_generate_workspaces, _group_overlapped_entries, _load_generate_manifest
+from command.controller.specs_manager import AAZSpecsManager
+from swagger.controller.specs_manager import SwaggerSpecsManager
+from utils.config import Config
+
+
+class BatchGenerateTest(TestCase):
+
+    def setUp(self):
+        self._configs = (Config.SWAGGER_PATH, Config.SWAGGER_MODULE_PATH, Config.AAZ_DEV_FOLDER, Config.AAZ_PATH)
+        self.tmp_folder = tempfile.mkdtemp()
+        Config.SWAGGER_PATH = self.tmp_folder
+        Config.SWAGGER_MODULE_PATH = None
+        Config.AAZ_DEV_FOLDER = os.path.join(self.tmp_folder, '.aaz_dev')
+        Config.AAZ_PATH = os.path.join(self.tmp_folder, 'aaz')
+        os.makedirs(Config.AAZ_PATH)
+        self._write_module('foo', 'Microsoft.Foo', {
+            'package-a': ['/subscriptions/{subscriptionId}/providers/Microsoft.Foo/foos/{fooName}'],
+            'package-b': ['/subscriptions/{subscriptionId}/providers/Microsoft.Foo/bars/{barName}'],
+        })
+        self._write_module('bar', 'Microsoft.Bar', {
+            'package-a': ['/subscriptions/{subscriptionId}/providers/Microsoft.Bar/bars/{barName}'],
+        })
+        self._write_module('baz', 'Microsoft.Baz', {
+            'package-a': [
+                '/subscriptions/{subscriptionId}/providers/Microsoft.Baz/bazs/{bazName}',
+                '/subscriptions/{subscriptionId}/providers/Microsoft.Foo/foos/{fooName}',
+            ],
+            'package-b': ['/subscriptions/{subscriptionId}/providers/Microsoft.Baz/quxs/{quxName}'],
+        })
+        self._write_module('multi', 'Microsoft.One', {
+            'package-a': ['/subscriptions/{subscriptionId}/providers/Microsoft.One/ones/{oneName}'],
+        }, rp_readme=True)
+        self._write_module('multi', 'Microsoft.Two', {
+            'package-a': ['/subscriptions/{subscriptionId}/providers/Microsoft.Two/twos/{twoName}'],
+        }, rp_readme=True)
+
+    def tearDown(self):
+        Config.SWAGGER_PATH, Config.SWAGGER_MODULE_PATH, Config.AAZ_DEV_FOLDER, Config.AAZ_PATH = self._configs
+        shutil.rmtree(self.tmp_folder)
+
+    def _write_module(self, module, rp_name, tags, rp_readme=False):
+        module_folder = os.path.join(self.tmp_folder, 'specification', module, 'resource-manager')
+        readme_folder = os.path.join(module_folder, rp_name) if rp_readme else module_folder
+        readme = f"# {module}\n\n"
+        for idx, (tag, paths) in enumerate(tags.items()):
+            version = f"2021-0{idx + 1}-01"
+            file_path = os.path.join(module_folder, rp_name, 'stable', version, f'{module}.json')
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "swagger": "2.0",
+                    "info": {"title": module, "version": version},
+                    "paths": {path: {"get": self._get_operation(path)} for path in paths},
+                }, f)
+            input_file = os.path.relpath(file_path, readme_folder).replace(os.sep, '/')
+            readme += f"```yaml $(tag) == '{tag}'\ninput-file:\n  - {input_file}\n```\n\n"
+        with open(os.path.join(readme_folder, 'readme.md'), 'w', encoding='utf-8') as f:
+            f.write(readme)
+
+    @staticmethod
+    def _get_operation(path):
+        params = [
+            {"name": name, "in": "path", "required": True, "type": "string"}
+            for name in re.findall(r'{(\w+)}', path)
+        ]
+        params.append({"name": "api-version", "in": "query", "required": True, "type": "string"})
+        return {
+            "operationId": f"{path.split('/')[-2]}_Get",
+            "parameters": params,
+            "responses": {
+                "200": {
+                    "description": "OK",
+                    "schema": {"type": "object", "properties": {"id": {"type": "string", "readOnly": True}}},
+                },
+            },
+        }
+
+    def test_group_overlapped_entries(self):
+        entries = [
+            {"module": "foo", "resource_provider": "Microsoft.Foo", "swagger_tag": "package-a"},
+            {"module": "bar", "resource_provider": "Microsoft.Bar", "swagger_tag": "package-a"},
+            # share the resource with the first entry
+            {"module": "baz", "resource_provider": "Microsoft.Baz", "swagger_tag": "package-a"},
+            {"module": "baz", "resource_provider": "Microsoft.Baz", "swagger_tag": "package-b"},
+            # the entry with invalid tag is grouped by its module and resource provider only
+            {"module": "bar", "resource_provider": "Microsoft.Bar", "swagger_tag": "package-x"},
+            {"module": "qux", "resource_provider": "Microsoft.Qux", "swagger_tag": "package-a"},
+            # the resource providers of one module are not overlapped
+            {"module": "multi", "resource_provider": "Microsoft.One", "swagger_tag": "package-a"},
+            {"module": "multi", "resource_provider": "Microsoft.Two", "swagger_tag": "package-a"},
+            # the entries exported to one workspace folder
+            {"module": "multi", "resource_provider": "Microsoft.Two", "swagger_tag": "package-a",
+             "workspace_path": os.path.join(self.tmp_folder, 'ws')},
+            {"module": "qux", "resource_provider": "Microsoft.Qux", "swagger_tag": "package-b",
+             "workspace_path": os.path.join(self.tmp_folder, 'ws')},
+        ]
+        groups = _group_overlapped_entries(SwaggerSpecsManager(), entries)
+        self.assertEqual(groups, [[0, 2, 3], [1, 4], [5, 7, 8, 9], [6]])
+
+    def test_load_generate_manifest(self):
+        manifest = os.path.join(self.tmp_folder, 'manifest.json')
+        with open(manifest, 'w', encoding='utf-8') as f:
+            json.dump([
+                {"module": "foo", "resourceProvider": "Microsoft.Foo", "swaggerTag": "package-a"},
+                {"module": "bar", "resourceProvider": "Microsoft.Bar", "swaggerTag": "package-a",
+                 "workspacePath": "bar-ws"},
+            ], f)
+        self.assertEqual(_load_generate_manifest(manifest), [
+            {"module": "foo", "resource_provider": "Microsoft.Foo", "swagger_tag": "package-a",
+             "workspace_path": None},
+            {"module": "bar", "resource_provider": "Microsoft.Bar", "swagger_tag": "package-a",
+             "workspace_path": "bar-ws"},
+        ])
+
+        for data in ({"module": "foo"}, ["foo"], [{"module": "foo", "resourceProvider": "Microsoft.Foo"}]):
+            with open(manifest, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            with self.assertRaises(ValueError):
+                _load_generate_manifest(manifest)
+
+    def test_batch_generate_workspaces(self):
+        entries = [
+            {"module": "foo", "resource_provider": "Microsoft.Foo", "swagger_tag": "package-a"},
+            {"module": "bar", "resource_provider": "Microsoft.Bar", "swagger_tag": "package-a"},
+            {"module": "multi", "resource_provider": "Microsoft.One", "swagger_tag": "package-a"},
+            {"module": "multi", "resource_provider": "Microsoft.Two", "swagger_tag": "package-a"},
+        ]
+        entries = [{**entry, "workspace_path": None} for entry in entries]
+        for workers in (1, 2):
+            shutil.rmtree(Config.AAZ_PATH)
+            os.makedirs(Config.AAZ_PATH)
+            aaz_specs = AAZSpecsManager()
+            saved = []
+            save = aaz_specs.save
+            aaz_specs.save = lambda: saved.append(save())
+            _batch_generate_workspaces(SwaggerSpecsManager(), aaz_specs, entries, workers)
+            # the command models of all the entries are saved once
+            self.assertEqual(len(saved), 1)
+
+            aaz_specs = AAZSpecsManager()
+            for names in (['foo', 'foo', 'show'], ['bar', 'bar', 'show'], ['one', 'one', 'show'],
+                          ['two', 'two', 'show']):
+                self.assertIsNotNone(aaz_specs.find_command(*names), names)
@@ -0,0 +1,144 @@
+import os
+from unittest import TestCase
+
+from schematics.exceptions import DataError
+
+from command.model.configuration import CMDConfiguration, XMLSerializer, CMDObjectSchema, CMDArraySchemaBase, \
+    CMDClsSchema, CMDStringArg, CMDClsArg, CMDObjectSchemaBase, CMDHttpOperation, CMDHttpResponse, CMDDiffLevelEnum, \
+    clone_model
+from command.model.configuration._arg import CMDArgField, CMDArgBaseField
+from command.model.configuration._schema import CMDSchemaField, CMDSchemaBaseField
+from command.model.configuration._xml import read_xml, write_xml
+
+
+class CMDConfigurationTest(TestCase):
+
+    DATA_FOLDER = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "cli", "tests", "aaz_generator_tests", "databricks")
+
+    def test_find_model_by_type(self):
+        field = CMDSchemaField()
+        self.assertIs(field.find_model({"type": "object", "name": "a"}), CMDObjectSchema)
+        self.assertIs(field.find_model({"type": "@Cls", "name": "a"}), CMDClsSchema)
+        self.assertIs(field.find_model({"type": "@Other", "name": "b"}), CMDClsSchema)
+        # the schema without name is not claimed by any model, even if the type is in the table.
+        with self.assertRaises(Exception):
+            field.find_model({"type": "object"})
+
+        field = CMDSchemaBaseField()
+        self.assertIs(field.find_model({"type": "array<string>"}), CMDArraySchemaBase)
+        self.assertIs(field.find_model({"type": "object", "name": "a"}), CMDObjectSchemaBase)
+
+        field = CMDArgField()
+        self.assertIs(field.find_model({"type": "string", "var": "$a"}), CMDStringArg)
+        self.assertIs(field.find_model({"type": "@Cls", "var": "$a"}), CMDClsArg)
+        with self.assertRaises(Exception):
+            CMDArgBaseField().find_model({"type": "unknown"})
+
+    def test_load_data(self):
+        for name in ("vnet-peering-crud.xml", "workspace-crud.xml", "sentinel-automation-rule-crud.xml"):
+            with open(os.path.join(self.DATA_FOLDER, name), 'r') as f:
+                data = XMLSerializer.from_xml(CMDConfiguration, f.read()).to_primitive()
+            self.assertEqual(CMDConfiguration(data).to_primitive(), data)
+
+        # the unknown keys are rejected
+        data['commandGroups'][0]['unknown'] = True
+        with self.assertRaises(DataError):
+            CMDConfiguration(data)
+
+    def test_structure_fingerprint(self):
+        with open(os.path.join(self.DATA_FOLDER, "workspace-crud.xml"), 'r') as f:
+            cfg = XMLSerializer.from_xml(CMDConfiguration, f.read())
+        command = [command for command in cfg.command_groups[0].commands if command.name == "show"][0]
+        operation = [operation for operation in command.operations if isinstance(operation, CMDHttpOperation)][0]
+        response = [response for response in operation.http.responses if not response.is_error][0]
+        other = CMDHttpResponse(response.to_primitive())
+        for level in (CMDDiffLevelEnum.BreakingChange, CMDDiffLevelEnum.Structure, CMDDiffLevelEnum.All):
+            self.assertEqual(response.structure_fingerprint(level), other.structure_fingerprint(level))
+            self.assertFalse(response.diff(other, level))
+
+        # description is compared in All level only
+        other.description = "Another description"
+        self.assertEqual(response.structure_fingerprint(CMDDiffLevelEnum.Structure),
+                         other.structure_fingerprint(CMDDiffLevelEnum.Structure))
+        self.assertNotEqual(response.structure_fingerprint(CMDDiffLevelEnum.All),
+                            other.structure_fingerprint(CMDDiffLevelEnum.All))
+        self.assertTrue(response.diff(other, CMDDiffLevelEnum.All))
+
+        # the fingerprint is computed again after the schema is modified
+        schema = other.body.json.schema
+        prop = schema.props[0]
+        prop.required = not prop.required
+        self.assertNotEqual(response.structure_fingerprint(CMDDiffLevelEnum.Structure),
+                            other.structure_fingerprint(CMDDiffLevelEnum.Structure))
+        diff = response.diff(other, CMDDiffLevelEnum.Structure)
+        self.assertEqual([*diff["body"]["schema"]["props"][prop.name]], ["required"])
+
+    def test_clone_model(self):
+        with open(os.path.join(self.DATA_FOLDER, "workspace-crud.xml"), 'r') as f:
+            cfg = XMLSerializer.from_xml(CMDConfiguration, f.read())
+        for command_group in cfg.command_groups:
+            for command in command_group.commands or []:
+                command.link()
+        cloned = clone_model(cfg)
+        self.assertEqual(cloned.to_primitive(), cfg.to_primitive())
+        self.assertEqual(XMLSerializer.to_xml(cloned), XMLSerializer.to_xml(cfg.__class__(cfg.to_primitive())))
+
+        # the copy doesn't share models with cfg, and the links are reset
+        command = cloned.command_groups[0].commands[0]
+        self.assertIsNot(command, cfg.command_groups[0].commands[0])
+        self.assertIsNone(command.arg_cls_register_map)
+        command.arg_groups[0].args[0].options = ["new-option"]
+        self.assertNotEqual(cloned.to_primitive(), cfg.to_primitive())
+
+        # frozen schemas are dropped as they are in export
+        schema = CMDObjectSchema({
+            "name": "properties",
+            "type": "object",
+            "props": [{"name": "a", "type": "string", "frozen": True}, {"name": "b", "type": "string"}],
+        })
+        cloned = clone_model(schema)
+        self.assertEqual([prop.name for prop in cloned.props], ["b"])
+        self.assertEqual(cloned.to_primitive(), schema.to_primitive())
+
+    def test_xml_serializer(self):
+        for name in sorted(os.listdir(self.DATA_FOLDER)):
+            if not name.endswith(".xml"):
+                continue
+            with open(os.path.join(self.DATA_FOLDER, name), 'r') as f:
+                xml = f.read()
+            # the xml is read without xmltodict
+            self.assertIsNotNone(read_xml(xml))
+            cfg = XMLSerializer.from_xml(CMDConfiguration, xml)
+            self.assertEqual(cfg.to_primitive(),
+                             XMLSerializer._from_xml_by_xmltodict(CMDConfiguration, xml).to_primitive())
+
+            # the output is the same as lxml's byte for byte
+            output = XMLSerializer.to_xml(cfg)
+            self.assertEqual(output, XMLSerializer._to_xml_by_lxml(cfg))
+            self.assertEqual(XMLSerializer.from_xml(CMDConfiguration, output).to_primitive(),
+                             XMLSerializer._from_xml_by_xmltodict(CMDConfiguration, output).to_primitive())
+
+        primitive = {
+            "name": "a\"b\n\t&<c>", "options": ["a", "abc"],
+            "help": {"lines": ["", " 1 < 2 & 3 ", "\r"]}, "props": [{"name": "p"}, {}],
+        }
+        self.assertEqual(write_xml(primitive), XMLSerializer._to_xml_by_lxml(MockPrimitive(primitive)))
+        with self.assertRaises(ValueError):
+            write_xml({"name": "a\x00"})
+
+        # the xml out of the layout is parsed by xmltodict
+        xml = "<?xml version='1.0' encoding='utf-8'?>\n<CodeGen>\n  <!-- comment -->\n" \
+              "  <resource id=\"/subscriptions/{}\" version=\"2021-10-01\" swagger=\"mgmt-plane/a/b\"/>\n</CodeGen>\n"
+        self.assertIsNone(read_xml(xml))
+        self.assertEqual(XMLSerializer.from_xml(CMDConfiguration, xml).resources[0].version, "2021-10-01")
+
+
+class MockPrimitive:
+
+    def __init__(self, primitive):
+        self._primitive = primitive
+
+    def to_primitive(self, context=None):
+        return self._primitive
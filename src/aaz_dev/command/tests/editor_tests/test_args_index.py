@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from command.controller.workspace_args_index import WorkspaceArgsIndex
+from command.controller.workspace_cfg_editor import WorkspaceCfgEditor
+from command.controller.workspace_manager import WorkspaceManager
+from command.model.configuration import CMDConfiguration, XMLSerializer
+from utils.config import Config
+from utils.plane import PlaneEnum
+
+
+class WorkspaceArgsIndexTest(TestCase):
+
+    DATA_FOLDER = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "cli", "tests", "aaz_generator_tests", "databricks")
+
+    CMD_NAMES = ["databricks", "workspace", "vnet-peering", "create"]
+
+    def setUp(self):
+        self._configs = (Config.AAZ_DEV_FOLDER, Config.AAZ_PATH, Config.SWAGGER_PATH)
+        self.folder = tempfile.mkdtemp()
+        Config.AAZ_DEV_FOLDER = os.path.join(self.folder, ".aaz_dev")
+        Config.AAZ_PATH = os.path.join(self.folder, "aaz")
+        Config.SWAGGER_PATH = os.path.join(self.folder, "swagger")
+        os.makedirs(Config.AAZ_PATH)
+        os.makedirs(Config.SWAGGER_PATH)
+        self.ws_folder = os.path.join(self.folder, "ws")
+
+        manager = WorkspaceManager.new("test", plane=PlaneEnum.Mgmt, folder=self.ws_folder)
+        for name in ("vnet-peering-crud.xml", "workspace-crud.xml"):
+            with open(os.path.join(self.DATA_FOLDER, name), 'r') as f:
+                cfg_editor = WorkspaceCfgEditor(XMLSerializer.from_xml(CMDConfiguration, f.read()))
+            cfg_editor.reformat()
+            manager.add_cfg(cfg_editor)
+        manager.save()
+
+    def tearDown(self):
+        Config.AAZ_DEV_FOLDER, Config.AAZ_PATH, Config.SWAGGER_PATH = self._configs
+        shutil.rmtree(self.folder)
+
+    def _load_manager(self):
+        manager = WorkspaceManager("test", folder=self.ws_folder)
+        manager.load()
+        return manager
+
+    def _find_similar_args(self, manager, *cmd_names, idx):
+        leaf = manager.find_command_tree_leaf(*cmd_names)
+        cfg_editor = manager.load_cfg_editor_by_command(leaf)
+        return manager.find_similar_args(*cmd_names, arg=cfg_editor.find_arg(*cmd_names, idx=idx))
+
+    def test_find_similar_args(self):
+        self.assertTrue(os.path.exists(WorkspaceArgsIndex.get_path(self.ws_folder)))
+        manager = self._load_manager()
+        results = self._find_similar_args(manager, *self.CMD_NAMES, idx="databricks-address-space.address-prefixes")
+        self.assertEqual(results, {
+            ("databricks", "workspace", "vnet-peering", "create"): {
+                "@AddressSpace_create.addressPrefixes": [
+                    "databricks-address-space.address-prefixes", "remote-address-space.address-prefixes"]
+            },
+            ("databricks", "workspace", "vnet-peering", "update"): {
+                "@AddressSpace_update.addressPrefixes": [
+                    "databricks-address-space.address-prefixes", "remote-address-space.address-prefixes"]
+            },
+        })
+        # only the cfg of command is loaded
+        self.assertEqual({cfg_editor.resources[0].id for cfg_editor in manager._cfg_editors.values()},
+                         {manager.find_command_tree_leaf(*self.CMD_NAMES).resources[0].id})
+
+        manager = self._load_manager()
+        results = self._find_similar_args(manager, *self.CMD_NAMES, idx="resource-group")
+        self.assertIn(("databricks", "workspace", "show"), results)
+        self.assertIn(("databricks", "workspace", "vnet-peering", "delete"), results)
+
+        # the index is rebuilt when it's out of date
+        os.remove(WorkspaceArgsIndex.get_path(self.ws_folder))
+        manager = self._load_manager()
+        self.assertEqual(self._find_similar_args(manager, *self.CMD_NAMES, idx="resource-group"), results)
+        self.assertEqual(len({id(cfg_editor) for cfg_editor in manager._cfg_editors.values()}), 2)
+        self.assertIsNotNone(WorkspaceArgsIndex.load(self.ws_folder, manager.ws.version))
+
+    def test_find_similar_args_after_edit(self):
+        manager = self._load_manager()
+        leaf = manager.find_command_tree_leaf("databricks", "workspace", "show")
+        cfg_editor = manager.load_cfg_editor_by_command(leaf)
+        arg, _ = cfg_editor.find_arg_by_var(*leaf.names, arg_var="$Path.resourceGroupName")
+        cfg_editor.update_arg_by_var(*leaf.names, arg_var=arg.var, options=["group", "g"])
+
+        # the modified cfg is used before it's saved
+        results = self._find_similar_args(manager, *self.CMD_NAMES, idx="resource-group")
+        self.assertNotIn(("databricks", "workspace", "show"), results)
+        self.assertIn(("databricks", "workspace", "create"), results)
+
+        manager.save()
+        manager = self._load_manager()
+        self.assertEqual(self._find_similar_args(manager, *self.CMD_NAMES, idx="resource-group"), results)
+        self.assertEqual(
+            self._find_similar_args(manager, "databricks", "workspace", "show", idx="group"),
+            {("databricks", "workspace", "show"): {"$Path.resourceGroupName": ["group"]}})
@@ -0,0 +1,68 @@
+import os
+from unittest import TestCase
+
+from command.controller.workspace_cfg_editor import WorkspaceCfgEditor
+from command.model.configuration import CMDConfiguration, XMLSerializer, CMDArgGroup
+
+
+class CfgIndexTest(TestCase):
+
+    CFG_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "cli", "tests", "aaz_generator_tests", "databricks", "vnet-peering-crud.xml")
+
+    CMD_NAMES = ["databricks", "workspace", "vnet-peering", "create"]
+
+    def setUp(self):
+        with open(self.CFG_PATH, 'r') as f:
+            self.cfg_editor = WorkspaceCfgEditor(XMLSerializer.from_xml(CMDConfiguration, f.read()))
+
+    def test_find_args(self):
+        command = self.cfg_editor.find_command(*self.CMD_NAMES)
+        parent, arg, arg_idx = self.cfg_editor.find_arg_with_parent_by_var(
+            *self.CMD_NAMES, arg_var="@AddressSpace_create.addressPrefixes")
+        self.assertEqual(arg_idx, "databricks-address-space.address-prefixes")
+        self.assertIs(parent, self.cfg_editor.find_arg(*self.CMD_NAMES, idx="databricks-address-space"))
+        self.assertIsNotNone(command.lookup_index)
+
+        # flattened argument
+        parent, arg, arg_idx = self.cfg_editor.find_arg_with_parent_by_var(
+            *self.CMD_NAMES, arg_var="$VirtualNetworkPeeringParameters.properties")
+        self.assertIsInstance(parent, CMDArgGroup)
+        self.assertIsNone(arg)
+        self.assertEqual(
+            self.cfg_editor.find_arg_with_parent_by_var(*self.CMD_NAMES, arg_var="$NotExist"), (None, None, None))
+
+        _, cls_arg, cls_arg_idx, _ = self.cfg_editor.find_arg_cls_definition(
+            *self.CMD_NAMES, cls_name="AddressSpace_create")
+        self.assertEqual(cls_arg_idx, "databricks-address-space")
+        self.assertEqual(
+            [arg_idx for _, _, arg_idx, _ in self.cfg_editor.iter_arg_cls_definition(
+                *self.CMD_NAMES, cls_name_prefix="AddressSpace")],
+            ["databricks-address-space"])
+
+    def test_find_schemas(self):
+        command = self.cfg_editor.find_command(*self.CMD_NAMES)
+        arg_var = "$VirtualNetworkPeeringParameters.properties.databricksVirtualNetwork.id"
+        matches = [*self.cfg_editor.iter_schema_in_command_by_arg_var(command, arg_var)]
+        self.assertEqual(len(matches), 1)
+        _, schema, schema_idx = matches[0]
+        self.assertEqual(schema.arg, arg_var)
+        self.assertIs(self.cfg_editor.find_schema_in_command(command, schema_idx), schema)
+        self.assertIsNone(self.cfg_editor.find_schema_in_command(command, [*schema_idx, "notExist"]))
+
+    def test_index_dropped_after_edit(self):
+        arg_var = "$VirtualNetworkPeeringParameters.properties.allowForwardedTraffic"
+        _, arg_idx = self.cfg_editor.find_arg_by_var(*self.CMD_NAMES, arg_var=arg_var)
+        self.assertEqual(arg_idx, "allow-forwarded-traffic")
+
+        self.cfg_editor.update_arg_by_var(*self.CMD_NAMES, arg_var=arg_var, options=["forwarded-traffic", "f"])
+        _, arg_idx = self.cfg_editor.find_arg_by_var(*self.CMD_NAMES, arg_var=arg_var)
+        self.assertEqual(arg_idx, "forwarded-traffic")
+
+        arg_var = "$VirtualNetworkPeeringParameters.properties.databricksVirtualNetwork"
+        self.cfg_editor.flatten_arg(*self.CMD_NAMES, arg_var=arg_var)
+        parent, arg, _ = self.cfg_editor.find_arg_with_parent_by_var(*self.CMD_NAMES, arg_var=arg_var)
+        self.assertIsNone(arg)
+        _, arg_idx = self.cfg_editor.find_arg_by_var(*self.CMD_NAMES, arg_var=f"{arg_var}.id")
+        self.assertEqual(arg_idx, "id")
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from command.controller.workspace_cfg_editor import WorkspaceCfgEditor
+from command.model.configuration import CMDConfiguration, XMLSerializer
+from utils.config import Config
+
+
+class CfgNormalizedMarkerTest(TestCase):
+
+    CFG_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "cli", "tests", "aaz_generator_tests", "databricks", "vnet-peering-crud.xml")
+
+    def setUp(self):
+        self._aaz_dev_folder = Config.AAZ_DEV_FOLDER
+        self.folder = tempfile.mkdtemp()
+        Config.AAZ_DEV_FOLDER = os.path.join(self.folder, ".aaz_dev")
+        with open(self.CFG_PATH, 'r') as f:
+            self.cfg_editor = WorkspaceCfgEditor(XMLSerializer.from_xml(CMDConfiguration, f.read()))
+        self.cfg_editor.reformat()
+        self.resource = self.cfg_editor.resources[0]
+
+    def tearDown(self):
+        Config.AAZ_DEV_FOLDER = self._aaz_dev_folder
+        shutil.rmtree(self.folder)
+
+    def _save(self, cfg_editor):
+        # the same as WorkspaceManager.save
+        for r_id, data in cfg_editor.iter_cfg_files_data():
+            cfg_path = WorkspaceCfgEditor.get_cfg_path(self.folder, r_id)
+            os.makedirs(os.path.dirname(cfg_path), exist_ok=True)
+            with open(cfg_path, 'w') as f:
+                f.write(data)
+            marker_path = WorkspaceCfgEditor.get_cfg_marker_path(self.folder, r_id)
+            marker_data = cfg_editor.get_normalized_marker_data(r_id, data)
+            if marker_data is None:
+                if os.path.exists(marker_path):
+                    os.remove(marker_path)
+            else:
+                with open(marker_path, 'w') as f:
+                    f.write(marker_data)
+
+    def _load(self):
+        return WorkspaceCfgEditor.load_resource(self.folder, self.resource.id, self.resource.version)
+
+    def test_skip_reformat_of_normalized_cfg(self):
+        self._save(self.cfg_editor)
+        self.assertTrue(os.path.exists(WorkspaceCfgEditor.get_cfg_marker_path(self.folder, self.resource.id)))
+        cfg_editor = self._load()
+        self.assertIsNotNone(cfg_editor.normalized_digest)
+        self.assertEqual(cfg_editor.cfg.to_primitive(), self.cfg_editor.cfg.to_primitive())
+
+        # the marker is kept when the unchanged cfg is saved again
+        self._save(cfg_editor)
+        self.assertIsNotNone(self._load().normalized_digest)
+
+        # the cfg file is modified by others
+        cfg_path = WorkspaceCfgEditor.get_cfg_path(self.folder, self.resource.id)
+        with open(cfg_path, 'a') as f:
+            f.write("\n")
+        cfg_editor = self._load()
+        self.assertIsNone(cfg_editor.normalized_digest)
+        self.assertEqual(cfg_editor.cfg.to_primitive(), self.cfg_editor.cfg.to_primitive())
+
+    def test_reformat_cfg_not_normalized(self):
+        _, command = next(self.cfg_editor.iter_commands())
+        arg_group = [arg_group for arg_group in command.arg_groups if len(arg_group.args) > 1][0]
+        arg_group.args = arg_group.args[::-1]
+        self._save(self.cfg_editor)
+        self.assertFalse(os.path.exists(WorkspaceCfgEditor.get_cfg_marker_path(self.folder, self.resource.id)))
+
+        cfg_editor = self._load()
+        self.assertIsNone(cfg_editor.normalized_digest)
+        self.cfg_editor.reformat()
+        self.assertEqual(cfg_editor.cfg.to_primitive(), self.cfg_editor.cfg.to_primitive())
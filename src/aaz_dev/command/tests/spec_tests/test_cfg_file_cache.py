@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from command.controller.cfg_file_cache import CfgFileCache
+from command.controller.cfg_reader import CfgReader
+from command.model.configuration import BinarySerializer, CMDConfiguration, XMLSerializer
+from utils.config import Config
+
+
+class CfgFileCacheTest(TestCase):
+
+    CFG_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "cli", "tests", "aaz_generator_tests", "databricks", "vnet-peering-crud.xml")
+
+    def setUp(self):
+        self._aaz_dev_folder = Config.AAZ_DEV_FOLDER
+        self.folder = tempfile.mkdtemp()
+        Config.AAZ_DEV_FOLDER = os.path.join(self.folder, ".aaz_dev")
+        with open(self.CFG_PATH, 'r') as f:
+            self.data = XMLSerializer.from_xml(CMDConfiguration, f.read()).to_primitive()
+        self.cfg_path = os.path.join(self.folder, "cfg.json")
+        with open(self.cfg_path, 'w') as f:
+            json.dump(self.data, f)
+
+    def tearDown(self):
+        Config.AAZ_DEV_FOLDER = self._aaz_dev_folder
+        shutil.rmtree(self.folder)
+
+    def test_binary_serializer(self):
+        cfg = CMDConfiguration(self.data)
+        loaded = BinarySerializer.from_bytes(CMDConfiguration, BinarySerializer.to_bytes(cfg))
+        self.assertIsNot(loaded, cfg)
+        self.assertEqual(loaded.to_primitive(), self.data)
+        CfgReader(loaded)
+        self.assertEqual(loaded.to_primitive(), self.data)
+
+        with self.assertRaises(ValueError):
+            BinarySerializer.from_bytes(CMDConfiguration, b"0" * 64 + BinarySerializer.to_bytes(cfg)[64:])
+
+    def test_load_cached_cfg(self):
+        cache = CfgFileCache()
+        self.assertIsNone(cache.load(self.cfg_path))
+        cache.dump(self.cfg_path, CMDConfiguration(self.data))
+        self.assertEqual(cache.load(self.cfg_path).to_primitive(), self.data)
+        self.assertIsNot(cache.load(self.cfg_path), cache.load(self.cfg_path))
+
+        # the cfg file changed
+        stat = os.stat(self.cfg_path)
+        os.utime(self.cfg_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(cache.load(self.cfg_path))
+
+        # the cache file is broken
+        cache.dump(self.cfg_path, CMDConfiguration(self.data))
+        cache_path = cache._get_cache_path(self.cfg_path)
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        with open(cache_path, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        self.assertIsNone(cache.load(self.cfg_path))
+
+        # the cfg cannot be serialized
+        cache.dump(self.cfg_path, object())
+        self.assertIsNone(cache.load(self.cfg_path))
+        self.assertEqual(os.listdir(os.path.dirname(cache_path)), [os.path.basename(cache_path)])
+
+    def test_prune(self):
+        cache = CfgFileCache()
+        cfg_paths = []
+        for idx in range(3):
+            cfg_path = os.path.join(self.folder, f"cfg{idx}.json")
+            shutil.copy(self.cfg_path, cfg_path)
+            cache.dump(cfg_path, CMDConfiguration(self.data))
+            cfg_paths.append(cfg_path)
+            cache_path = cache._get_cache_path(cfg_path)
+            os.utime(cache_path, (idx, idx))
+        self.assertTrue(os.path.exists(os.path.join(Config.AAZ_DEV_FOLDER, cache.FOLDER_NAME, cache.PRUNE_MARKER_NAME)))
+
+        # the cache of removed cfg file is pruned
+        os.remove(cfg_paths[2])
+        cache.prune()
+        self.assertIsNotNone(cache.load(cfg_paths[0]))
+        self.assertIsNotNone(cache.load(cfg_paths[1]))
+        self.assertFalse(os.path.exists(cache._get_cache_path(cfg_paths[2])))
+
+        # the least recently cached one is pruned beyond the max size
+        cache.MAX_SIZE = os.path.getsize(cache._get_cache_path(cfg_paths[1])) + 1
+        cache.prune()
+        self.assertIsNone(cache.load(cfg_paths[0]))
+        self.assertIsNotNone(cache.load(cfg_paths[1]))
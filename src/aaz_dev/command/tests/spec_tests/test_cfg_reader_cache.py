@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from command.controller.specs_manager import AAZSpecsManager, CfgReaderCache, cfg_reader_cache
+from command.model.configuration import CMDConfiguration, XMLSerializer
+from utils.config import Config
+
+
+class CfgReaderCacheTest(TestCase):
+
+    CFG_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "cli", "tests", "aaz_generator_tests", "databricks", "vnet-peering-crud.xml")
+
+    def setUp(self):
+        self._aaz_path = Config.AAZ_PATH
+        self.aaz_folder = tempfile.mkdtemp()
+        Config.AAZ_PATH = self.aaz_folder
+        cfg_reader_cache.clear()
+
+        self.manager = AAZSpecsManager()
+        with open(self.CFG_PATH, 'r') as f:
+            self.cfg = XMLSerializer.from_xml(CMDConfiguration, f.read())
+        self.resource = self.cfg.resources[0]
+        self.json_path, _ = self.manager.get_resource_cfg_file_paths(
+            self.cfg.plane, self.resource.id, self.resource.version)
+        os.makedirs(os.path.dirname(self.json_path))
+        with open(self.json_path, 'w') as f:
+            f.write(self.manager.render_resource_cfg_to_json(self.cfg))
+
+    def tearDown(self):
+        Config.AAZ_PATH = self._aaz_path
+        cfg_reader_cache.clear()
+        shutil.rmtree(self.aaz_folder)
+
+    def _load(self, copy=False):
+        return self.manager.load_resource_cfg_reader(
+            self.cfg.plane, self.resource.id, self.resource.version, copy=copy)
+
+    def test_reuse_linked_reader(self):
+        cfg_reader = self._load()
+        self.assertIs(self._load(), cfg_reader)
+        self.assertIs(AAZSpecsManager().load_resource_cfg_reader(
+            self.cfg.plane, self.resource.id, self.resource.version, copy=False), cfg_reader)
+
+        # a private copy is loaded by default
+        copied = self.manager.load_resource_cfg_reader(self.cfg.plane, self.resource.id, self.resource.version)
+        self.assertIsNot(copied, cfg_reader)
+        self.assertEqual(copied.cfg.to_primitive(), cfg_reader.cfg.to_primitive())
+        self.assertIs(self._load(), cfg_reader)
+
+        # the cfg file changed by others
+        stat = os.stat(self.json_path)
+        os.utime(self.json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertIsNot(self._load(), cfg_reader)
+
+    def test_cache_size_bounded(self):
+        cache = CfgReaderCache(max_count=2)
+        for idx in range(3):
+            cache.put(f"cfg{idx}.json", (idx, idx), idx)
+        self.assertIsNone(cache.get("cfg0.json", (0, 0)))
+        self.assertEqual(cache.get("cfg1.json", (1, 1)), 1)
+        self.assertIsNone(cache.get("cfg2.json", (0, 0)))
+        self.assertIsNone(cache.get("cfg2.json", (2, 2)))
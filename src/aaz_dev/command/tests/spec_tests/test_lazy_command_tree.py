@@ -0,0 +1,89 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from command.controller.specs_manager import AAZSpecsManager
+from command.model.specs import CMDSpecsCommandTree, CMDSpecsLazyCommandTree
+from utils.config import Config
+from utils.exceptions import VerificationError
+
+
+class LazyCommandTreeTest(TestCase):
+
+    TREE_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
+        "cli", "tests", "aaz_generator_tests", "databricks", "tree.json")
+
+    def setUp(self):
+        self._aaz_path = Config.AAZ_PATH
+        self.aaz_folder = tempfile.mkdtemp()
+        Config.AAZ_PATH = self.aaz_folder
+        with open(self.TREE_PATH, 'r') as f:
+            self.tree_data = json.load(f)
+        tree_path = os.path.join(self.aaz_folder, "Commands", "tree.json")
+        os.makedirs(os.path.dirname(tree_path))
+        with open(tree_path, 'w') as f:
+            f.write(self._dump_tree(self.tree_data))
+
+    def tearDown(self):
+        Config.AAZ_PATH = self._aaz_path
+        shutil.rmtree(self.aaz_folder)
+
+    @staticmethod
+    def _dump_tree(data):
+        return json.dumps(CMDSpecsCommandTree(data).to_primitive(), indent=2, sort_keys=True)
+
+    def test_load_touched_command_groups(self):
+        manager = AAZSpecsManager()
+        command_groups = manager.tree.root.command_groups
+        self.assertEqual(sorted(command_groups), ['databricks', 'sentinel'])
+        self.assertFalse(command_groups.is_loaded('databricks'))
+
+        group = manager.find_command_group('databricks', 'workspace')
+        self.assertEqual(group.names, ['databricks', 'workspace'])
+        self.assertTrue(command_groups.is_loaded('databricks'))
+        self.assertFalse(command_groups.is_loaded('sentinel'))
+        self.assertIsNone(manager.find_command('sentinel', 'not-exist'))
+        self.assertTrue(command_groups.is_loaded('sentinel'))
+
+        tree = CMDSpecsLazyCommandTree.from_json(self._dump_tree(self.tree_data))
+        self.assertEqual(tree.summary().root.command_groups['sentinel'].help.short,
+                         self.tree_data['root']['commandGroups']['sentinel']['help']['short'])
+        self.assertFalse(tree.root.command_groups.is_loaded('sentinel'))
+        self.assertEqual(tree.to_primitive(), CMDSpecsCommandTree(self.tree_data).to_primitive())
+
+    def test_save_legacy_tree(self):
+        manager = AAZSpecsManager()
+        group = manager.update_command_group_by_ws(manager.find_command_group('databricks'))
+        group.help.short = "Manage Databricks."
+        manager.save()
+        self.assertFalse(manager.tree.root.command_groups.is_loaded('sentinel'))
+
+        self.tree_data['root']['commandGroups']['databricks']['help']['short'] = "Manage Databricks."
+        with open(manager.get_tree_file_path(), 'r') as f:
+            self.assertEqual(f.read(), self._dump_tree(self.tree_data))
+        with open(manager.get_command_group_readme_path(), 'r') as f:
+            self.assertIn("Manage Databricks.", f.read())
+
+        # the tree dumped in other formats can be loaded
+        with open(manager.get_tree_file_path(), 'w') as f:
+            json.dump(self.tree_data, f)
+        manager = AAZSpecsManager()
+        self.assertEqual(manager.tree.to_json(), self._dump_tree(self.tree_data))
+
+    def test_verify_command_groups_not_loaded(self):
+        sentinel = self.tree_data['root']['commandGroups']['sentinel']
+        del sentinel['help']
+        with open(os.path.join(self.aaz_folder, "Commands", "tree.json"), 'w') as f:
+            f.write(self._dump_tree(self.tree_data))
+
+        manager = AAZSpecsManager()
+        manager.find_command_group('databricks')
+        with self.assertRaises(VerificationError) as cm:
+            manager.verify_command_tree()
+        self.assertEqual(cm.exception.payload['details'], {
+            'sentinel': {'type': 'group', 'help': "Miss short summary."},
+        })
+        self.assertFalse(manager.tree.root.command_groups.is_loaded('sentinel'))
@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import TestCase
+
+from command.controller.specs_writer import AAZSpecsWriter
+
+
+def _render_readme(name):
+    return f"# {name}\n"
+
+
+class AAZSpecsWriterTest(TestCase):
+
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def _path(self, *names):
+        return os.path.join(self.folder, *names)
+
+    def _read(self, *names):
+        with open(self._path(*names), 'r') as f:
+            return f.read()
+
+    def test_render_in_workers(self):
+        tasks = [(_render_readme, (f"cmd{idx}", )) for idx in range(AAZSpecsWriter.MIN_PARALLEL_TASKS * 2)]
+        expected = [_render_readme(*args) for _, args in tasks]
+        self.assertEqual(AAZSpecsWriter(self.folder, workers=1).render(tasks), expected)
+        self.assertEqual(AAZSpecsWriter(self.folder, workers=3).render(tasks), expected)
+
+    def test_render_in_process_by_default(self):
+        tasks = [(os.getpid, ()) for _ in range(AAZSpecsWriter.MIN_PARALLEL_TASKS * 2)]
+        self.assertEqual(AAZSpecsWriter(self.folder).render(tasks), [os.getpid()] * len(tasks))
+
+    def test_write_changed_files(self):
+        writer = AAZSpecsWriter(self.folder)
+        updated = writer.write({
+            self._path("Commands", "readme.md"): "# aaz\n",
+            self._path("Commands", "foo", "readme.md"): "# foo\n",
+            self._path("Commands", "bar", "readme.md"): "# bar\n",
+        })
+        self.assertEqual(len(updated), 3)
+        self.assertFalse(os.path.exists(writer.staging_folder))
+
+        updated = writer.write({
+            self._path("Commands", "readme.md"): "# aaz\n",
+            self._path("Commands", "foo", "readme.md"): "# foo updated\n",
+        }, remove_folders=[self._path("Commands", "bar")])
+        self.assertEqual(updated, [self._path("Commands", "foo", "readme.md")])
+        self.assertEqual(self._read("Commands", "foo", "readme.md"), "# foo updated\n")
+        self.assertFalse(os.path.exists(self._path("Commands", "bar")))
+        self.assertEqual(writer.write({self._path("Commands", "readme.md"): "# aaz\n"}), [])
+
+    def _dead_owner(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        return {"host": socket.gethostname(), "pid": process.pid, "time": time.time()}
+
+    def test_recover_interrupted_save(self):
+        writer = AAZSpecsWriter(self.folder)
+        writer.write({self._path("Commands", "readme.md"): "# aaz\n"})
+
+        # interrupted after committed
+        os.makedirs(writer.staging_folder)
+        staged_path = os.path.join(writer.staging_folder, "0.tmp")
+        with open(staged_path, 'w') as f:
+            f.write("# aaz updated\n")
+        with open(writer.journal_path, 'w') as f:
+            json.dump({
+                "owner": self._dead_owner(),
+                "committed": True,
+                "updates": [[staged_path, self._path("Commands", "readme.md")]],
+                "removeFiles": [],
+                "removeFolders": [],
+            }, f)
+        writer.recover()
+        self.assertEqual(self._read("Commands", "readme.md"), "# aaz updated\n")
+        self.assertFalse(os.path.exists(writer.staging_folder))
+
+        # interrupted before committed, without journal
+        os.makedirs(writer.staging_folder)
+        with open(staged_path, 'w') as f:
+            f.write("# aaz discarded\n")
+        writer.recover()
+        self.assertTrue(os.path.exists(writer.staging_folder))
+        stale_time = time.time() - AAZSpecsWriter.STALE_SECONDS - 1
+        os.utime(writer.staging_folder, (stale_time, stale_time))
+        writer.recover()
+        self.assertEqual(self._read("Commands", "readme.md"), "# aaz updated\n")
+        self.assertFalse(os.path.exists(writer.staging_folder))
+
+    def test_skip_recovering_save_in_progress(self):
+        writer = AAZSpecsWriter(self.folder)
+        os.makedirs(writer.staging_folder)
+        with open(writer.journal_path, 'w') as f:
+            json.dump({
+                "owner": {"host": socket.gethostname(), "pid": os.getppid(), "time": time.time()},
+                "committed": False,
+                "updates": [],
+                "removeFiles": [],
+                "removeFolders": [],
+            }, f)
+        AAZSpecsWriter(self.folder).recover()
+        self.assertTrue(os.path.exists(writer.journal_path))
+
+        with open(writer.journal_path, 'w') as f:
+            json.dump({"owner": self._dead_owner(), "committed": False}, f)
+        writer.write({self._path("Commands", "readme.md"): "# aaz\n"})
+        self.assertEqual(self._read("Commands", "readme.md"), "# aaz\n")
+        self.assertFalse(os.path.exists(writer.staging_folder))
+
+    def test_staging_folder_ignored(self):
+        writer = AAZSpecsWriter(self.folder)
+        writer._acquire_staging_folder()
+        try:
+            with open(os.path.join(writer.staging_folder, '.gitignore'), 'r') as f:
+                self.assertEqual(f.read(), '*\n')
+            # saving by current process
+            AAZSpecsWriter(self.folder).recover()
+            self.assertTrue(os.path.exists(writer.staging_folder))
+        finally:
+            writer._release_staging_folder()
+        writer.recover()
+        self.assertTrue(os.path.exists(writer.staging_folder))
+        os.utime(writer.staging_folder, (0, 0))
+        writer.recover()
+        self.assertFalse(os.path.exists(writer.staging_folder))
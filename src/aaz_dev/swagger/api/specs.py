@@ -1,6 +1,6 @@
 from flask import Blueprint, jsonify, url_for
 
-from swagger.controller.specs_manager import SwaggerSpecsManager
+from app.manager_registry import get_manager_registry
 
 bp = Blueprint('swagger', __name__, url_prefix='/Swagger/Specs')
 
@@ -8,7 +8,7 @@ bp = Blueprint('swagger', __name__, url_prefix='/Swagger/Specs')
 # modules
 @bp.route("/<plane>", methods=("GET",))
 def get_modules_by(plane):
-    specs_manager = SwaggerSpecsManager()
+    specs_manager = get_manager_registry().get_swagger_specs()
     result = []
     for module in specs_manager.get_modules(plane):
         m = {
@@ -22,7 +22,7 @@ def get_modules_by(plane):
 
 @bp.route("/<plane>/<list_path:mod_names>", methods=("GET",))
 def get_module(plane, mod_names):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     module = specs_module_manager.module
     result = {
         "url": url_for('swagger.get_module', plane=plane, mod_names=mod_names),
@@ -42,7 +42,7 @@ def get_module(plane, mod_names):
 # resource providers
 @bp.route("/<plane>/<list_path:mod_names>/ResourceProviders", methods=("GET",))
 def get_resource_providers_by(plane, mod_names):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     result = []
     for rp in specs_module_manager.get_resource_providers():
         result.append({
@@ -55,7 +55,7 @@ def get_resource_providers_by(plane, mod_names):
 
 @bp.route("/<plane>/<list_path:mod_names>/ResourceProviders/<rp_name>", methods=("GET",))
 def get_resource_provider(plane, mod_names, rp_name):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     rp = specs_module_manager.get_resource_provider(rp_name)
     result = {
         "url": url_for('swagger.get_resource_provider', plane=plane, mod_names=mod_names, rp_name=rp.name),
@@ -90,7 +90,7 @@ def get_resource_provider(plane, mod_names, rp_name):
 # resources
 @bp.route("/<plane>/<list_path:mod_names>/ResourceProviders/<rp_name>/Resources", methods=("GET",))
 def get_resources_by(plane, mod_names, rp_name):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     result = []
     rp = specs_module_manager.get_resource_provider(rp_name)
     resource_op_group_map = specs_module_manager.get_grouped_resource_map(rp_name)
@@ -122,7 +122,7 @@ def get_resources_by(plane, mod_names, rp_name):
 @bp.route("/<plane>/<list_path:mod_names>/ResourceProviders/<rp_name>/Resources/<base64:resource_id>",
           methods=("GET",))
 def get_resource_in_rp(plane, mod_names, rp_name, resource_id):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     version_map = specs_module_manager.get_resource_version_map(resource_id, rp_name)
     rp = list(version_map.values())[0].resource_provider
     op_group_name = specs_module_manager.get_resource_op_group_name(version_map)
@@ -149,7 +149,7 @@ def get_resource_in_rp(plane, mod_names, rp_name, resource_id):
 
 @bp.route("/<plane>/<list_path:mod_names>/Resources/<base64:resource_id>", methods=("GET",))
 def get_resource_in_module(plane, mod_names, resource_id):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     version_map = specs_module_manager.get_resource_version_map(resource_id)
     rp = list(version_map.values())[0].resource_provider
     op_group_name = specs_module_manager.get_resource_op_group_name(version_map)
@@ -180,7 +180,7 @@ def get_resource_in_module(plane, mod_names, resource_id):
     methods=("GET",)
 )
 def get_resource_version_in_rp(plane, mod_names, rp_name, resource_id, version):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     resource = specs_module_manager.get_resource_in_version(rp_name, resource_id, version)
     result = {
         "url": url_for('swagger.get_resource_version_in_rp',
@@ -197,7 +197,7 @@ def get_resource_version_in_rp(plane, mod_names, rp_name, resource_id, version):
 
 @bp.route("/<plane>/<list_path:mod_names>/Resources/<base64:resource_id>/V/<base64:version>", methods=("GET",))
 def get_resource_version_in_module(plane, mod_names, resource_id, version):
-    specs_module_manager = SwaggerSpecsManager().get_module_manager(plane, mod_names)
+    specs_module_manager = get_manager_registry().get_swagger_specs().get_module_manager(plane, mod_names)
     resource = specs_module_manager.get_resource_in_version(resource_id, version)
     result = {
         "url": url_for('swagger.get_resource_version_in_rp',
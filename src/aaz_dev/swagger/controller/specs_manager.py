@@ -14,6 +14,8 @@ class SwaggerSpecsModuleManager:
         self._rps_catch = None
         self._resource_op_group_map_cache = {}
         self._resource_map_cache = {}
+        # the names of the loaded resource providers to be checked for changes when they're accessed next
+        self._rps_to_check = set()
         assert plane in PlaneEnum.choices(), f"Invalid plane: '{self.plane}'"
         assert isinstance(module, SwaggerModule), f"Invalid module type: '{type(module)}'"
 
@@ -32,14 +34,16 @@ class SwaggerSpecsModuleManager:
         if rp is None:
 
             raise exceptions.ResourceNotFind(f"resource provider not find '{rp_name}'")
+        self._drop_cache_if_changed(rp)
         return rp
 
     def get_grouped_resource_map(self, rp_name):
         key = rp_name
-        if key in self._resource_op_group_map_cache:
-            return self._resource_op_group_map_cache[key]
-
         rp = self.get_resource_provider(rp_name)
+        resource_op_group_map = self._resource_op_group_map_cache.get(key, None)
+        if resource_op_group_map is not None:
+            return resource_op_group_map
+
         resource_map = self.get_resource_map(rp)
         resource_op_group_map = OrderedDict()
         for resource_id, version_map in resource_map.items():
@@ -48,7 +52,7 @@ class SwaggerSpecsModuleManager:
                 resource_op_group_map[op_group_name] = OrderedDict()
             resource_op_group_map[op_group_name][resource_id] = version_map
         self._resource_op_group_map_cache[key] = resource_op_group_map
-        return self._resource_op_group_map_cache[key]
+        return resource_op_group_map
 
     @staticmethod
     def get_resource_op_group_name(version_map):
@@ -108,10 +112,29 @@ class SwaggerSpecsModuleManager:
 
     def get_resource_map(self, rp):
         assert isinstance(rp, ResourceProvider)
+        self._drop_cache_if_changed(rp)
         key = str(rp)
-        if key not in self._resource_map_cache:
-            self._resource_map_cache[key] = rp.get_resource_map()
-        return self._resource_map_cache[key]
+        resource_map = self._resource_map_cache.get(key, None)
+        if resource_map is None:
+            resource_map = self._resource_map_cache[key] = rp.get_resource_map()
+        return resource_map
+
+    def drop_changed_caches(self):
+        """Drop the caches of the resource providers whose readme file or swagger files are changed.
+
+        The loaded resource providers are not checked here, but each is checked once when it's accessed next, so only
+        the files of the resource providers in use are checked.
+        """
+        self._rps_to_check = {rp.name for rp in self._rps_catch or []}
+
+    def _drop_cache_if_changed(self, rp):
+        if rp.name not in self._rps_to_check:
+            return
+        self._rps_to_check.discard(rp.name)
+        if rp.is_changed():
+            rp.reset()
+            self._resource_map_cache.pop(str(rp), None)
+            self._resource_op_group_map_cache.pop(rp.name, None)
 
 
 class SwaggerSpecsManager:
@@ -143,8 +166,7 @@ class SwaggerSpecsManager:
 
         result = OrderedDict()
         for m in modules:
-            for rp in m.get_resource_providers():
-                module = rp.swagger_module
+            for module in m.get_resource_provider_modules():
                 module_str = str(module)
                 if module_str not in result:
                     result[module_str] = module
@@ -174,3 +196,8 @@ class SwaggerSpecsManager:
             self._module_managers_cache[key] = SwaggerSpecsModuleManager(plane, module)
 
         return self._module_managers_cache[key]
+
+    def drop_changed_caches(self):
+        """Drop the cached resource providers loaded from the changed readme files or swagger files."""
+        for module_manager in [*self._module_managers_cache.values()]:
+            module_manager.drop_changed_caches()
@@ -30,6 +30,7 @@ from .response import Response
 from .schema import ReferenceSchema
 from .x_ms_pageable import XmsPageable
 from functools import reduce
+from schematics.models import Model, ModelDict
 from utils.case import to_camel_case
 import logging
 import re
@@ -37,9 +38,211 @@ import re
 logger = logging.getLogger("backend")
 
 
+class _BuilderAncestors:
+    """Ids of the builders in the current building chain, shared by a root builder and all its sub builders.
+
+    A sub builder's id is pushed before its schema is converted and popped after, so the chain always holds the
+    ancestors of the builder in use. The ids are counted in dicts to check a loop in constant time.
+    The records of the conversions in progress to be cached are kept along the chain as well.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self._id_counts = {}
+        self._trace_counts = {}
+        self.records = []
+
+    def push(self, builder_id):
+        self.ids.append(builder_id)
+        if builder_id is not None:
+            self._id_counts[builder_id] = self._id_counts.get(builder_id, 0) + 1
+            trace_node = builder_id[0]
+            self._trace_counts[trace_node] = self._trace_counts.get(trace_node, 0) + 1
+
+    def pop(self):
+        builder_id = self.ids.pop()
+        if builder_id is not None:
+            self._decrease(self._id_counts, builder_id)
+            self._decrease(self._trace_counts, builder_id[0])
+
+    def count_trace(self, trace_node):
+        return self._trace_counts.get(trace_node, 0)
+
+    def __contains__(self, builder_id):
+        return builder_id in self._id_counts
+
+    @staticmethod
+    def _decrease(counts, key):
+        if counts[key] == 1:
+            del counts[key]
+        else:
+            counts[key] -= 1
+
+
+class _CMDSchemaRecord:
+    """The building context looked up while converting a swagger definition."""
+
+    def __init__(self):
+        self.trace_nodes = set()   # trace nodes searched in ancestors by `find_traces`
+        self.loop_ids = set()   # builder ids of definitions checked for reference loop
+        self.cls_names = set()   # cls definitions looked up
+        self.cls_counts = {}   # reference count increments of cls definitions
+        self.registered = set()   # cls definitions registered
+        self.failed = False
+
+    def merge(self, trace_nodes, loop_ids, cls_names, cls_counts, registered):
+        self.trace_nodes.update(trace_nodes)
+        self.loop_ids.update(loop_ids)
+        self.cls_names.update(cls_names)
+        for name, count in cls_counts.items():
+            self.cls_counts[name] = self.cls_counts.get(name, 0) + count
+        self.registered.update(registered)
+
+
+class _CMDSchemaCacheEntry:
+
+    _IN_LOOP = 'inLoop'
+
+    def __init__(self, schema, record, model, builder):
+        cls_definitions = builder.cls_definitions
+        self.schema = schema
+        # the building context is the same as it before the conversion, except the cls definitions registered inside
+        self.trace_nodes = {node: builder.ancestors.count_trace(node) > 0 for node in record.trace_nodes}
+        self.loop_ids = frozenset(record.loop_ids)
+        self.cls_states = {}
+        self.cls_counts = {}
+        outer_models = {}
+        registered = {}
+        for name in record.cls_names | record.registered:
+            if name in record.registered:
+                self.cls_states[name] = None
+                if name in cls_definitions:
+                    registered[name] = cls_definitions[name]
+            else:
+                self.cls_states[name] = self._get_cls_state(cls_definitions, name)
+                if name in cls_definitions and 'model' in cls_definitions[name]:
+                    outer_models[name] = cls_definitions[name]['model']
+        for name, count in record.cls_counts.items():
+            if name not in record.registered:
+                self.cls_counts[name] = count
+        self.outer_models = outer_models
+
+        # keep a copy, because the model will be updated by its parents
+        memo = {id(m): m for m in outer_models.values()}
+        self.model = _clone_cmd_model(model, memo)
+        self.registered = _clone_cmd_model(registered, memo)
+
+    def match(self, schema, builder):
+        if self.schema is not schema:
+            return False
+        ancestors = builder.ancestors
+        for builder_id in self.loop_ids:
+            if builder_id in ancestors:
+                return False
+        for node, in_ancestors in self.trace_nodes.items():
+            if (ancestors.count_trace(node) > 0) != in_ancestors:
+                return False
+        cls_definitions = builder.cls_definitions
+        for name, state in self.cls_states.items():
+            if self._get_cls_state(cls_definitions, name) != state:
+                return False
+        return True
+
+    def replay(self, builder):
+        cls_definitions = builder.cls_definitions
+        memo = {id(m): cls_definitions[name]['model'] for name, m in self.outer_models.items()}
+        model = _clone_cmd_model(self.model, memo)
+        cls_definitions.update(_clone_cmd_model(self.registered, memo))
+        for name, count in self.cls_counts.items():
+            cls_definitions[name]['count'] += count
+        if builder.ancestors.records:
+            builder.ancestors.records[-1].merge(
+                self.trace_nodes.keys(), self.loop_ids, self.cls_states.keys(), self.cls_counts, self.registered.keys())
+        return model
+
+    @classmethod
+    def _get_cls_state(cls, cls_definitions, name):
+        if name not in cls_definitions:
+            return None
+        if 'model' not in cls_definitions[name]:
+            return cls._IN_LOOP
+        return bool(cls_definitions[name]['model'].frozen)
+
+
+class CMDSchemaCache:
+    """Converted CMD schemas of swagger definitions, shared by the builders of a command generator.
+
+    A definition is converted differently when its reference loops are broken by the builders in chain, or when
+    the cls definitions it refers are registered already. So every conversion is recorded with the building context
+    it looked up, and a copy of the converted schema is reused, with the cls definitions it registered, only when
+    the context is not changed.
+    """
+
+    MAX_VARIANTS = 4
+
+    def __init__(self):
+        self._entries = {}
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+        }
+
+    def convert(self, builder, schema, **kwargs):
+        trace_node = getattr(schema, 'trace_node', None)
+        if kwargs or trace_node is None:
+            return builder(schema, **kwargs)
+        key = (trace_node, builder.mutability, builder.in_base, builder.frozen)
+        entries = self._entries.setdefault(key, [])
+        for entry in entries:
+            if entry.match(schema, builder):
+                self.stats['hits'] += 1
+                return entry.replay(builder)
+
+        self.stats['misses'] += 1
+        records = builder.ancestors.records
+        record = _CMDSchemaRecord()
+        records.append(record)
+        try:
+            model = builder(schema)
+        except Exception:
+            for r in records:
+                r.failed = True
+            raise
+        finally:
+            records.pop()
+
+        if not record.failed:
+            entries.insert(0, _CMDSchemaCacheEntry(schema, record, model, builder))
+            del entries[self.MAX_VARIANTS:]
+        if records:
+            records[-1].merge(
+                record.trace_nodes, record.loop_ids, record.cls_names, record.cls_counts, record.registered)
+        return model
+
+
+def _clone_cmd_model(value, memo):
+    """Copy the CMD models in value without converting the data again. The models in memo are replaced."""
+    if isinstance(value, Model):
+        copied = memo.get(id(value), None)
+        if copied is None:
+            copied = value.__class__.__new__(value.__class__)
+            memo[id(value)] = copied
+            for k, v in value.__dict__.items():
+                if k != '_data':
+                    copied.__dict__[k] = _clone_cmd_model(v, memo)
+            copied._data = ModelDict(converted={k: _clone_cmd_model(v, memo) for k, v in value._data.items()})
+        return copied
+    if isinstance(value, list):
+        return [_clone_cmd_model(v, memo) for v in value]
+    if isinstance(value, dict):
+        return {k: _clone_cmd_model(v, memo) for k, v in value.items()}
+    return value
+
+
 class CMDBuilder:
 
-    def __init__(self, path, method=None, mutability=None, in_base=False, frozen=False, parent_ids=None, cls_definitions=None):
+    def __init__(self, path, method=None, mutability=None, in_base=False, frozen=False, ancestors=None,
+                 cls_definitions=None, schema_cache=None):
         self.path = path
         self.method = method
         self.mutability = mutability
@@ -47,8 +250,17 @@ class CMDBuilder:
         self.frozen = frozen
         self.read_only = False
         self.id = None    # used to find loop
-        self.parent_ids = parent_ids or []
+        if ancestors is None:
+            ancestors = _BuilderAncestors()
+            ancestors.push(self.id)
+        self.ancestors = ancestors
+        self._depth = len(ancestors.ids)
         self.cls_definitions = {} if cls_definitions is None else cls_definitions
+        self.schema_cache = CMDSchemaCache() if schema_cache is None else schema_cache
+
+    @property
+    def parent_ids(self):
+        return self.ancestors.ids[:self._depth]
 
     def __call__(self, schema, **kwargs):
         sub_builder = CMDBuilder(
@@ -57,8 +269,9 @@ class CMDBuilder:
             mutability=kwargs.pop('mutability', self.mutability),
             in_base=kwargs.pop('in_base', self.in_base),
             frozen=kwargs.pop('frozen', self.frozen),
-            parent_ids=[*self.parent_ids, self.id],
+            ancestors=self.ancestors,
             cls_definitions=kwargs.pop('cls_definitions', self.cls_definitions),
+            schema_cache=self.schema_cache,
         )
         if getattr(schema, 'read_only', None):
             sub_builder.read_only = True
@@ -69,27 +282,34 @@ class CMDBuilder:
             elif getattr(schema, 'x_ms_mutability', None):
                 if self.mutability not in schema.x_ms_mutability:
                     sub_builder.frozen = True
-        if hasattr(schema, 'traces'):
-            sub_builder.id = (schema.traces, sub_builder.mutability, sub_builder.frozen)
-            if sub_builder.id in sub_builder.parent_ids:
-                if len(schema.traces) == 3:
+        trace_node = getattr(schema, 'trace_node', None)
+        if trace_node is not None:
+            sub_builder.id = (trace_node, sub_builder.mutability, sub_builder.frozen)
+            if trace_node.depth == 3 and self.ancestors.records:
+                self.ancestors.records[-1].loop_ids.add(sub_builder.id)
+            if sub_builder.id in self.ancestors:
+                if trace_node.depth == 3:
                     # make sure the trace is reference definition, the trace should be [file_path, 'definitions', name]
                     raise exceptions.InvalidSwaggerValueError(
                             msg="Find invalid reference loop",
-                            key=sub_builder.id,
-                            value=sub_builder.parent_ids.index(sub_builder.id),
+                            key=(trace_node.traces, sub_builder.mutability, sub_builder.frozen),
+                            value=self.ancestors.ids.index(sub_builder.id),
                         )
-        return schema.to_cmd(sub_builder, **kwargs)
-
-    def find_traces(self, traces):
-        assert traces is not None
-        for parent_id in self.parent_ids:
-            if parent_id is None:
-                continue
-            parent_traces, mutability, frozen = parent_id
-            if parent_traces == traces:
-                return True
-        return False
+        self.ancestors.push(sub_builder.id)
+        try:
+            return schema.to_cmd(sub_builder, **kwargs)
+        finally:
+            self.ancestors.pop()
+
+    def find_traces(self, trace_node):
+        assert trace_node is not None
+        if self.ancestors.records:
+            self.ancestors.records[-1].trace_nodes.add(trace_node)
+        count = self.ancestors.count_trace(trace_node)
+        if self.id is not None and self.id[0] is trace_node:
+            # exclude the builder itself
+            count -= 1
+        return count > 0
 
     def build_schema(self, schema):
         schema_type = getattr(schema, 'type', None)
@@ -248,14 +468,20 @@ class CMDBuilder:
                 model.frozen = self.frozen
                 model._type = f"@{name}"
             else:
-                model = self(schema.ref_instance, **kwargs)
+                model = self.schema_cache.convert(self, schema.ref_instance, **kwargs)
             return model
 
+        record = self.ancestors.records[-1] if self.ancestors.records else None
+        if record is not None:
+            record.cls_names.add(name)
+
         if name not in self.cls_definitions:
             if support_cls_schema:
                 # register in cls_definitions first in case of loop reference below
                 self.cls_definitions[name] = {"count": 1}
-                model = self(schema.ref_instance, **kwargs)
+                if record is not None:
+                    record.registered.add(name)
+                model = self.schema_cache.convert(self, schema.ref_instance, **kwargs)
                 if isinstance(model, (CMDObjectSchemaBase, CMDArraySchemaBase)):
                     # Important: only support object and array schema to defined as cls
                     # when self.cls_definitions[name]['count'] > 1, the loop reference exist
@@ -263,10 +489,12 @@ class CMDBuilder:
                 else:
                     del self.cls_definitions[name]
             else:
-                model = self(schema.ref_instance, **kwargs)
+                model = self.schema_cache.convert(self, schema.ref_instance, **kwargs)
         else:
             if support_cls_schema:
                 self.cls_definitions[name]['count'] += 1
+                if record is not None:
+                    record.cls_counts[name] = record.cls_counts.get(name, 0) + 1
                 if self.in_base:
                     model = CMDClsSchemaBase()
                 else:
@@ -288,7 +516,7 @@ class CMDBuilder:
                         key=schema.traces,
                         value=name
                     )
-                model = self(schema.ref_instance, **kwargs)
+                model = self.schema_cache.convert(self, schema.ref_instance, **kwargs)
         return model
 
     def get_cls_definition_model(self, model):
@@ -71,7 +71,7 @@ class Operation(Model, Linkable):
         if self.parameters is not None:
             for idx, param in enumerate(self.parameters):
                 if isinstance(param, Linkable):
-                    param.link(swagger_loader, *self.traces, 'parameters', idx)
+                    param.link(swagger_loader, self.trace_node, 'parameters', idx)
 
             # replace parameter reference by parameter instance
             for idx in range(len(self.parameters)):
@@ -85,20 +85,20 @@ class Operation(Model, Linkable):
 
         # verify path is resource id template or not
         resource_id_template = None
-        if self.traces[-1] == 'get':
+        if self.trace_node.segment == 'get':
             # path should support get method
-            resource_path = self.traces[-2]
+            resource_path = self.trace_node.parent.segment
             resource_id_template = swagger_resource_path_to_resource_id_template(resource_path)
 
         for key, response in self.responses.items():
             if resource_id_template and key != "default" and int(key) < 300:
                 response.link(
-                    swagger_loader, *self.traces, 'responses', key,
+                    swagger_loader, self.trace_node, 'responses', key,
                     resource_id_template=resource_id_template
                 )
             else:
                 response.link(
-                    swagger_loader, *self.traces, 'responses', key
+                    swagger_loader, self.trace_node, 'responses', key
                 )
 
         # replace response reference by response instance
@@ -116,10 +116,10 @@ class Operation(Model, Linkable):
             self.responses[key] = resp
 
         if self.x_ms_odata is not None:
-            self.x_ms_odata_instance, instance_traces = swagger_loader.load_ref(
-                self.x_ms_odata, *self.traces, 'x_ms_odata')
+            self.x_ms_odata_instance, instance_trace_node = swagger_loader.load_ref(
+                self.x_ms_odata, self.trace_node, 'x_ms_odata')
             if isinstance(self.x_ms_odata_instance, Linkable):
-                self.x_ms_odata_instance.link(swagger_loader, *instance_traces)
+                self.x_ms_odata_instance.link(swagger_loader, instance_trace_node)
 
         if self.x_ms_long_running_operation_options is not None and \
                 self.x_ms_long_running_operation_options.final_state_schema is not None:
@@ -128,7 +128,7 @@ class Operation(Model, Linkable):
             self.x_ms_lro_final_state_schema.ref = self.x_ms_long_running_operation_options.final_state_schema
             self.x_ms_lro_final_state_schema.link(
                 swagger_loader,
-                *self.traces, "x_ms_long_running_operation_options", "final_state_schema"
+                self.trace_node, "x_ms_long_running_operation_options", "final_state_schema"
             )
 
     def to_cmd(self, builder, parent_parameters, **kwargs):
@@ -191,7 +191,7 @@ class BodyParameter(ParameterBase, Linkable):
             return
         super().link(swagger_loader, *traces)
 
-        self.schema.link(swagger_loader, *self.traces, 'schema')
+        self.schema.link(swagger_loader, self.trace_node, 'schema')
 
     def to_cmd(self, builder, **kwargs):
         v = builder(self.schema, in_base=False, support_cls_schema=True)
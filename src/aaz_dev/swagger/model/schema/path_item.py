@@ -29,7 +29,7 @@ class PathItem(Model, Linkable):
         if self.parameters is not None:
             for idx, param in enumerate(self.parameters):
                 if isinstance(param, Linkable):
-                    param.link(swagger_loader, *self.traces, 'parameters', idx)
+                    param.link(swagger_loader, self.trace_node, 'parameters', idx)
 
             # replace parameter reference by parameter instance
             for idx in range(len(self.parameters)):
@@ -40,17 +40,17 @@ class PathItem(Model, Linkable):
                 self.parameters[idx] = param
 
         if self.get is not None:
-            self.get.link(swagger_loader, *self.traces, 'get')
+            self.get.link(swagger_loader, self.trace_node, 'get')
         if self.put is not None:
-            self.put.link(swagger_loader, *self.traces, 'put')
+            self.put.link(swagger_loader, self.trace_node, 'put')
         if self.post is not None:
-            self.post.link(swagger_loader, *self.traces, 'post')
+            self.post.link(swagger_loader, self.trace_node, 'post')
         if self.delete is not None:
-            self.delete.link(swagger_loader, *self.traces, 'delete')
+            self.delete.link(swagger_loader, self.trace_node, 'delete')
         if self.head is not None:
-            self.head.link(swagger_loader, *self.traces, 'head')
+            self.head.link(swagger_loader, self.trace_node, 'head')
         if self.patch is not None:
-            self.patch.link(swagger_loader, *self.traces, 'patch')
+            self.patch.link(swagger_loader, self.trace_node, 'patch')
 
     def to_cmd(self, builder, **kwargs):
         op = getattr(self, builder.method, None)
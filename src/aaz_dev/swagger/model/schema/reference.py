@@ -1,13 +1,94 @@
+import itertools
+import weakref
+
 from schematics.models import Model
 from schematics.types import StringType
 from uuid import uuid4
 
 
+class TraceNode:
+    """Interned node of a reference trace, such as (file_path, 'definitions', 'Foo', 'properties', 'name').
+
+    The root node is interned by the file path and every other node is interned by its parent node and the
+    JSON-pointer segment, so the equal traces are always the same node. A node is hashed by its integer id and compared
+    by identity, which keeps the lookup cost constant no matter how deep the trace is.
+    """
+
+    __slots__ = ('id', 'parent', 'segment', 'depth', '_children', '__weakref__')
+
+    _ids = itertools.count()
+    # a root node is kept alive by the nodes under it
+    _roots = weakref.WeakValueDictionary()
+
+    def __init__(self, parent, segment):
+        assert isinstance(segment, (str, int))
+        self.id = next(self._ids)
+        self.parent = parent
+        self.segment = segment
+        self.depth = 1 if parent is None else parent.depth + 1
+        self._children = {}
+
+    @classmethod
+    def intern(cls, *traces):
+        """Return the node of the traces. The first element is either a file path or a node to extend."""
+        assert len(traces) > 0
+        node = traces[0]
+        if not isinstance(node, TraceNode):
+            root = cls._roots.get(node, None)
+            if root is None:
+                root = cls._roots.setdefault(node, cls(None, node))
+            node = root
+        for segment in traces[1:]:
+            node = node.child(segment)
+        return node
+
+    @classmethod
+    def lookup(cls, *traces):
+        """Return the node of the traces if it has been interned, otherwise None."""
+        assert len(traces) > 0
+        node = traces[0]
+        if not isinstance(node, TraceNode):
+            node = cls._roots.get(node, None)
+        for segment in traces[1:]:
+            if node is None:
+                break
+            node = node._children.get(segment, None)
+        return node
+
+    def child(self, segment):
+        node = self._children.get(segment, None)
+        if node is None:
+            node = self._children.setdefault(segment, TraceNode(self, segment))
+        return node
+
+    @property
+    def file_path(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node.segment
+
+    @property
+    def traces(self):
+        segments = []
+        node = self
+        while node is not None:
+            segments.append(node.segment)
+            node = node.parent
+        return tuple(reversed(segments))
+
+    def __hash__(self):
+        return self.id
+
+    def __repr__(self):
+        return repr(self.traces)
+
+
 class Linkable:
 
     def __init__(self):
         self._linked = False
-        self.traces = None
+        self.trace_node = None
         self._random_uuid = uuid4()
 
     def is_linked(self):
@@ -15,12 +96,16 @@ class Linkable:
             self._linked = False
         return self._linked
 
+    @property
+    def traces(self):
+        trace_node = getattr(self, 'trace_node', None)
+        if trace_node is None:
+            return None
+        return trace_node.traces
+
     def link(self, swagger_loader, *traces, **kwargs):
         self._linked = True
-        assert len(traces) > 0
-        self.traces = tuple(traces)
-        for trace in self.traces:
-            assert isinstance(trace, (str, int))
+        self.trace_node = TraceNode.intern(*traces)
 
     def __hash__(self):
         return hash(self._random_uuid)
@@ -51,9 +136,9 @@ class Reference(Model, Linkable):
             return
         super().link(swagger_loader, *traces, **kwargs)
 
-        self.ref_instance, instance_traces = swagger_loader.load_ref(self.ref, *self.traces, 'ref')
+        self.ref_instance, instance_trace_node = swagger_loader.load_ref(self.ref, self.trace_node, 'ref')
         if isinstance(self.ref_instance, Linkable):
-            self.ref_instance.link(swagger_loader, *instance_traces, **kwargs)
+            self.ref_instance.link(swagger_loader, instance_trace_node, **kwargs)
 
     @classmethod
     def _claim_polymorphic(cls, data):
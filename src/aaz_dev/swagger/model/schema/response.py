@@ -37,7 +37,7 @@ class Response(Model, Linkable):
         super().link(swagger_loader, *traces)
 
         if self.schema is not None:
-            self.schema.link(swagger_loader, *self.traces, 'schema')
+            self.schema.link(swagger_loader, self.trace_node, 'schema')
 
         # assign resource id template to the schema and it's ref instance
         resource_id_template = kwargs.get('resource_id_template', None)
@@ -85,9 +85,9 @@ class ReferenceSchema(Model, Linkable):
             return
         super().link(swagger_loader, *traces)
 
-        self.ref_instance, instance_traces = swagger_loader.load_ref(self.ref, *self.traces, 'ref')
+        self.ref_instance, instance_trace_node = swagger_loader.load_ref(self.ref, self.trace_node, 'ref')
         if isinstance(self.ref_instance, Linkable):
-            self.ref_instance.link(swagger_loader, *instance_traces)
+            self.ref_instance.link(swagger_loader, instance_trace_node)
         if self.ref_instance.x_ms_azure_resource:
             self.x_ms_azure_resource = True
 
@@ -290,38 +290,38 @@ class Schema(Model, Linkable):
         super().link(swagger_loader, *traces)
 
         if self.ref is not None:
-            self.ref_instance, instance_traces = swagger_loader.load_ref(self.ref, *self.traces, 'ref')
+            self.ref_instance, instance_trace_node = swagger_loader.load_ref(self.ref, self.trace_node, 'ref')
             if isinstance(self.ref_instance, Linkable):
-                self.ref_instance.link(swagger_loader, *instance_traces)
+                self.ref_instance.link(swagger_loader, instance_trace_node)
             if self.ref_instance.x_ms_azure_resource:
                 self.x_ms_azure_resource = True
 
         if self.items is not None:
             if isinstance(self.items, list):
                 for idx, item in enumerate(self.items):
-                    item.link(swagger_loader, *self.traces, 'items', idx)
+                    item.link(swagger_loader, self.trace_node, 'items', idx)
             else:
-                self.items.link(swagger_loader, *self.traces, 'items')
+                self.items.link(swagger_loader, self.trace_node, 'items')
 
         if self.properties is not None:
             for key, prop in self.properties.items():
-                prop.link(swagger_loader, *self.traces, 'properties', key)
+                prop.link(swagger_loader, self.trace_node, 'properties', key)
 
         if self.additional_properties is not None and isinstance(self.additional_properties, (Schema, ReferenceSchema)):
-            self.additional_properties.link(swagger_loader, *self.traces, 'additionalProperties')
+            self.additional_properties.link(swagger_loader, self.trace_node, 'additionalProperties')
 
         if self.all_of is not None:
             for idx, item in enumerate(self.all_of):
-                item.link(swagger_loader, *self.traces, 'allOf', idx)
+                item.link(swagger_loader, self.trace_node, 'allOf', idx)
                 if item.x_ms_azure_resource:
                     self.x_ms_azure_resource = True
 
         self._link_disc()
         if self.type and self.type != "object" and self.all_of:
             if len(self.all_of) > 1:
-                print(f"\tMultiAllOf for {self.type}: {traces}")
+                print(f"\tMultiAllOf for {self.type}: {self.traces}")
             else:
-                print(f"\tAllOf for {self.type}: {traces}")
+                print(f"\tAllOf for {self.type}: {self.traces}")
 
     def _link_disc(self):
         if self.all_of is None:
@@ -338,8 +338,8 @@ class Schema(Model, Linkable):
 
                 if self.x_ms_discriminator_value is not None:
                     disc_value = self.x_ms_discriminator_value
-                elif len(self.traces) > 2 and self.traces[-2] == 'definitions':
-                    disc_value = self.traces[-1]  # use the definition name as discriminator value
+                elif self.trace_node.depth > 2 and self.trace_node.parent.segment == 'definitions':
+                    disc_value = self.trace_node.segment  # use the definition name as discriminator value
                 else:
                     # Discriminator value is empty. Its not a discriminator
                     logger.warning(f"Discriminator value is empty. : {self.traces}")
@@ -394,7 +394,7 @@ class Schema(Model, Linkable):
                 # inherit from allOf
                 for item in self.all_of:
                     disc_parent = item.get_disc_parent()
-                    if disc_parent is not None and builder.find_traces(item.ref_instance.traces):
+                    if disc_parent is not None and builder.find_traces(item.ref_instance.trace_node):
                         # discriminator parent already in trace, break reference loop
                         continue
                     v = builder(item, in_base=True, support_cls_schema=False)
@@ -406,7 +406,7 @@ class Schema(Model, Linkable):
                         for p in v.props:
                             prop_dict[p.name] = p
 
-                    if disc_parent is not None and not builder.find_traces(disc_parent.traces):
+                    if disc_parent is not None and not builder.find_traces(disc_parent.trace_node):
                         # directly use child definition instead of polymorphism.
                         # So the value for discriminator property is const.
                         is_children = False
@@ -455,7 +455,7 @@ class Schema(Model, Linkable):
                 assert self.discriminator is not None
                 disc_prop = self.discriminator
                 for disc_value, disc_child in self.disc_children.items():
-                    if builder.find_traces(disc_child.traces):
+                    if builder.find_traces(disc_child.trace_node):
                         # discriminator child already in trace, break reference loop
                         continue
                     disc = CMDObjectSchemaDiscriminator()
@@ -64,24 +64,24 @@ class Swagger(Model, Linkable):
 
         if self.paths is not None:
             for key, path in self.paths.items():
-                path.link(swagger_loader, *self.traces, 'paths', key)
+                path.link(swagger_loader, self.trace_node, 'paths', key)
 
         if self.definitions is not None:
             for key, definition in self.definitions.items():
-                definition.link(swagger_loader, *self.traces, 'definitions', key)
+                definition.link(swagger_loader, self.trace_node, 'definitions', key)
 
         if self.parameters is not None:
             for key, param in self.parameters.items():
                 if isinstance(param, Linkable):
-                    param.link(swagger_loader, *self.traces, 'parameters', key)
+                    param.link(swagger_loader, self.trace_node, 'parameters', key)
 
         if self.responses is not None:
             for key, response in self.responses.items():
-                response.link(swagger_loader, *self.traces, 'responses', key)
+                response.link(swagger_loader, self.trace_node, 'responses', key)
 
         if self.x_ms_paths is not None:
             for key, path in self.x_ms_paths.items():
-                path.link(swagger_loader, *self.traces, 'x_ms_paths', key)
+                path.link(swagger_loader, self.trace_node, 'x_ms_paths', key)
 
         if self.x_ms_parameterized_host is not None:
-            self.x_ms_parameterized_host.link(swagger_loader, *self.traces, 'x_ms_parameterized_host')
+            self.x_ms_parameterized_host.link(swagger_loader, self.trace_node, 'x_ms_parameterized_host')
@@ -37,7 +37,7 @@ class XmsParameterizedHost(Model, Linkable):
         if self.parameters is not None:
             for idx, param in enumerate(self.parameters):
                 if isinstance(param, Linkable):
-                    param.link(swagger_loader, *self.traces, 'parameters', idx)
+                    param.link(swagger_loader, self.trace_node, 'parameters', idx)
 
             # replace parameter reference by parameter instance
             for idx in range(len(self.parameters)):
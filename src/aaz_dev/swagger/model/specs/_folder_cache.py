@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+
+
+class FolderListingCache:
+    """Process-wide memo of the folder listings in swagger specs.
+
+    Every folder is listed by a single `os.scandir` call, and the listing is reused until the folder's mtime is changed
+    when `check_mtime` is enabled, which happens when any entry is added, removed or renamed in the folder.
+    """
+
+    _RACY_NS = 2 * 10 ** 9
+
+    def __init__(self, check_mtime=True):
+        self.check_mtime = check_mtime
+        self._listings = {}
+        self._lock = threading.Lock()
+
+    def list(self, path):
+        """Return an ordered dict of entry name to whether it is a directory. Empty for a not existed folder."""
+        path = os.path.normpath(path)
+        cached = self._listings.get(path, None)
+        if cached is not None:
+            mtime, listing, racy = cached
+            if not self.check_mtime:
+                return listing
+            if not racy and self._mtime(path) == mtime:
+                return listing
+
+        scan_time = time.time_ns()
+        mtime = self._mtime(path)
+        if mtime is None:
+            with self._lock:
+                self._listings.pop(path, None)
+            return {}
+        listing = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    listing[entry.name] = entry.is_dir()
+        except OSError:
+            return {}
+        # the folder can be changed again without updating its mtime within the timestamp granularity,
+        # so the listing of a folder modified just before scanning should be scanned again.
+        racy = scan_time - mtime < self._RACY_NS
+        with self._lock:
+            self._listings[path] = (mtime, listing, racy)
+        return listing
+
+    def list_dirs(self, path):
+        return [name for name, is_dir in self.list(path).items() if is_dir]
+
+    def is_dir(self, path):
+        return self._lookup(path) is True
+
+    def is_file(self, path):
+        return self._lookup(path) is False
+
+    def _lookup(self, path):
+        """Return whether the entry of path is a directory, or None if it's not existed."""
+        path = os.path.normpath(path)
+        listing = self.list(os.path.dirname(path))
+        name = os.path.basename(path)
+        is_dir = listing.get(name, None)
+        if is_dir is None:
+            # the names in listing are matched exactly, while the file system can be case-insensitive such as on
+            # Windows and macOS, so the entries only different in case are checked by the file system.
+            name = name.casefold()
+            if any(entry.casefold() == name for entry in listing):
+                if os.path.isdir(path):
+                    return True
+                if os.path.isfile(path):
+                    return False
+        return is_dir
+
+    def clear(self):
+        with self._lock:
+            self._listings.clear()
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+
+folder_listing_cache = FolderListingCache()
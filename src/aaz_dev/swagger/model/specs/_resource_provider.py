@@ -1,5 +1,4 @@
 import datetime
-import json
 import logging
 import os
 import re
@@ -8,13 +7,19 @@ from collections import OrderedDict
 import yaml
 
 from swagger.utils.tools import swagger_resource_path_to_resource_id
+from utils.config import Config
+from utils.fork_pool import can_fork, run_in_forked_processes
 from ._resource import Resource, ResourceVersion
+from ._swagger_index import SwaggerFileIndex, load_swagger_file_summary
 from ._utils import map_path_2_repo
 
 logger = logging.getLogger('backend')
 
 
 class ResourceProvider:
+    _RE_README_YAML = re.compile(
+        r'```\s*yaml\s*(.*\$\(\s*tag\s*\)\s*==\s*[\'"]\s*(.*)\s*[\'"].*)?\n((((?!```).)*\n)*)```\s*\n',
+        flags=re.MULTILINE)
 
     def __init__(self, name, folder_path, readme_path, swagger_module):
         self.name = name
@@ -25,43 +30,73 @@ class ResourceProvider:
         if readme_path is None:
             logger.warning(f"MissReadmeFile: {self} : {map_path_2_repo(folder_path)}")
         self._tags = None
+        self._file_latest_tags = None
         self._resource_map = None
+        # the stats of readme file and of the folders and swagger files which the cached tags and resource map are
+        # built from
+        self._readme_stat = None
+        self._resource_map_stats = None
+        self._index = SwaggerFileIndex(folder_path)
         self._ignore_resources = {f'/providers/{self.name}/operations'.lower(), }
 
     def __str__(self):
         return f'{self.swagger_module}/ResourceProviders/{self.name}'
 
-    def get_resource_map(self, refresh=False):
-        if refresh or not self._resource_map:
-            resource_map = {}
+    def get_resource_map(self, refresh=False, workers=None):
+        resource_map = self._resource_map
+        if refresh or not resource_map:
+            file_paths = []
+            # the folder's mtime is changed when a file is added or removed in it
+            stats = {}
             for root, dirs, files in os.walk(self.folder_path):
                 if 'example' in root:
                     continue
+                stats[root] = self._stat(root)
                 for file in files:
                     if not file.endswith('.json'):
                         continue
                     file_path = os.path.join(root, file)
-                    for resource in self._parse_resources_in_file(file_path):
-                        if resource.id in self._ignore_resources:
-                            continue
-                        if resource.id not in resource_map:
-                            resource_map[resource.id] = {}
-                        if self._replace_current_resource(
-                                curr_resource=resource_map[resource.id].get(resource.version, None),
-                                resource=resource
-                        ):
-                            resource_map[resource.id][resource.version] = resource
-            self._resource_map = resource_map
-        resource_map = self._resource_map
+                    file_paths.append(file_path)
+                    stats[file_path] = self._stat(file_path)
+            resource_map = self._build_resource_map(file_paths, workers=workers)
+            self._resource_map, self._resource_map_stats = resource_map, stats
         return resource_map
 
-    def get_resource_map_by_tag(self, tag):
-        resource_map = {}
+    def is_changed(self):
+        """Whether the readme file or the swagger files which the cached tags and resource map are built from are
+        changed."""
+        if self._tags is not None and self._readme_path is not None and \
+                self._stat(self._readme_path) != self._readme_stat:
+            return True
+        stats = self._resource_map_stats
+        if self._resource_map is not None and stats is not None:
+            for path, stat in stats.items():
+                if self._stat(path) != stat:
+                    return True
+        return False
+
+    def reset(self):
+        """Drop the cached tags and resource map."""
+        self._tags = None
+        self._file_latest_tags = None
+        self._resource_map = None
+        self._readme_stat = None
+        self._resource_map_stats = None
+
+    def get_resource_map_by_tag(self, tag, workers=None):
         if tag not in self.tags:
             logger.error(f"Tag: `{tag}` is not exist")
-            return resource_map
+            return {}
 
-        for file_path in self.tags[tag]:
+        # sort file paths to make sure the duplicated resources are resolved in a deterministic order
+        return self._build_resource_map(sorted(self.tags[tag]), workers=workers)
+
+    def _build_resource_map(self, file_paths, workers=None):
+        self._load_file_summaries(file_paths, workers=workers)
+
+        # merge resources in the order of file paths, so that the result is the same as the serial parsing
+        resource_map = {}
+        for file_path in file_paths:
             for resource in self._parse_resources_in_file(file_path):
                 if resource.id in self._ignore_resources:
                     continue
@@ -72,39 +107,62 @@ class ResourceProvider:
                         resource=resource
                 ):
                     resource_map[resource.id][resource.version] = resource
+        self._index.save()
         return resource_map
 
+    def _load_file_summaries(self, file_paths, workers=None):
+        """Parse the swagger files which are not in index across forked worker processes.
+
+        The files are parsed lazily in current process by default, unless the workers are set by argument or
+        `AAZ_SWAGGER_PARSE_WORKERS`. They're never parsed in workers when the process cannot be forked safely, such
+        as in the threaded web server or in another worker process.
+        """
+        if workers is None:
+            workers = Config.SWAGGER_PARSE_WORKERS
+        file_paths = [file_path for file_path in file_paths if self._index.get(file_path) is None]
+        if workers <= 1 or len(file_paths) <= 1 or not can_fork():
+            return
+        summaries = run_in_forked_processes(
+            [(load_swagger_file_summary, (file_path, )) for file_path in file_paths], workers)
+        for file_path, summary in zip(file_paths, summaries):
+            self._index.update(file_path, summary)
+
     @property
     def tags(self):
-        if self._tags is None:
-            self._tags = self._parse_readme_input_file_tags()
-        return self._tags
+        tags = self._tags
+        if tags is None:
+            readme_stat = None if self._readme_path is None else self._stat(self._readme_path)
+            tags = self._parse_readme_input_file_tags()
+            self._tags, self._readme_stat = tags, readme_stat
+        return tags
+
+    @property
+    def file_latest_tags(self):
+        """The reverse index of tags, which maps file path to the latest tag using it."""
+        file_latest_tags = self._file_latest_tags
+        if file_latest_tags is None:
+            file_latest_tags = {}
+            # tags are sorted by date in descending order
+            for tag, file_set in self.tags.items():
+                for file_path in file_set:
+                    file_latest_tags.setdefault(file_path, tag)
+            self._file_latest_tags = file_latest_tags
+        return file_latest_tags
 
     def _parse_readme_input_file_tags(self):
         tags = {}
         if self._readme_path is None:
             return tags
 
-        with open(self._readme_path, 'r', encoding='utf-8') as f:
-            readme = f.read()
-
-        re_yaml = re.compile(
-            r'```\s*yaml\s*(.*\$\(\s*tag\s*\)\s*==\s*[\'"]\s*(.*)\s*[\'"].*)?\n((((?!```).)*\n)*)```\s*\n',
-            flags=re.MULTILINE)
-        for piece in re_yaml.finditer(readme):
-            flags = piece[1]
-            yaml_body = piece[3]
-            if 'input-file' not in yaml_body:
-                continue
-
-            try:
-                body = yaml.safe_load(yaml_body)
-            except yaml.YAMLError as err:
-                logger.error(f'ParseYamlFailed: {self} : {self._readme_path} {flags}: {err}')
-                continue
+        readme_tags = self._index.get_readme_tags(self._readme_path)
+        if readme_tags is None:
+            readme_tags = self._parse_readme_input_file_blocks()
+            self._index.update_readme_tags(self._readme_path, readme_tags)
+            self._index.save()
 
+        for tag, input_files in readme_tags:
             files = []
-            for file_path in body['input-file']:
+            for file_path in input_files:
                 file_path = file_path.replace('$(this-folder)/', '')
                 file_path = os.path.join(os.path.dirname(self._readme_path), *file_path.split('/'))
                 if not os.path.isfile(file_path):
@@ -113,10 +171,7 @@ class ResourceProvider:
                 files.append(file_path)
 
             if len(files):
-                tag = piece[2]
-                if tag is None:
-                    tag = ''
-                tag = ResourceProviderTag(tag.strip(), self)
+                tag = ResourceProviderTag(tag, self)
                 if tag not in tags:
                     tags[tag] = set()
                 tags[tag] = tags[tag].union(files)
@@ -126,11 +181,32 @@ class ResourceProvider:
         tags = OrderedDict(tags)
         return tags
 
+    def _parse_readme_input_file_blocks(self):
+        """Parse the yaml code blocks with input-file in readme, returns a list of [tag, input files]."""
+        with open(self._readme_path, 'r', encoding='utf-8') as f:
+            readme = f.read()
+
+        blocks = []
+        for piece in self._RE_README_YAML.finditer(readme):
+            flags = piece[1]
+            yaml_body = piece[3]
+            if 'input-file' not in yaml_body:
+                continue
+
+            try:
+                body = yaml.safe_load(yaml_body)
+            except yaml.YAMLError as err:
+                logger.error(f'ParseYamlFailed: {self} : {self._readme_path} {flags}: {err}')
+                continue
+
+            tag = piece[2]
+            if tag is None:
+                tag = ''
+            blocks.append([tag.strip(), body['input-file']])
+        return blocks
+
     def _fetch_latest_tag(self, file_path):
-        for tag, file_set in self.tags.items():
-            if file_path in file_set:
-                return tag
-        return None
+        return self.file_latest_tags.get(file_path, None)
 
     def _replace_current_resource(self, curr_resource, resource):
         if curr_resource is None:
@@ -183,22 +259,20 @@ class ResourceProvider:
     def _parse_resources_in_file(self, file_path):
         resources = []
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            body = json.load(f)
+        summary = self._load_file_summary(file_path)
 
         # check swagger version
-        swagger_version = body.get('swagger', None)
+        swagger_version = summary['swagger']
         if swagger_version != '2.0':
             logger.error(f'InvalidSwaggerFile: {self} : invalid swagger version {swagger_version} in file {file_path}')
             return resources
 
         # fetch api-version
-        info = body.get('info', {})
-        version = info.get('version', None)
+        version = summary['version']
         if not version:
             logger.error(f'InvalidSwaggerFile: {self} : invalid info version {version} in file {file_path}')
 
-        for path, value in body.get('paths', {}).items():
+        for path, value in summary['paths'].items():
             resource = Resource(
                 resource_id=swagger_resource_path_to_resource_id(path),
                 path=path, version=version, file_path=file_path, resource_provider=self, body=value)
@@ -206,7 +280,7 @@ class ResourceProvider:
 
         # x-ms-paths:
         #   alternative to Paths Object that allows Path Item Object to have query parameters for non pure REST APIs
-        for path, value in body.get('x-ms-paths', {}).items():
+        for path, value in summary['x-ms-paths'].items():
             resource = Resource(
                 resource_id=swagger_resource_path_to_resource_id(path),
                 path=path, version=version, file_path=file_path, resource_provider=self, body=value)
@@ -214,6 +288,21 @@ class ResourceProvider:
 
         return resources
 
+    def _load_file_summary(self, file_path):
+        summary = self._index.get(file_path)
+        if summary is None:
+            summary = load_swagger_file_summary(file_path)
+            self._index.update(file_path, summary)
+        return summary
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
 
 class ResourceProviderTag:
 
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import os
+
+from utils.config import Config
+from ._swagger_scanner import scan_swagger_top_level
+
+logger = logging.getLogger('backend')
+
+
+class SwaggerFileIndex:
+    """Persistent index of the swagger file summaries and readme tags used by a resource provider.
+
+    Every swagger file or readme file is keyed by its path and the cached value is reused as long as the file's mtime
+    and size are not changed, so a warm start only re-parses the files that changed.
+    """
+
+    VERSION = 2
+    FOLDER_NAME = 'swagger_index'
+
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self._data = None
+        self._dirty = False
+
+    @property
+    def index_path(self):
+        key = hashlib.sha1(os.path.normpath(self.folder_path).encode('utf-8')).hexdigest()
+        return os.path.join(Config.AAZ_DEV_FOLDER, self.FOLDER_NAME, f'{key}.json')
+
+    @property
+    def files(self):
+        return self._get_section('files')
+
+    @property
+    def readmes(self):
+        return self._get_section('readmes')
+
+    def get(self, file_path):
+        return self._get_entry(self.files, file_path, 'summary')
+
+    def update(self, file_path, summary):
+        self._update_entry(self.files, file_path, 'summary', summary)
+
+    def get_readme_tags(self, readme_path):
+        return self._get_entry(self.readmes, readme_path, 'tags')
+
+    def update_readme_tags(self, readme_path, tags):
+        self._update_entry(self.readmes, readme_path, 'tags', tags)
+
+    def save(self):
+        if not self._dirty:
+            return
+        index_path = self.index_path
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        # remove the entries of deleted files
+        sections = {
+            name: {k: v for k, v in section.items() if os.path.isfile(k)}
+            for name, section in self._data.items()
+        }
+        data = {
+            'version': self.VERSION,
+            'folderPath': self.folder_path,
+            **sections,
+        }
+        tmp_path = f'{index_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, index_path)
+        except OSError as err:
+            logger.warning(f'SaveSwaggerIndexFailed: {index_path} : {err}')
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._data = sections
+        self._dirty = False
+
+    def _get_section(self, name):
+        if self._data is None:
+            self._data = self._load()
+        if name not in self._data:
+            self._data[name] = {}
+        return self._data[name]
+
+    def _get_entry(self, section, file_path, key):
+        entry = section.get(file_path, None)
+        if entry is None:
+            return None
+        stat = self._stat(file_path)
+        if stat is None or entry.get('stat', None) != stat:
+            return None
+        return entry[key]
+
+    def _update_entry(self, section, file_path, key, value):
+        stat = self._stat(file_path)
+        if stat is None:
+            return
+        section[file_path] = {
+            'stat': stat,
+            key: value,
+        }
+        self._dirty = True
+
+    def _load(self):
+        index_path = self.index_path
+        if not os.path.isfile(index_path):
+            return {}
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as err:
+            logger.warning(f'LoadSwaggerIndexFailed: {index_path} : {err}')
+            return {}
+        if not isinstance(data, dict) or data.get('version', None) != self.VERSION or \
+                data.get('folderPath', None) != self.folder_path:
+            return {}
+        return {name: data.get(name, {}) for name in ('files', 'readmes')}
+
+    @staticmethod
+    def _stat(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+
+def load_swagger_file_summary(file_path):
+    """Load a swagger file and extract its summary. Keep it at module level to be picklable by worker processes."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = f.read()
+    # only decode the fields used in summary, `definitions` and other fields are skipped
+    body = scan_swagger_top_level(data, keys=('swagger', 'info', 'paths'), optional_keys=('x-ms-paths',))
+    return build_swagger_file_summary(body)
+
+
+def build_swagger_file_summary(body):
+    """Extract the fields used to build resources from a swagger file body.
+
+    Only the operationIds of every path item are kept, the rest of the swagger is dropped.
+    """
+    summary = {
+        'swagger': body.get('swagger', None),
+        'version': body.get('info', {}).get('version', None),
+    }
+    for key in ('paths', 'x-ms-paths'):
+        paths = {}
+        for path, value in body.get(key, {}).items():
+            operations = {}
+            for method, v in value.items():
+                if isinstance(v, dict) and 'operationId' in v:
+                    operations[method] = {'operationId': v['operationId']}
+            paths[path] = operations
+        summary[key] = paths
+    return summary
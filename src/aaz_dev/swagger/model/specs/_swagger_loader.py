@@ -1,19 +1,113 @@
 import json
 import logging
 import os
+import threading
+import time
 from collections import OrderedDict
 
+from swagger.model.schema.reference import TraceNode
 from swagger.utils import exceptions
+from utils.config import Config
 
 logger = logging.getLogger('backend')
 
 
+class SwaggerCache:
+    """Process-wide LRU cache of linked swagger documents, bounded by the total size of the swagger files.
+
+    A document is reused only when the mtime and size of its file and of all the files it references are not
+    changed, and the referenced documents in cache are still the ones it was linked with.
+    """
+
+    def __init__(self, max_size=None):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        if self._max_size is None:
+            return Config.SWAGGER_CACHE_SIZE
+        return self._max_size
+
+    def get(self, file_path):
+        """Return the cache entries of the document and all the documents it references."""
+        with self._lock:
+            entry = self._entries.get(file_path, None)
+            if entry is None:
+                return None
+            closure = {}
+            pending = [(file_path, entry)]
+            while pending:
+                path, entry = pending.pop()
+                if path in closure:
+                    continue
+                if self._entries.get(path, None) is not entry or entry.stat != _file_stat(path):
+                    self._pop(file_path)
+                    return None
+                closure[path] = entry
+                pending.extend(entry.deps.items())
+            for path in closure:
+                self._entries.move_to_end(path)
+            return closure
+
+    def put(self, entries):
+        max_size = self.max_size
+        with self._lock:
+            for file_path, entry in entries.items():
+                if entry.size > max_size:
+                    continue
+                self._pop(file_path)
+                self._entries[file_path] = entry
+                self._size += entry.size
+            while self._size > max_size:
+                file_path = next(iter(self._entries))
+                self._pop(file_path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, file_path):
+        entry = self._entries.pop(file_path, None)
+        if entry is not None:
+            self._size -= entry.size
+
+
+class SwaggerCacheEntry:
+
+    def __init__(self, swagger, stat):
+        self.swagger = swagger
+        self.stat = stat
+        self.deps = {}  # file path -> cache entry of the referenced documents
+
+    @property
+    def size(self):
+        return self.stat[1]
+
+
+swagger_cache = SwaggerCache()
+
+
 class SwaggerLoader:
 
-    def __init__(self):
+    def __init__(self, cache=None):
         self._loaded = {}
         self.loaded_swaggers = OrderedDict()
-        self._linked_idx = 0
+        self._unlinked = []  # file paths of the loaded documents whose references are not resolved yet
+        self._cache = cache if cache is not None else swagger_cache
+        self._cache_entries = {}  # file path -> cache entry of the documents imported from cache
+        self._file_stats = {}
+        self._file_deps = {}
+        self.stats = {
+            'files_loaded': 0,  # swagger files parsed by this loader
+            'cache_hits': 0,  # swagger documents imported from cache
+            'refs_resolved': 0,  # references resolved by loading or walking into documents
+            'ref_hits': 0,  # references resolved by the loaded references
+            'link_seconds': 0.0,
+        }
 
     def load_file(self, file_path):
         from swagger.model.schema.swagger import Swagger
@@ -21,18 +115,44 @@ class SwaggerLoader:
         if loaded is not None:
             return loaded
 
+        if not _is_example_file(file_path) and self._import_from_cache(file_path):
+            return self.get_loaded(file_path)
+
+        stat = _file_stat(file_path)
         with open(file_path, 'r', encoding='utf-8') as f:
             body = json.load(f)
 
-        if 'example' in file_path.lower():
+        if _is_example_file(file_path):
             loaded = body
         else:
             self.patch_swagger(body)
             loaded = Swagger(body)
             self.loaded_swaggers[file_path] = loaded
+            self._unlinked.append(file_path)
+            self._file_stats[file_path] = stat
+        self.stats['files_loaded'] += 1
         self._cache_loaded(loaded, file_path)
         return loaded
 
+    def _import_from_cache(self, file_path):
+        entries = self._cache.get(file_path)
+        if entries is None:
+            return False
+        for path, entry in entries.items():
+            if path in self._cache_entries:
+                continue
+            if self.get_loaded(path) is not None:
+                # the file is loaded by this loader already, its own document should be used.
+                return False
+        for path, entry in entries.items():
+            if path in self._cache_entries:
+                continue
+            self._cache_entries[path] = entry
+            self.loaded_swaggers[path] = entry.swagger
+            self._cache_loaded(entry.swagger, path)
+            self.stats['cache_hits'] += 1
+        return True
+
     @staticmethod
     def patch_swagger(body):
         """Current will patch `additionalProperties: {}` expression"""
@@ -57,25 +177,66 @@ class SwaggerLoader:
         _patch(body)
 
     def link_swaggers(self):
-        while self._linked_idx < len(self.loaded_swaggers):
-            file_path, swagger = [*self.loaded_swaggers.items()][self._linked_idx]
-            swagger.link(self, file_path)
-            self._linked_idx += 1
+        """Link the documents loaded since last call, the documents imported from cache are linked already."""
+        start = time.perf_counter()
+        try:
+            # documents loaded when linking are appended to the end
+            idx = 0
+            while idx < len(self._unlinked):
+                file_path = self._unlinked[idx]
+                self.loaded_swaggers[file_path].link(self, file_path)
+                idx += 1
+        finally:
+            del self._unlinked[:idx]
+            self.stats['link_seconds'] += time.perf_counter() - start
+        self._put_linked_to_cache()
+
+    def _put_linked_to_cache(self):
+        entries = {}
+        for file_path, swagger in self.loaded_swaggers.items():
+            if file_path in self._cache_entries or self._file_stats.get(file_path, None) is None:
+                continue
+            entries[file_path] = SwaggerCacheEntry(swagger, self._file_stats[file_path])
+
+        # the documents referencing a document which cannot be cached are not cached either
+        updated = True
+        while updated:
+            updated = False
+            for file_path in [*entries.keys()]:
+                for dep_path in self._file_deps.get(file_path, ()):
+                    if dep_path not in entries and dep_path not in self._cache_entries:
+                        del entries[file_path]
+                        updated = True
+                        break
+
+        for file_path, entry in entries.items():
+            for dep_path in self._file_deps.get(file_path, ()):
+                entry.deps[dep_path] = entries.get(dep_path, None) or self._cache_entries[dep_path]
+        if entries:
+            self._cache.put(entries)
+            self._cache_entries.update(entries)
 
     def get_loaded(self, *traces):
-        return self._loaded.get(traces, None)
+        trace_node = TraceNode.lookup(*traces)
+        if trace_node is None:
+            return None
+        return self._loaded.get(trace_node, None)
 
     def _cache_loaded(self, loaded, *traces):
-        self._loaded[traces] = loaded
+        self._loaded[TraceNode.intern(*traces)] = loaded
 
     def load_ref(self, ref_link, *ref_traces):
-        traces = self._parse_ref_link(ref_traces, ref_link)
+        ref_trace_node = TraceNode.intern(*ref_traces)
+        traces = self._parse_ref_link(ref_trace_node, ref_link)
+        trace_node = TraceNode.intern(*traces)
 
-        ref = self.get_loaded(*traces)
+        ref = self._loaded.get(trace_node, None)
         if ref is not None:
-            return ref, traces
+            self.stats['ref_hits'] += 1
+            return ref, trace_node
 
         file_path = traces[0]
+        ref_file_path = ref_trace_node.file_path
         ref = self.get_loaded(file_path)
         if ref is None:
             try:
@@ -83,7 +244,9 @@ class SwaggerLoader:
             except FileNotFoundError:
                 raise exceptions.InvalidSwaggerValueError(
                     msg='Cannot find reference swagger file',
-                    key=ref_traces, value=ref_link)
+                    key=ref_trace_node.traces, value=ref_link)
+        if file_path != ref_file_path and not _is_example_file(file_path):
+            self._file_deps.setdefault(ref_file_path, set()).add(file_path)
 
         for prop in traces[1:]:
             assert prop != ''
@@ -97,22 +260,23 @@ class SwaggerLoader:
             except (KeyError, AttributeError):
                 raise exceptions.InvalidSwaggerValueError(
                     msg='Failed to find reference in swagger',
-                    key=ref_traces, value=ref_link)
+                    key=ref_trace_node.traces, value=ref_link)
 
         assert ref is not None
-        self._cache_loaded(ref, *traces)
-        return ref, traces
+        self._loaded[trace_node] = ref
+        self.stats['refs_resolved'] += 1
+        return ref, trace_node
 
     @classmethod
-    def _parse_ref_link(cls, ref_traces, ref_link):
-        file_path = ref_traces[0]
+    def _parse_ref_link(cls, ref_trace_node, ref_link):
+        file_path = ref_trace_node.file_path
 
         parts = ref_link.strip().split('#')
 
         if not (1 <= len(parts) <= 2):
             raise exceptions.InvalidSwaggerValueError(
                 msg="Invalid Reference Value",
-                key=ref_traces, value=ref_link)
+                key=ref_trace_node.traces, value=ref_link)
 
         if parts[0] == '':
             # start with '#'
@@ -135,3 +299,15 @@ class SwaggerLoader:
             return file_path, *traces
         else:
             return file_path,
+
+
+def _is_example_file(file_path):
+    return 'example' in file_path.lower()
+
+
+def _file_stat(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -1,6 +1,8 @@
 import os
+from collections import OrderedDict
 
 from utils.plane import PlaneEnum
+from ._folder_cache import folder_listing_cache
 from ._resource_provider import ResourceProvider
 
 
@@ -35,6 +37,22 @@ class SwaggerModule:
         else:
             return [*self._parent.names, self.name]
 
+    def get_resource_providers(self):
+        return [entry.build() for entry in self._discover_resource_providers()]
+
+    def get_resource_provider_modules(self):
+        """The modules which contain resource providers, it's either this module or its sub modules.
+
+        Only the module folders are listed, the resource provider folders are not touched.
+        """
+        modules = OrderedDict()
+        for entry in self._discover_resource_providers():
+            modules.setdefault(str(entry.swagger_module), entry.swagger_module)
+        return [*modules.values()]
+
+    def _discover_resource_providers(self):
+        raise NotImplementedError()
+
 
 class MgmtPlaneModule(SwaggerModule):
 
@@ -44,20 +62,18 @@ class MgmtPlaneModule(SwaggerModule):
         else:
             return super(MgmtPlaneModule, self).__str__()
 
-    def get_resource_providers(self):
-        rp = []
-        for name in os.listdir(self.folder_path):
+    def _discover_resource_providers(self):
+        entries = []
+        for name in folder_listing_cache.list_dirs(self.folder_path):
             path = os.path.join(self.folder_path, name)
-            if os.path.isdir(path):
-                name_parts = name.split('.')
-                if len(name_parts) >= 2:
-                    readme_path = _search_readme_md_path(path, search_parent=True)
-                    rp.append(ResourceProvider(name, path, readme_path, swagger_module=self))
-                elif name.lower() != 'common':
-                    # azsadmin module only
-                    sub_module = MgmtPlaneModule(plane=self.plane, name=name, folder_path=path, parent=self)
-                    rp.extend(sub_module.get_resource_providers())
-        return rp
+            name_parts = name.split('.')
+            if len(name_parts) >= 2:
+                entries.append(_ResourceProviderEntry(name, path, self, search_parent=True))
+            elif name.lower() != 'common':
+                # azsadmin module only
+                sub_module = MgmtPlaneModule(plane=self.plane, name=name, folder_path=path, parent=self)
+                entries.extend(sub_module._discover_resource_providers())
+        return entries
 
 
 class DataPlaneModule(SwaggerModule):
@@ -68,50 +84,58 @@ class DataPlaneModule(SwaggerModule):
         else:
             return super(DataPlaneModule, self).__str__()
 
-    def get_resource_providers(self):
-        rp = []
-        for name in os.listdir(self.folder_path):
+    def _discover_resource_providers(self):
+        entries = []
+        for name in folder_listing_cache.list_dirs(self.folder_path):
             path = os.path.join(self.folder_path, name)
-            if os.path.isdir(path):
-                if name.lower() in ('preview', 'stable'):
-                    readme_path = _search_readme_md_path(self.folder_path)
-                    rp = [ResourceProvider(self.name, self.folder_path, readme_path, swagger_module=self)]
-                    break
-                name_parts = name.split('.')
-                if len(name_parts) >= 2:
-                    readme_path = _search_readme_md_path(path, search_parent=True)
-                    rp.append(ResourceProvider(name, path, readme_path, swagger_module=self))
-                elif name.lower() != 'common':
-                    has_sub_module = True
-                    for sub_name in os.listdir(path):
-                        sub_module_path = os.path.join(path, sub_name)
-                        if os.path.isdir(sub_module_path) and sub_name.lower() in ('preview', 'stable'):
-                            has_sub_module = False
-                            break
-                    if has_sub_module:
-                        sub_module = DataPlaneModule(plane=self.plane, name=name, folder_path=path, parent=self)
-                        rp.extend(sub_module.get_resource_providers())
-                    else:
-                        readme_path = _search_readme_md_path(path, search_parent=True)
-                        rp.append(ResourceProvider(name, path, readme_path, swagger_module=self))
-        return rp
+            if name.lower() in ('preview', 'stable'):
+                entries = [_ResourceProviderEntry(self.name, self.folder_path, self)]
+                break
+            name_parts = name.split('.')
+            if len(name_parts) >= 2:
+                entries.append(_ResourceProviderEntry(name, path, self, search_parent=True))
+            elif name.lower() != 'common':
+                has_sub_module = True
+                for sub_name in folder_listing_cache.list_dirs(path):
+                    if sub_name.lower() in ('preview', 'stable'):
+                        has_sub_module = False
+                        break
+                if has_sub_module:
+                    sub_module = DataPlaneModule(plane=self.plane, name=name, folder_path=path, parent=self)
+                    entries.extend(sub_module._discover_resource_providers())
+                else:
+                    entries.append(_ResourceProviderEntry(name, path, self, search_parent=True))
+        return entries
+
+
+class _ResourceProviderEntry:
+    """A resource provider discovered in module folder, its readme is searched only when it's required."""
+
+    def __init__(self, name, folder_path, swagger_module, search_parent=False):
+        self.name = name
+        self.folder_path = folder_path
+        self.swagger_module = swagger_module
+        self.search_parent = search_parent
+
+    def build(self):
+        readme_path = _search_readme_md_path(self.folder_path, search_parent=self.search_parent)
+        return ResourceProvider(self.name, self.folder_path, readme_path, swagger_module=self.swagger_module)
 
 
 def _search_readme_md_path(path, search_parent=False):
     if search_parent:
         readme_path = os.path.join(os.path.dirname(path), 'readme.md')
-        if os.path.exists(readme_path):
+        if folder_listing_cache.is_file(readme_path):
             return readme_path
 
     readme_path = os.path.join(path, 'readme.md')
-    if os.path.exists(readme_path):
+    if folder_listing_cache.is_file(readme_path):
         return readme_path
 
     # find in sub directory
-    for name in os.listdir(path):
+    for name in folder_listing_cache.list_dirs(path):
         sub_path = os.path.join(path, name)
-        if os.path.isdir(sub_path):
-            readme_path = _search_readme_md_path(sub_path)
-            if readme_path is not None:
-                return readme_path
+        readme_path = _search_readme_md_path(sub_path)
+        if readme_path is not None:
+            return readme_path
     return None
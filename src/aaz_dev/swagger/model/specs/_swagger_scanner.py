@@ -0,0 +1,87 @@
+import json
+import re
+from json.decoder import scanstring
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_SCALAR = re.compile(r'[^,}\]\s]+')
+# consume strings and other characters up to the next bracket which is not in a string
+_BRACKET = re.compile(r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*([{}\[\]])', flags=re.DOTALL)
+
+_decoder = json.JSONDecoder()
+
+
+def scan_swagger_top_level(data, keys, optional_keys=()):
+    """Decode the values of the given top level keys in a swagger document without decoding other values.
+
+    The values of other keys, such as `definitions`, are skipped over the raw text without building any object, and
+    the scan stops as soon as all the `keys` are consumed. The `optional_keys` are only required when they appear in
+    the raw text.
+    """
+    wanted = set(keys)
+    for key in optional_keys:
+        if f'"{key}"' in data:
+            wanted.add(key)
+    decodable = {*keys, *optional_keys}
+
+    result = {}
+    idx = _skip_whitespace(data, 0)
+    if data[idx:idx + 1] != '{':
+        raise json.JSONDecodeError("Expecting '{'", data, idx)
+    idx = _skip_whitespace(data, idx + 1)
+    if data[idx:idx + 1] == '}':
+        return result
+
+    while True:
+        if data[idx:idx + 1] != '"':
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", data, idx)
+        key, idx = scanstring(data, idx + 1)
+        idx = _skip_whitespace(data, idx)
+        if data[idx:idx + 1] != ':':
+            raise json.JSONDecodeError("Expecting ':' delimiter", data, idx)
+        idx = _skip_whitespace(data, idx + 1)
+
+        if key in decodable:
+            result[key], idx = _decoder.raw_decode(data, idx)
+            wanted.discard(key)
+            if not wanted:
+                break
+        else:
+            idx = _skip_value(data, idx)
+
+        idx = _skip_whitespace(data, idx)
+        nextchar = data[idx:idx + 1]
+        if nextchar == '}':
+            break
+        if nextchar != ',':
+            raise json.JSONDecodeError("Expecting ',' delimiter", data, idx)
+        idx = _skip_whitespace(data, idx + 1)
+    return result
+
+
+def _skip_whitespace(data, idx):
+    return _WHITESPACE.match(data, idx).end()
+
+
+def _skip_value(data, idx):
+    char = data[idx:idx + 1]
+    if char == '"':
+        _, idx = scanstring(data, idx + 1)
+        return idx
+    if char in ('{', '['):
+        start = idx
+        depth = 0
+        while True:
+            match = _BRACKET.match(data, idx)
+            if match is None:
+                raise json.JSONDecodeError("Unterminated value", data, start)
+            idx = match.end()
+            if match.group(1) in ('{', '['):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return idx
+    match = _SCALAR.match(data, idx)
+    if match is None:
+        raise json.JSONDecodeError("Expecting value", data, idx)
+    return match.end()
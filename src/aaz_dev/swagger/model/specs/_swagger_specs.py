@@ -1,6 +1,7 @@
 import os
 
 from utils.plane import PlaneEnum
+from ._folder_cache import folder_listing_cache
 from ._swagger_module import MgmtPlaneModule, DataPlaneModule
 from utils.exceptions import ResourceNotFind, InvalidAPIUsage
 
@@ -16,7 +17,7 @@ class SwaggerSpecs:
 
     def get_mgmt_plane_modules(self, plane):
         modules = []
-        for name in os.listdir(self._spec_folder_path):
+        for name in folder_listing_cache.list_dirs(self._spec_folder_path):
             module = self.get_mgmt_plane_module(name, plane=plane)
             if module:
                 modules.append(module)
@@ -30,19 +31,19 @@ class SwaggerSpecs:
             return None
 
         path = os.path.join(self._spec_folder_path, name, 'resource-manager')
-        if not os.path.isdir(path):
+        if not folder_listing_cache.is_dir(path):
             return None
         module = MgmtPlaneModule(plane=plane, name=name, folder_path=path)
         for name in names[1:]:
             path = os.path.join(path, name)
-            if not os.path.isdir(path):
+            if not folder_listing_cache.is_dir(path):
                 return None
             module = MgmtPlaneModule(plane=plane, name=name, folder_path=path, parent=module)
         return module
 
     def get_data_plane_modules(self, plane):
         modules = []
-        for name in os.listdir(self._spec_folder_path):
+        for name in folder_listing_cache.list_dirs(self._spec_folder_path):
             module = self.get_data_plane_module(name, plane=plane)
             if module:
                 modules.append(module)
@@ -56,12 +57,12 @@ class SwaggerSpecs:
             return None
 
         path = os.path.join(self._spec_folder_path, name, 'data-plane')
-        if not os.path.isdir(path):
+        if not folder_listing_cache.is_dir(path):
             return None
         module = DataPlaneModule(plane=plane, name=name, folder_path=path)
         for name in names[1:]:
             path = os.path.join(path, name)
-            if not os.path.isdir(path):
+            if not folder_listing_cache.is_dir(path):
                 return None
             module = DataPlaneModule(plane=plane, name=name, folder_path=path, parent=module)
         return module
@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from swagger.controller.command_generator import CommandGenerator
+from swagger.model.specs import ResourceProvider
+from utils.config import Config
+
+
+class CMDSchemaCacheTest(TestCase):
+
+    def setUp(self):
+        self._dev_folder = Config.AAZ_DEV_FOLDER
+        self.tmp_folder = tempfile.mkdtemp()
+        Config.AAZ_DEV_FOLDER = os.path.join(self.tmp_folder, '.aaz_dev')
+        self.rp_folder = os.path.join(
+            self.tmp_folder, 'specification', 'foo', 'resource-manager', 'Microsoft.Foo')
+        folder = os.path.join(self.rp_folder, 'stable', '2021-01-01')
+        os.makedirs(folder)
+        definitions = {
+            "Resource": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "readOnly": True},
+                    "name": {"type": "string", "readOnly": True},
+                    "systemData": {"$ref": "#/definitions/SystemData"},
+                },
+                "x-ms-azure-resource": True,
+            },
+            "SystemData": {
+                "type": "object",
+                "readOnly": True,
+                "properties": {"createdBy": {"type": "string"}, "createdAt": {"type": "string"}},
+            },
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "value": {"type": "string"},
+                    "children": {"type": "array", "items": {"$ref": "#/definitions/Node"}},
+                },
+            },
+            "Animal": {
+                "type": "object",
+                "discriminator": "kind",
+                "required": ["kind"],
+                "properties": {"kind": {"type": "string"}, "friend": {"$ref": "#/definitions/Animal"}},
+            },
+            "Cat": {
+                "type": "object",
+                "x-ms-discriminator-value": "cat",
+                "allOf": [{"$ref": "#/definitions/Animal"}],
+                "properties": {"lives": {"type": "integer"}},
+            },
+            "ErrorResponse": {
+                "type": "object",
+                "properties": {"code": {"type": "string"}, "message": {"type": "string"}},
+            },
+        }
+        paths = {}
+        for name in ('foo', 'bar'):
+            definition = name.capitalize()
+            definitions[definition] = {
+                "type": "object",
+                "allOf": [{"$ref": "#/definitions/Resource"}],
+                "properties": {
+                    "tree": {"$ref": "#/definitions/Node"},
+                    "pet": {"$ref": "#/definitions/Animal"},
+                    "state": {"type": "string", "readOnly": True},
+                },
+            }
+            parameters = [
+                {"name": "subscriptionId", "in": "path", "required": True, "type": "string"},
+                {"name": f"{name}Name", "in": "path", "required": True, "type": "string"},
+                {"name": "api-version", "in": "query", "required": True, "type": "string"},
+            ]
+            responses = {
+                "200": {"description": "OK", "schema": {"$ref": f"#/definitions/{definition}"}},
+                "default": {"description": "Error", "schema": {"$ref": "#/definitions/ErrorResponse"}},
+            }
+            body = {"name": "body", "in": "body", "required": True, "schema": {"$ref": f"#/definitions/{definition}"}}
+            paths[f"/subscriptions/{{subscriptionId}}/providers/Microsoft.Foo/{name}s/{{{name}Name}}"] = {
+                "get": {"operationId": f"{definition}s_Get", "parameters": parameters, "responses": responses},
+                "put": {"operationId": f"{definition}s_Create", "parameters": [*parameters, body], "responses": responses},
+                "patch": {"operationId": f"{definition}s_Update", "parameters": [*parameters, body], "responses": responses},
+            }
+        with open(os.path.join(folder, 'foo.json'), 'w', encoding='utf-8') as f:
+            json.dump({
+                "swagger": "2.0",
+                "info": {"title": "foo", "version": "2021-01-01"},
+                "paths": paths,
+                "definitions": definitions,
+            }, f)
+        rp = ResourceProvider('Microsoft.Foo', self.rp_folder, readme_path=None, swagger_module='mgmt-plane/foo')
+        self.resources = [resource for version_map in rp.get_resource_map().values() for resource in version_map.values()]
+
+    def tearDown(self):
+        Config.AAZ_DEV_FOLDER = self._dev_folder
+        shutil.rmtree(self.tmp_folder)
+
+    def test_reuse_converted_schemas(self):
+        generator = CommandGenerator()
+        generator.load_resources(self.resources)
+        command_groups = [generator.create_draft_command_group(resource).to_primitive() for resource in self.resources]
+        self.assertGreater(generator.schema_cache.stats['hits'], 0)
+
+        # the command groups are the same as the ones converted without reusing
+        generator = CommandGenerator()
+        generator.schema_cache.MAX_VARIANTS = 0
+        generator.load_resources(self.resources)
+        for resource, command_group in zip(self.resources, command_groups):
+            self.assertEqual(generator.create_draft_command_group(resource).to_primitive(), command_group)
+
+        # the reused schemas are copies
+        generator = CommandGenerator()
+        generator.load_resources(self.resources)
+        first = generator.create_draft_command_group(self.resources[0])
+        schema = first.commands[0].operations[0].http.responses[0].body.json.schema
+        self.assertEqual(schema.props[0].name, 'id')
+        schema.props[0].name = 'changed'
+        self.assertEqual(generator.create_draft_command_group(self.resources[0]).to_primitive(), command_groups[0])
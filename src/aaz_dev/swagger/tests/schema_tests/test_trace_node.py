@@ -0,0 +1,81 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from swagger.model.schema.cmd_builder import CMDBuilder
+from swagger.model.schema.fields import MutabilityEnum
+from swagger.model.schema.reference import TraceNode
+from swagger.model.specs import SwaggerLoader
+from swagger.model.specs._swagger_loader import SwaggerCache
+from swagger.utils import exceptions
+
+
+class TraceNodeTest(TestCase):
+
+    def setUp(self):
+        self.tmp_folder = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_folder, 'foo.json')
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "swagger": "2.0",
+                "info": {"title": "foo", "version": "2021-01-01"},
+                "paths": {},
+                "definitions": {
+                    "Node": {
+                        "type": "object",
+                        "properties": {
+                            "value": {"type": "string"},
+                            "children": {"type": "array", "items": {"$ref": "#/definitions/Node"}},
+                        },
+                    },
+                    "Tree": {
+                        "type": "object",
+                        "properties": {"root": {"$ref": "#/definitions/Node"}},
+                    },
+                },
+            }, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_folder)
+
+    def _load(self):
+        loader = SwaggerLoader(cache=SwaggerCache(max_size=0))
+        loader.load_file(self.file_path)
+        loader.link_swaggers()
+        return loader.get_loaded(self.file_path)
+
+    def test_intern_trace(self):
+        node = TraceNode.intern(self.file_path, 'definitions', 'Node')
+        self.assertIs(TraceNode.intern(self.file_path, 'definitions', 'Node'), node)
+        self.assertIs(TraceNode.intern(TraceNode.intern(self.file_path), 'definitions', 'Node'), node)
+        self.assertIs(TraceNode.lookup(self.file_path, 'definitions', 'Node'), node)
+        self.assertIsNone(TraceNode.lookup(self.file_path, 'definitions', 'Missing'))
+        self.assertEqual(node.traces, (self.file_path, 'definitions', 'Node'))
+        self.assertEqual(node.depth, 3)
+        self.assertEqual(node.file_path, self.file_path)
+        self.assertIsNot(node.child(0), node.child('0'))
+
+    def test_linked_trace_nodes(self):
+        swagger = self._load()
+        node = swagger.definitions['Node']
+        self.assertIs(node.trace_node, TraceNode.lookup(self.file_path, 'definitions', 'Node'))
+        self.assertEqual(node.traces, (self.file_path, 'definitions', 'Node'))
+        items = node.properties['children'].items
+        self.assertIs(items.trace_node.parent, node.properties['children'].trace_node)
+        self.assertIs(items.ref_instance, node)
+
+    def test_builder_reference_loop(self):
+        swagger = self._load()
+        builder = CMDBuilder(path='/foo', method='get', mutability=MutabilityEnum.Read)
+        schema = builder(swagger.definitions['Tree'], in_base=True, support_cls_schema=True)
+        self.assertEqual(schema.props[0].name, 'root')
+        self.assertEqual(builder.ancestors.ids, [None])
+
+        # the definition is built again by its own property without a reference schema
+        builder = CMDBuilder(path='/foo', method='get', mutability=MutabilityEnum.Read)
+        with self.assertRaises(exceptions.InvalidSwaggerValueError) as cm:
+            builder(swagger.definitions['Node'], in_base=True, support_cls_schema=True)
+        self.assertEqual(cm.exception.msg, "Find invalid reference loop")
+        self.assertEqual(builder.ancestors.ids, [None])
@@ -0,0 +1,129 @@
+import json
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from swagger.model.specs import SwaggerLoader
+from swagger.model.specs._swagger_loader import SwaggerCache
+
+
+class SwaggerCacheTest(TestCase):
+
+    def setUp(self):
+        self.tmp_folder = tempfile.mkdtemp()
+        self.types_path = self._write_swagger('common', 'types.json', definitions={
+            "Resource": {
+                "type": "object",
+                "properties": {"id": {"type": "string", "readOnly": True}},
+                "x-ms-azure-resource": True,
+            },
+        })
+        self.foo_path = self._write_swagger('foo', 'foo.json', paths={
+            "/subscriptions/{subscriptionId}/providers/Microsoft.Foo/foos/{fooName}": {
+                "get": {
+                    "operationId": "Foos_Get",
+                    "parameters": [],
+                    "responses": {"200": {"description": "OK", "schema": {"$ref": "#/definitions/Foo"}}},
+                },
+            },
+        }, definitions={
+            "Foo": {
+                "type": "object",
+                "allOf": [{"$ref": "../common/types.json#/definitions/Resource"}],
+            },
+        })
+        self.bar_path = self._write_swagger('bar', 'bar.json', definitions={
+            "Bar": {"type": "object", "allOf": [{"$ref": "../common/types.json#/definitions/Resource"}]},
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_folder)
+
+    def _write_swagger(self, folder, name, paths=None, definitions=None):
+        os.makedirs(os.path.join(self.tmp_folder, folder), exist_ok=True)
+        file_path = os.path.join(self.tmp_folder, folder, name)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "swagger": "2.0",
+                "info": {"title": name, "version": "2021-01-01"},
+                "paths": paths or {},
+                "definitions": definitions or {},
+            }, f)
+        return file_path
+
+    @staticmethod
+    def _load(cache, *file_paths):
+        loader = SwaggerLoader(cache=cache)
+        for file_path in file_paths:
+            loader.load_file(file_path)
+        loader.link_swaggers()
+        return loader
+
+    def test_cache_linked_swagger(self):
+        cache = SwaggerCache(max_size=1024 * 1024)
+        loader = self._load(cache, self.foo_path)
+        foo = loader.get_loaded(self.foo_path)
+        types = loader.get_loaded(self.types_path)
+        self.assertIs(foo.definitions['Foo'].all_of[0].ref_instance, types.definitions['Resource'])
+
+        loader = self._load(cache, self.foo_path)
+        self.assertIs(loader.get_loaded(self.foo_path), foo)
+        self.assertIs(loader.get_loaded(self.types_path), types)
+
+        # the referenced document in cache is shared with the newly loaded document
+        loader = self._load(cache, self.bar_path)
+        bar = loader.get_loaded(self.bar_path)
+        self.assertIs(bar.definitions['Bar'].all_of[0].ref_instance, types.definitions['Resource'])
+        self.assertIs(self._load(cache, self.bar_path).get_loaded(self.bar_path), bar)
+
+    def test_cache_invalidated_by_modified_file(self):
+        cache = SwaggerCache(max_size=1024 * 1024)
+        foo = self._load(cache, self.foo_path).get_loaded(self.foo_path)
+        bar = self._load(cache, self.bar_path).get_loaded(self.bar_path)
+
+        # modify referenced file
+        self._write_swagger('common', 'types.json', definitions={
+            "Resource": {"type": "object", "properties": {"name": {"type": "string"}}},
+        })
+        loader = self._load(cache, self.foo_path)
+        self.assertIsNot(loader.get_loaded(self.foo_path), foo)
+        self.assertIn('name', loader.get_loaded(self.types_path).definitions['Resource'].properties)
+
+        # bar was linked with the previous types document
+        self.assertIsNot(self._load(cache, self.bar_path).get_loaded(self.bar_path), bar)
+
+    def test_cache_size_bounded(self):
+        cache = SwaggerCache(max_size=os.path.getsize(self.foo_path) + os.path.getsize(self.types_path))
+        foo = self._load(cache, self.foo_path).get_loaded(self.foo_path)
+        self._load(cache, self.bar_path)
+        self.assertIsNot(self._load(cache, self.foo_path).get_loaded(self.foo_path), foo)
+
+        cache = SwaggerCache(max_size=0)
+        foo = self._load(cache, self.foo_path).get_loaded(self.foo_path)
+        self.assertIsNot(self._load(cache, self.foo_path).get_loaded(self.foo_path), foo)
+
+    def test_incremental_link(self):
+        cache = SwaggerCache(max_size=0)
+        loader = self._load(cache, self.foo_path)
+        self.assertEqual(loader.stats['files_loaded'], 2)
+        self.assertEqual(loader.stats['cache_hits'], 0)
+        self.assertGreater(loader.stats['refs_resolved'], 0)
+
+        # only the newly loaded documents are linked
+        refs_resolved = loader.stats['refs_resolved']
+        loader.link_swaggers()
+        self.assertEqual(loader.stats['refs_resolved'], refs_resolved)
+        loader.load_file(self.bar_path)
+        loader.link_swaggers()
+        self.assertEqual(loader.stats['files_loaded'], 3)
+        bar = loader.get_loaded(self.bar_path)
+        self.assertTrue(bar.is_linked())
+        self.assertIs(bar.definitions['Bar'].all_of[0].ref_instance,
+                      loader.get_loaded(self.types_path).definitions['Resource'])
+
+        cache = SwaggerCache(max_size=1024 * 1024)
+        self._load(cache, self.foo_path)
+        loader = self._load(cache, self.foo_path)
+        self.assertEqual(loader.stats['files_loaded'], 0)
+        self.assertEqual(loader.stats['cache_hits'], 2)
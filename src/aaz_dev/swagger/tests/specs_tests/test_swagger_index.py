@@ -0,0 +1,155 @@
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from swagger.model.specs import ResourceProvider
+from swagger.model.specs._swagger_index import SwaggerFileIndex
+from utils.config import Config
+from utils.fork_pool import can_fork
+
+
+def _swagger_body(version, paths):
+    return {
+        "swagger": "2.0",
+        "info": {"title": "FooClient", "version": version},
+        "paths": {
+            path: {
+                "get": {"operationId": f"{op_group}_Get", "responses": {}},
+                "put": {"operationId": f"{op_group}_CreateOrUpdate", "responses": {}},
+            } for path, op_group in paths.items()
+        },
+        "definitions": {
+            "Foo": {"type": "object", "properties": {"name": {"type": "string"}}},
+        },
+    }
+
+
+class SwaggerIndexTestCase(TestCase):
+
+    def setUp(self):
+        self._dev_folder = Config.AAZ_DEV_FOLDER
+        self.tmp_folder = tempfile.mkdtemp()
+        Config.AAZ_DEV_FOLDER = os.path.join(self.tmp_folder, '.aaz_dev')
+        self.rp_folder = os.path.join(
+            self.tmp_folder, 'specification', 'foo', 'resource-manager', 'Microsoft.Foo')
+        self.file_paths = [
+            self._write_swagger('stable', '2021-01-01', {
+                "/subscriptions/{subscriptionId}/providers/Microsoft.Foo/foos/{fooName}": "Foos",
+            }),
+            self._write_swagger('preview', '2022-01-01-preview', {
+                "/subscriptions/{subscriptionId}/providers/Microsoft.Foo/foos/{fooName}": "Foos",
+                "/subscriptions/{subscriptionId}/providers/Microsoft.Foo/bars/{barName}": "Bars",
+            }),
+        ]
+
+    def tearDown(self):
+        Config.AAZ_DEV_FOLDER = self._dev_folder
+        shutil.rmtree(self.tmp_folder)
+
+    def _write_swagger(self, readiness, version, paths):
+        folder = os.path.join(self.rp_folder, readiness, version)
+        os.makedirs(folder, exist_ok=True)
+        file_path = os.path.join(folder, 'foo.json')
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(_swagger_body(version, paths), f)
+        return file_path
+
+    def _new_rp(self, readme_path=None):
+        return ResourceProvider(
+            'Microsoft.Foo', self.rp_folder, readme_path=readme_path, swagger_module='mgmt-plane/foo')
+
+    def _write_readme(self):
+        readme_path = os.path.join(os.path.dirname(self.rp_folder), 'readme.md')
+        with open(readme_path, 'w', encoding='utf-8') as f:
+            f.write(
+                "# Foo\n\n"
+                "```yaml\n"
+                "openapi-type: arm\n"
+                "tag: package-2022-01-preview\n"
+                "```\n\n"
+                "```yaml $(tag) == 'package-2022-01-preview'\n"
+                "input-file:\n"
+                "  - Microsoft.Foo/preview/2022-01-01-preview/foo.json\n"
+                "  - Microsoft.Foo/stable/2021-01-01/foo.json\n"
+                "```\n\n"
+                "```yaml $(tag) == 'package-2021-01'\n"
+                "input-file:\n"
+                "  - Microsoft.Foo/stable/2021-01-01/foo.json\n"
+                "  - Microsoft.Foo/stable/2021-01-01/missing.json\n"
+                "```\n"
+            )
+        return readme_path
+
+    @staticmethod
+    def _dump_resource_map(resource_map):
+        return {
+            resource_id: {
+                str(version): (resource.path, resource.file_path, resource.operations)
+                for version, resource in version_map.items()
+            } for resource_id, version_map in resource_map.items()
+        }
+
+    def test_resource_map_from_index(self):
+        rp = self._new_rp()
+        resource_map = self._dump_resource_map(rp.get_resource_map())
+        self.assertEqual(len(resource_map), 2)
+        self.assertTrue(os.path.isfile(rp._index.index_path))
+
+        # warm start reuses the index without loading swagger files
+        rp = self._new_rp()
+        for file_path in self.file_paths:
+            stat = os.stat(file_path)
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = f.read()
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(' ' * len(data))
+            os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self._dump_resource_map(rp.get_resource_map()), resource_map)
+
+    def test_index_invalidated_by_modified_file(self):
+        rp = self._new_rp()
+        rp.get_resource_map()
+        file_path = self._write_swagger('stable', '2021-01-01', {
+            "/subscriptions/{subscriptionId}/providers/Microsoft.Foo/bazs/{bazName}": "Bazs",
+        })
+        index = SwaggerFileIndex(self.rp_folder)
+        self.assertIsNone(index.get(file_path))
+        self.assertIsNotNone(index.get(self.file_paths[1]))
+
+        rp = self._new_rp()
+        resource_map = rp.get_resource_map()
+        self.assertIn("/subscriptions/{}/providers/microsoft.foo/bazs/{}", resource_map)
+        self.assertEqual(resource_map["/subscriptions/{}/providers/microsoft.foo/bazs/{}"]["2021-01-01"].operations, {
+            "Bazs_Get": "get",
+            "Bazs_CreateOrUpdate": "put",
+        })
+
+    def test_parallel_resource_map(self):
+        resource_map = self._dump_resource_map(self._new_rp().get_resource_map(workers=1))
+        shutil.rmtree(Config.AAZ_DEV_FOLDER)
+        rp = self._new_rp()
+        self.assertEqual(self._dump_resource_map(rp.get_resource_map(workers=2)), resource_map)
+        for file_path in self.file_paths:
+            self.assertIsNotNone(rp._index.get(file_path))
+
+        # the worker processes never fork workers again
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            self.assertFalse(executor.submit(can_fork).result())
+
+    def test_readme_tags_from_index(self):
+        readme_path = self._write_readme()
+        rp = self._new_rp(readme_path)
+        tags = {str(tag): files for tag, files in rp.tags.items()}
+        self.assertEqual([*tags.keys()], ['package-2022-01-preview', 'package-2021-01'])
+        self.assertEqual(tags['package-2021-01'], {self.file_paths[0]})
+        self.assertEqual(str(rp._fetch_latest_tag(self.file_paths[0])), 'package-2022-01-preview')
+        self.assertIsNone(rp._fetch_latest_tag(os.path.join(self.rp_folder, 'foo.json')))
+
+        # warm start reuses the parsed readme
+        rp = self._new_rp(readme_path)
+        rp._parse_readme_input_file_blocks = None
+        self.assertEqual({str(tag): files for tag, files in rp.tags.items()}, tags)
+        self.assertEqual(len(rp.get_resource_map_by_tag('package-2021-01')), 1)
@@ -0,0 +1,50 @@
+import json
+from unittest import TestCase
+
+from swagger.model.specs._swagger_index import build_swagger_file_summary
+from swagger.model.specs._swagger_scanner import scan_swagger_top_level
+
+
+class SwaggerScannerTest(TestCase):
+
+    @staticmethod
+    def _scan_summary(data):
+        return build_swagger_file_summary(
+            scan_swagger_top_level(data, keys=('swagger', 'info', 'paths'), optional_keys=('x-ms-paths',)))
+
+    def test_scan_summary(self):
+        body = {
+            "swagger": "2.0",
+            "info": {"title": "Foo \"{[Client", "version": "2021-01-01"},
+            "host": "management.azure.com",
+            "schemes": ["https"],
+            "definitions": {
+                "Foo": {
+                    "description": "braces in string }]{[ and escaped quote \\\" ",
+                    "properties": {"count": {"type": "integer", "default": -1.5e3, "enum": [1, True, None]}},
+                },
+            },
+            "paths": {
+                "/subscriptions/{subscriptionId}/providers/Microsoft.Foo/foos": {
+                    "get": {"operationId": "Foos_List", "parameters": [{"name": "api-version"}]},
+                    "parameters": [{"$ref": "#/parameters/SubscriptionId"}],
+                },
+            },
+            "x-ms-paths": {
+                "/foos?op=bar": {"post": {"operationId": "Foos_Bar"}},
+            },
+            "parameters": {"SubscriptionId": {"name": "subscriptionId", "in": "path"}},
+        }
+        for indent in (None, 2):
+            data = json.dumps(body, indent=indent)
+            self.assertEqual(self._scan_summary(data), build_swagger_file_summary(json.loads(data)))
+
+        # definitions after paths are not scanned when all keys are consumed
+        body.pop("x-ms-paths")
+        data = json.dumps(body)[:-1] + ', "invalid": '
+        self.assertEqual(self._scan_summary(data), build_swagger_file_summary(body))
+
+    def test_scan_invalid_json(self):
+        for data in ('[]', '{"swagger" "2.0"}', '{"definitions": {"Foo": {}', '{"info": {} "swagger": "2.0"}'):
+            with self.assertRaises(json.JSONDecodeError):
+                self._scan_summary(data)
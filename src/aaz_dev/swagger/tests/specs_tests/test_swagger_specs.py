@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+from swagger.model.specs import SwaggerSpecs
+from swagger.model.specs._folder_cache import folder_listing_cache
+from utils.plane import PlaneEnum
+
+
+class SwaggerSpecsDiscoveryTest(TestCase):
+
+    def setUp(self):
+        self.tmp_folder = tempfile.mkdtemp()
+        self.spec_folder = os.path.join(self.tmp_folder, 'specification')
+        for path in [
+            ('foo', 'resource-manager', 'readme.md'),
+            ('foo', 'resource-manager', 'Microsoft.Foo', 'stable', '2021-01-01', 'foo.json'),
+            ('foo', 'resource-manager', 'common', 'types.json'),
+            ('azsadmin', 'resource-manager', 'bar', 'Microsoft.Bar.Admin', 'preview', '2020-01-01', 'bar.json'),
+            ('azsadmin', 'resource-manager', 'bar', 'Microsoft.Bar.Admin', 'readme.md'),
+            ('baz', 'data-plane', 'preview', '2020-01-01', 'baz.json'),
+            ('README.md', ),
+        ]:
+            self._touch(*path)
+        self.specs = SwaggerSpecs(folder_path=self.tmp_folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_folder)
+
+    def _touch(self, *names):
+        file_path = os.path.join(self.spec_folder, *names)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w') as f:
+            f.write('{}')
+
+    def test_discover_modules(self):
+        modules = self.specs.get_mgmt_plane_modules(plane=PlaneEnum.Mgmt)
+        self.assertEqual(sorted(str(m) for m in modules), ['mgmt-plane/azsadmin', 'mgmt-plane/foo'])
+
+        modules = {str(m): m for m in modules}
+        rp_modules = modules['mgmt-plane/azsadmin'].get_resource_provider_modules()
+        self.assertEqual([str(m) for m in rp_modules], ['mgmt-plane/azsadmin/bar'])
+
+        rps = modules['mgmt-plane/azsadmin'].get_resource_providers()
+        self.assertEqual([rp.name for rp in rps], ['Microsoft.Bar.Admin'])
+        self.assertEqual(rps[0]._readme_path, os.path.join(rps[0].folder_path, 'readme.md'))
+
+        rps = modules['mgmt-plane/foo'].get_resource_providers()
+        self.assertEqual([rp.name for rp in rps], ['Microsoft.Foo'])
+        self.assertEqual(rps[0]._readme_path, os.path.join(self.spec_folder, 'foo', 'resource-manager', 'readme.md'))
+
+        rps = self.specs.get_data_plane_module('baz', plane=PlaneEnum.Mgmt).get_resource_providers()
+        self.assertEqual([rp.name for rp in rps], ['baz'])
+
+    def test_discover_modules_after_folder_changed(self):
+        self.assertEqual(len(self.specs.get_mgmt_plane_modules(plane=PlaneEnum.Mgmt)), 2)
+        self._touch('qux', 'resource-manager', 'Microsoft.Qux', 'stable', '2021-01-01', 'qux.json')
+        self.assertEqual(len(self.specs.get_mgmt_plane_modules(plane=PlaneEnum.Mgmt)), 3)
+
+        folder_listing_cache.check_mtime = False
+        try:
+            self._touch('quux', 'resource-manager', 'Microsoft.Quux', 'stable', '2021-01-01', 'quux.json')
+            self.assertEqual(len(self.specs.get_mgmt_plane_modules(plane=PlaneEnum.Mgmt)), 3)
+            folder_listing_cache.clear()
+            self.assertEqual(len(self.specs.get_mgmt_plane_modules(plane=PlaneEnum.Mgmt)), 4)
+        finally:
+            folder_listing_cache.check_mtime = True
+
+    def test_lookup_in_different_case(self):
+        rm_folder = os.path.join(self.spec_folder, 'foo', 'resource-manager')
+        # matched the same as the file system, which can be case-insensitive
+        for names in [
+            ('readme.md', ), ('README.md', ), ('Readme.MD', ),
+            ('Microsoft.Foo', 'stable', 'readme.md'), ('microsoft.foo', 'stable', '2021-01-01', 'foo.json'),
+        ]:
+            path = os.path.join(rm_folder, *names)
+            self.assertEqual(folder_listing_cache.is_file(path), os.path.isfile(path))
+            self.assertFalse(folder_listing_cache.is_dir(path))
+        for names in [('Microsoft.Foo', ), ('microsoft.foo', ), ('MICROSOFT.FOO', 'Stable'), ('Microsoft.Bar', )]:
+            path = os.path.join(rm_folder, *names)
+            self.assertEqual(folder_listing_cache.is_dir(path), os.path.isdir(path))
+            self.assertFalse(folder_listing_cache.is_file(path))
+        self.assertIsNotNone(self.specs.get_mgmt_plane_module('foo', plane=PlaneEnum.Mgmt))
+        self.assertEqual(
+            self.specs.get_mgmt_plane_module('Foo', plane=PlaneEnum.Mgmt) is not None,
+            os.path.isdir(os.path.join(self.spec_folder, 'Foo', 'resource-manager')))
@@ -25,6 +25,26 @@ class Config:
         os.environ.get("AAZ_DEV_WORKSPACE_FOLDER", os.path.join(AAZ_DEV_FOLDER, "workspaces"))
     )
 
+    # number of forked worker processes used to parse swagger files, parse them in current process if it's 0
+    SWAGGER_PARSE_WORKERS = int(os.environ.get("AAZ_SWAGGER_PARSE_WORKERS", 0))
+
+    # number of forked worker processes used to render the files of aaz specs when saving, render them in current
+    # process if it's 0
+    SPECS_SAVE_WORKERS = int(os.environ.get("AAZ_SPECS_SAVE_WORKERS", 0))
+
+    # number of forked worker processes used to render the command files of cli modules, render them in current
+    # process if it's 0
+    CLI_GENERATE_WORKERS = int(os.environ.get("AAZ_CLI_GENERATE_WORKERS", 0))
+
+    # max total size in bytes of the swagger files whose linked documents are cached in process, 0 to disable it
+    SWAGGER_CACHE_SIZE = int(os.environ.get("AAZ_SWAGGER_CACHE_SIZE", 50 * 1024 * 1024))
+
+    # max number of the linked resource cfgs of aaz specs cached in process, 0 to disable it
+    CFG_CACHE_SIZE = int(os.environ.get("AAZ_CFG_CACHE_SIZE", 256))
+
+    # cache the resource cfg files in compact binary format under AAZ_DEV_FOLDER to load them faster
+    CFG_FILE_CACHE = os.environ.get("AAZ_CFG_FILE_CACHE", "true").lower() == "true"
+
     # Flask configurations
     HOST = os.environ.get("AAZ_HOST", '127.0.0.1')
     PORT = int(os.environ.get("AAZ_PORT", 5000))
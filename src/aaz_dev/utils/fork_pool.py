@@ -0,0 +1,58 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# the tasks inherited by the forked worker processes
+_tasks = None
+
+
+def _run_task(idx):
+    func, args = _tasks[idx]
+    try:
+        return func(*args), None
+    except Exception as err:
+        # the exceptions such as InvalidAPIUsage cannot be unpickled by their constructor, so send back the state
+        return None, (err.__class__, err.args, err.__dict__)
+
+
+def can_fork():
+    """Whether worker processes can be forked from current process."""
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return False
+    # the worker processes never fan out again
+    if multiprocessing.parent_process() is not None:
+        return False
+    # forking a process with other threads running is not safe, such as in the web server
+    return threading.active_count() <= 1
+
+
+def run_in_forked_processes(tasks, workers):
+    """Run the tasks of (func, args) and return the results in order.
+
+    The tasks are run across worker processes forked after the tasks are prepared, so the arguments such as schematics
+    models are inherited by workers without pickling, and only the results are sent back. The tasks are run in current
+    process if workers is less than 2 or the workers cannot be forked.
+    """
+    global _tasks
+    workers = min(workers, len(tasks))
+    if workers <= 1 or not can_fork():
+        return [func(*args) for func, args in tasks]
+
+    _tasks = tasks
+    try:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork')) as executor:
+            outputs = [*executor.map(_run_task, range(len(tasks)), chunksize=chunksize)]
+    finally:
+        _tasks = None
+
+    results = []
+    for result, err in outputs:
+        if err is not None:
+            err_cls, err_args, err_state = err
+            exc = err_cls.__new__(err_cls)
+            exc.args = err_args
+            exc.__dict__.update(err_state)
+            raise exc
+        results.append(result)
+    return results
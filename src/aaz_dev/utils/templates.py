@@ -0,0 +1,134 @@
+import hashlib
+import json
+import logging
+import os
+
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+
+from .config import Config
+
+logger = logging.getLogger('backend')
+
+COMPILED_FOLDER_NAME = '_compiled'
+CHECKSUMS_FILE_NAME = 'checksums.json'
+TEMPLATE_EXTENSION = 'j2'
+
+_bytecode_cache = None
+
+
+class _BytecodeCache(FileSystemBytecodeCache):
+    """Bytecode cache whose failure to write never fails the template loading."""
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as err:
+            logger.debug(f"Failed to cache template bytecode: {err}")
+
+
+def get_bytecode_cache():
+    """Jinja bytecode cache persisted under AAZ_DEV_FOLDER, which is shared by the processes of aaz-dev."""
+    global _bytecode_cache
+    folder = os.path.join(Config.AAZ_DEV_FOLDER, 'templates_cache')
+    if _bytecode_cache is None or _bytecode_cache.directory != folder:
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError as err:
+            logger.warning(f"Failed to create templates cache folder {folder}: {err}")
+            return None
+        _bytecode_cache = _BytecodeCache(folder)
+    return _bytecode_cache
+
+
+def create_environment(folder, filters):
+    """Create the environment of the templates in folder.
+
+    The templates precompiled by `compile_templates` are loaded if they are compiled from the current template files,
+    otherwise the templates are compiled from source with the bytecode cache.
+    """
+    loader = FileSystemLoader(searchpath=folder)
+    compiled_folder = os.path.join(folder, COMPILED_FOLDER_NAME)
+    if os.path.isdir(compiled_folder) and _is_compiled_up_to_date(folder, compiled_folder):
+        env = Environment(loader=ChoiceLoader([ModuleLoader(compiled_folder), loader]))
+    else:
+        env = Environment(loader=loader, bytecode_cache=get_bytecode_cache())
+    env.filters.update(filters)
+    return env
+
+
+def compile_templates(folder, filters):
+    """Precompile the templates in folder into python modules, which are shipped along with the templates."""
+    compiled_folder = os.path.join(folder, COMPILED_FOLDER_NAME)
+    env = Environment(loader=FileSystemLoader(searchpath=folder))
+    env.filters.update(filters)
+    env.compile_templates(
+        compiled_folder, extensions=[TEMPLATE_EXTENSION], zip=None, ignore_errors=False, log_function=logger.debug)
+    with open(os.path.join(compiled_folder, CHECKSUMS_FILE_NAME), 'w') as f:
+        json.dump(_template_checksums(folder), f, indent=2, sort_keys=True)
+    return compiled_folder
+
+
+def _is_compiled_up_to_date(folder, compiled_folder):
+    """Whether the precompiled templates are compiled from the current template files.
+
+    The checksums of template files are computed only when the stats of them or of the checksums file are changed
+    since the last time they were verified, which are recorded under AAZ_DEV_FOLDER.
+    """
+    stats = _template_stats(folder)
+    stats[CHECKSUMS_FILE_NAME] = _stat(os.path.join(compiled_folder, CHECKSUMS_FILE_NAME))
+    key = hashlib.sha1(os.path.abspath(compiled_folder).encode('utf-8')).hexdigest()
+    verified_path = os.path.join(Config.AAZ_DEV_FOLDER, 'templates_cache', f"compiled_{key}.json")
+    try:
+        with open(verified_path, 'r') as f:
+            if json.load(f) == stats:
+                return True
+    except (OSError, ValueError):
+        pass
+
+    if _load_checksums(compiled_folder) != _template_checksums(folder):
+        return False
+    try:
+        os.makedirs(os.path.dirname(verified_path), exist_ok=True)
+        with open(verified_path, 'w') as f:
+            json.dump(stats, f)
+    except OSError as err:
+        logger.debug(f"Failed to record verified templates {verified_path}: {err}")
+    return True
+
+
+def _load_checksums(compiled_folder):
+    try:
+        with open(os.path.join(compiled_folder, CHECKSUMS_FILE_NAME), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _template_checksums(folder):
+    checksums = {}
+    for name, path in _iter_template_files(folder):
+        with open(path, 'rb') as f:
+            checksums[name] = hashlib.sha1(f.read()).hexdigest()
+    return checksums
+
+
+def _template_stats(folder):
+    return {name: _stat(path) for name, path in _iter_template_files(folder)}
+
+
+def _iter_template_files(folder):
+    for root, dirs, files in os.walk(folder):
+        dirs[:] = [name for name in dirs if name != COMPILED_FOLDER_NAME]
+        for name in files:
+            if not name.endswith(f".{TEMPLATE_EXTENSION}"):
+                continue
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, folder).replace(os.sep, '/'), path
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]